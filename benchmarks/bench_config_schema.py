@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+配置模式校验基准测试
+
+模拟配置界面的100k次配置写入，对比每次重新读取config_schema.json（旧实现）与
+编译后的校验器（新实现）的耗时。
+
+运行方式（在插件根目录下）：
+    python -m benchmarks.bench_config_schema
+"""
+import json
+import os
+import random
+import time
+
+from fastx_tui_plugin_example.config_validator import ConfigValidationError, SchemaCache
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(PROJECT_DIR, "config_schema.json")
+
+# 合法与非法值混合的写入样本
+SAMPLES = [
+    ("enabled", True),
+    ("enabled", "yes"),
+    ("greeting_message", "Hello!"),
+    ("show_timestamp", False),
+    ("log_level", "DEBUG"),
+    ("log_level", "VERBOSE"),
+    ("lazy_init", True),
+]
+
+
+def legacy_validate(name, value) -> bool:
+    """旧实现：每次读取配置模式后逐项比较"""
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        schema = json.load(f)
+    spec = schema.get(name)
+    if spec is None:
+        return False
+    expected = {"string": str, "boolean": bool, "integer": int, "number": (int, float)}.get(spec["type"])
+    if expected and not isinstance(value, expected):
+        return False
+    return "choices" not in spec or value in spec["choices"]
+
+
+def main(writes: int = 100_000):
+    """主函数入口"""
+    rng = random.Random(0)
+    samples = [rng.choice(SAMPLES) for _ in range(writes)]
+    cache = SchemaCache(SCHEMA_PATH)
+
+    legacy_count = writes // 100
+    start = time.perf_counter()
+    for name, value in samples[:legacy_count]:
+        legacy_validate(name, value)
+    legacy = (time.perf_counter() - start) / legacy_count
+
+    # 每次写入都经过缓存检查，与配置界面的实际调用方式一致
+    start = time.perf_counter()
+    failures = 0
+    for name, value in samples:
+        try:
+            cache.get().validate(name, value)
+        except ConfigValidationError:
+            failures += 1
+    compiled_cached = (time.perf_counter() - start) / writes
+
+    # 持有校验器对象时只剩下校验本身的开销
+    validator = cache.get()
+    start = time.perf_counter()
+    for name, value in samples:
+        try:
+            validator.validate(name, value)
+        except ConfigValidationError:
+            pass
+    compiled = (time.perf_counter() - start) / writes
+
+    print(f"写入次数: {writes}，校验失败: {failures}")
+    print(f"{'实现':<28}{'单次耗时(us)':>14}")
+    print(f"{'每次读取config_schema.json':<28}{legacy * 1e6:>14.2f}")
+    print(f"{'SchemaCache.get().validate':<28}{compiled_cached * 1e6:>14.2f}")
+    print(f"{'CompiledSchema.validate':<28}{compiled * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+插件导入解析微基准测试
+
+模拟加载了50个插件的宿主进程，对比两种让插件找到自己demos包的方式下，宿主进程中模块解析的单次耗时：
+- sys.path前插（旧实现）：每个插件向sys.path前插两个目录，之后所有导入都要先在这些目录中查找
+- 限定范围的finder（新实现）：每个插件在sys.meta_path中安装一个只负责自己顶层包的PluginPackageFinder
+
+运行方式（在插件根目录下）：
+    python -m benchmarks.bench_import_scope
+    python -m benchmarks.bench_import_scope --plugins 100
+"""
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+from fastx_tui_plugin_example.plugin_importer import PluginPackageFinder
+
+HOST_MODULES = 200
+
+
+def build_tree(root: str, plugins: int) -> tuple[list[str], list[str], str]:
+    """创建模拟的插件目录和宿主模块目录
+
+    每个插件目录包含一个demos_<i>包和若干模块文件，宿主目录包含HOST_MODULES个空模块。
+
+    Returns:
+        tuple[list[str], list[str], str]: 插件目录、旧实现前插的目录、宿主模块目录
+    """
+    plugin_dirs = []
+    legacy_entries = []
+    for index in range(plugins):
+        plugin_dir = os.path.join(root, "plugins", f"plugin_{index}")
+        package_dir = os.path.join(plugin_dir, f"demos_{index}")
+        os.makedirs(package_dir)
+        for name in ("__init__.py", "monitor.py", "dashboard.py"):
+            open(os.path.join(package_dir, name), "w").close()
+        for name in ("fastx_tui_plugin.py", "business.py", "manual.md", "config_schema.json"):
+            open(os.path.join(plugin_dir, name), "w").close()
+        plugin_dirs.append(plugin_dir)
+        # 旧实现前插的两个目录：插件目录和项目根目录
+        legacy_entries.append(plugin_dir)
+        project_root = os.path.join(root, "projects", f"project_{index}")
+        os.makedirs(project_root)
+        legacy_entries.append(project_root)
+
+    host_dir = os.path.join(root, "host")
+    os.makedirs(host_dir)
+    for index in range(HOST_MODULES):
+        open(os.path.join(host_dir, f"host_module_{index}.py"), "w").close()
+    return plugin_dirs, legacy_entries, host_dir
+
+
+def measure(names: list[str], rounds: int, cold: bool) -> float:
+    """返回单次find_spec的平均耗时（微秒）
+
+    Args:
+        names: 要解析的模块名，均未导入
+        rounds: 重复轮数
+        cold: 每轮前是否清空导入系统的目录缓存
+    """
+    find_spec = importlib.util.find_spec
+    elapsed = 0
+    for _ in range(rounds):
+        if cold:
+            importlib.invalidate_caches()
+        start = time.perf_counter_ns()
+        for name in names:
+            if find_spec(name) is None:
+                raise ImportError(name)
+        elapsed += time.perf_counter_ns() - start
+    return elapsed / (rounds * len(names)) / 1e3
+
+
+def run_scenario(name: str, host_dir: str, extra_path: list[str], finders: list, plugins: int,
+                 rounds: int) -> dict[str, float]:
+    """在指定的sys.path和sys.meta_path下测量模块解析耗时，结束后恢复原状"""
+    saved_path = sys.path[:]
+    saved_meta_path = sys.meta_path[:]
+    sys.path[:0] = extra_path
+    sys.path.append(host_dir)
+    sys.meta_path[:0] = finders
+    try:
+        host_names = [f"host_module_{index}" for index in range(HOST_MODULES)]
+        plugin_names = [f"demos_{index}" for index in range(plugins)]
+        return {
+            "scenario": name,
+            "host_warm_us": measure(host_names, rounds, cold=False),
+            "host_cold_us": measure(host_names, max(1, rounds // 10), cold=True),
+            "plugin_warm_us": measure(plugin_names, rounds, cold=False),
+        }
+    finally:
+        sys.path[:] = saved_path
+        sys.meta_path[:] = saved_meta_path
+        importlib.invalidate_caches()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数入口"""
+    parser = argparse.ArgumentParser(description="对比sys.path前插与限定范围finder的模块解析耗时")
+    parser.add_argument("--plugins", type=int, default=50, help="模拟加载的插件数量")
+    parser.add_argument("--rounds", type=int, default=50, help="每项测量的重复轮数")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="fastx_import_bench_") as root:
+        plugin_dirs, legacy_entries, host_dir = build_tree(root, args.plugins)
+        finders = [PluginPackageFinder(plugin_dir, [f"demos_{index}"], prefix=None)
+                   for index, plugin_dir in enumerate(plugin_dirs)]
+        results = [
+            run_scenario("sys.path前插", host_dir, legacy_entries, [], args.plugins, args.rounds),
+            run_scenario("限定范围的finder", host_dir, [], finders, args.plugins, args.rounds),
+        ]
+
+    print(f"插件数量: {args.plugins}，宿主模块: {HOST_MODULES}，单次find_spec耗时(us)")
+    print(f"{'实现':<20}{'宿主模块':>12}{'宿主模块(冷)':>16}{'插件demos包':>14}")
+    for result in results:
+        print(f"{result['scenario']:<20}{result['host_warm_us']:>12.2f}{result['host_cold_us']:>16.2f}"
+              f"{result['plugin_warm_us']:>14.2f}")
+    legacy, scoped = results
+    print(f"宿主模块解析加速比: {legacy['host_warm_us'] / scoped['host_warm_us']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
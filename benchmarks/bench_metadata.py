@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+插件元数据微基准测试
+
+对比每次调用都解析pyproject.toml（旧实现）与PluginMetadata缓存（新实现）的单次调用开销。
+
+运行方式（在插件根目录下）：
+    python -m benchmarks.bench_metadata
+"""
+import os
+import time
+from types import SimpleNamespace
+
+from fastx_tui_plugin_example.plugin_metadata import PluginMetadata
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_get_version() -> str:
+    """旧实现：每次调用都打开并解析pyproject.toml"""
+    pyproject_path = os.path.join(PROJECT_DIR, "pyproject.toml")
+    try:
+        import toml
+        with open(pyproject_path, encoding="utf-8") as f:
+            return toml.load(f)["project"]["version"]
+    except ModuleNotFoundError:
+        import tomllib
+        with open(pyproject_path, "rb") as f:
+            return tomllib.load(f)["project"]["version"]
+
+
+def build_info(version: str) -> SimpleNamespace:
+    """构建一个与PluginInfo字段数量相近的替身对象"""
+    return SimpleNamespace(name="示例插件", version=version, author="FastX Team", tags=["示例"])
+
+
+def measure(func, iterations: int) -> float:
+    """返回单次调用的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int = 20000):
+    """主函数入口"""
+    metadata = PluginMetadata(PROJECT_DIR)
+
+    before = measure(lambda: build_info(legacy_get_version()), iterations // 20)
+    after = measure(lambda: metadata.get_info(build_info), iterations)
+
+    print(f"{'实现':<24}{'单次耗时(us)':>14}")
+    print(f"{'每次解析pyproject.toml':<24}{before:>14.2f}")
+    print(f"{'PluginMetadata缓存':<24}{after:>14.2f}")
+    print(f"加速比: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+宿主程序替身
+
+提供最小可用的 core.menu_system 和 core.plugin_manager 替身（Plugin、PluginInfo、MenuSystem、
+ActionItem、CommandType），让插件可以脱离FastX-Tui宿主程序导入、注册和执行命令，
+用于基准测试、压力测试等无终端场景。
+
+用法：
+    from benchmarks import host_stub
+    host_stub.install()
+    plugin, menu_system = host_stub.load_plugin()
+"""
+import logging
+import os
+import sys
+import types
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CommandType(Enum):
+    """命令类型"""
+    PYTHON = "python"
+    SHELL = "shell"
+
+
+class ActionItem:
+    """可执行的菜单项"""
+
+    def __init__(self, id: str, name: str, description: str = "", command_type: CommandType = CommandType.PYTHON,
+                 python_func=None, category: str = "", **kwargs):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.command_type = command_type
+        self.python_func = python_func
+        self.category = category
+        self.extra = kwargs
+
+    def execute(self) -> Any:
+        """执行命令"""
+        return self.python_func()
+
+
+class SubMenu:
+    """子菜单"""
+
+    def __init__(self, id: str, name: str, description: str = "", **kwargs):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.items = []
+
+    def add_item(self, item_id: str):
+        """添加菜单项"""
+        self.items.append(item_id)
+
+
+class MenuSystem:
+    """菜单系统"""
+
+    def __init__(self):
+        self.items = {"main_menu": SubMenu("main_menu", "主菜单")}
+
+    def create_submenu(self, menu_id: str, name: str, description: str = "", **kwargs) -> SubMenu:
+        """创建并注册子菜单"""
+        menu = SubMenu(menu_id, name, description, **kwargs)
+        self.items[menu_id] = menu
+        return menu
+
+    def register_item(self, item: ActionItem):
+        """注册菜单项"""
+        self.items[item.id] = item
+
+    def get_item_by_id(self, item_id: str):
+        """根据ID获取菜单项"""
+        return self.items.get(item_id)
+
+    def add_item_to_main_menu(self, item_id: str):
+        """添加到主菜单"""
+        self.items["main_menu"].add_item(item_id)
+
+    def commands(self) -> dict[str, ActionItem]:
+        """获取所有可执行命令"""
+        return {item_id: item for item_id, item in self.items.items() if isinstance(item, ActionItem)}
+
+
+@dataclass
+class PluginInfo:
+    """插件信息"""
+    name: str
+    version: str
+    author: str
+    description: str
+    category: str = ""
+    tags: list[str] = field(default_factory=list)
+    compatibility: dict[str, str] = field(default_factory=dict)
+    dependencies: list[str] = field(default_factory=list)
+    repository: str = ""
+    homepage: str = ""
+    license: str = ""
+    last_updated: str = ""
+    rating: float = 0.0
+    downloads: int = 0
+
+
+class Plugin:
+    """插件基类，配置保存在内存中"""
+
+    def __init__(self):
+        self.plugin_path = None
+        self.logger = logging.getLogger(f"plugin.{type(self).__name__}")
+        self.main_menus_registered = 0
+        self.main_menu_id = None
+        self.configs = {}
+
+    def get_config(self, config_name: str, default: Any = None) -> Any:
+        return self.configs.get(config_name, default)
+
+    def set_config(self, config_name: str, value: Any):
+        self.configs[config_name] = value
+
+    def get_resource_path(self, resource_name: str) -> str:
+        return os.path.join(self.plugin_path or PLUGIN_DIR, "resources", resource_name)
+
+    def get_manual(self) -> str:
+        return ""
+
+    def get_config_schema(self) -> dict[str, Any]:
+        return {}
+
+    def log_debug(self, message: str):
+        self.logger.debug(message)
+
+    def log_info(self, message: str):
+        self.logger.info(message)
+
+    def log_warning(self, message: str):
+        self.logger.warning(message)
+
+    def log_error(self, message: str):
+        self.logger.error(message)
+
+    def log_critical(self, message: str):
+        self.logger.critical(message)
+
+
+def install(force: bool = False) -> bool:
+    """将替身模块注册为 core.menu_system 和 core.plugin_manager
+
+    Args:
+        force: 即使宿主程序的core包可以导入也强制使用替身
+
+    Returns:
+        bool: 是否安装了替身
+    """
+    if not force:
+        try:
+            import core.menu_system  # noqa: F401
+            import core.plugin_manager  # noqa: F401
+            return False
+        except ImportError:
+            pass
+
+    core = types.ModuleType("core")
+    core.__path__ = []
+    menu_system = types.ModuleType("core.menu_system")
+    menu_system.ActionItem = ActionItem
+    menu_system.CommandType = CommandType
+    menu_system.MenuSystem = MenuSystem
+    menu_system.SubMenu = SubMenu
+    plugin_manager = types.ModuleType("core.plugin_manager")
+    plugin_manager.Plugin = Plugin
+    plugin_manager.PluginInfo = PluginInfo
+    core.menu_system = menu_system
+    core.plugin_manager = plugin_manager
+    sys.modules.update({"core": core, "core.menu_system": menu_system, "core.plugin_manager": plugin_manager})
+    return True
+
+
+def load_plugin(configs: dict[str, Any] | None = None, plugin_dir: str = PLUGIN_DIR):
+    """按宿主程序的流程加载插件：创建实例、初始化、注册命令
+
+    Args:
+        configs: 插件配置
+        plugin_dir: 插件目录
+
+    Returns:
+        tuple[ExamplePlugin, MenuSystem]: 插件实例和注册了命令的菜单系统
+    """
+    install()
+    if plugin_dir not in sys.path:
+        sys.path.insert(0, plugin_dir)
+    from fastx_tui_plugin import ExamplePlugin
+
+    plugin = ExamplePlugin()
+    plugin.plugin_path = plugin_dir
+    for name, value in (configs or {}).items():
+        plugin.set_config(name, value)
+    plugin.initialize()
+    menu_system = MenuSystem()
+    plugin.register(menu_system)
+    return plugin, menu_system
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+插件命令压力测试
+
+使用宿主程序替身加载插件，在线程池或进程池中并发执行指定命令N次，
+统计吞吐量、延迟分布和失败次数，不需要终端和交互式菜单。
+
+命令抛出异常，或返回的字符串包含失败标记（插件命令捕获异常后返回"...失败: ..."）时记为失败。
+
+运行方式（在插件根目录下）：
+    python -m benchmarks.loadtest example_config -n 10000 -c 8
+    python -m benchmarks.loadtest example_binary -n 200 -c 4 --pool process --format json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from benchmarks import host_stub
+
+# 输出格式版本，字段含义变化时递增
+SCHEMA_VERSION = 1
+
+DEFAULT_FAILURE_MARKER = "失败"
+
+# 进程池中每个工作进程各自加载的插件
+_worker_state = {}
+# 等待所有工作进程完成预热的最长秒数
+WORKER_READY_TIMEOUT = 120
+
+
+def parse_configs(items: list[str]) -> dict:
+    """解析 key=value 形式的配置，值按JSON解析，解析失败时作为字符串"""
+    configs = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"配置格式应为 key=value: {item}")
+        try:
+            configs[name] = json.loads(value)
+        except ValueError:
+            configs[name] = value
+    return configs
+
+
+def load_command(command_id: str, configs: dict):
+    """加载插件并查找命令
+
+    Returns:
+        tuple[ExamplePlugin, Callable]: 插件实例和命令的可调用对象
+    """
+    plugin, menu_system = host_stub.load_plugin(configs)
+    item = menu_system.commands().get(command_id)
+    if item is None:
+        plugin.cleanup()
+        raise KeyError(f"命令不存在: {command_id}，可用命令: {', '.join(sorted(menu_system.commands()))}")
+    return plugin, item.python_func
+
+
+def run_batch(func, count: int, failure_marker: str) -> tuple[list[int], Counter]:
+    """连续执行命令count次
+
+    Returns:
+        tuple[list[int], Counter]: 每次调用的耗时（纳秒）和按原因统计的失败次数
+    """
+    samples = []
+    failures = Counter()
+    clock = time.perf_counter_ns
+    for _ in range(count):
+        start = clock()
+        try:
+            result = func()
+        except Exception as e:
+            samples.append(clock() - start)
+            failures[f"{type(e).__name__}: {e}"] += 1
+            continue
+        samples.append(clock() - start)
+        if failure_marker and isinstance(result, str) and failure_marker in result:
+            failures[result.strip().splitlines()[-1]] += 1
+    return samples, failures
+
+
+def _init_worker(command_id: str, configs: dict, show_output: bool, warmup: int, failure_marker: str,
+                 ready) -> None:
+    """进程池初始化：在工作进程中加载插件并预热，每个工作进程都会执行，不依赖任务的分配"""
+    if not show_output:
+        sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    _worker_state["plugin"], _worker_state["func"] = load_command(command_id, configs)
+    run_batch(_worker_state["func"], warmup, failure_marker)
+    _worker_state["ready"] = ready
+
+
+def _wait_worker_ready() -> None:
+    """等待所有工作进程都完成初始化
+
+    每个工作进程都阻塞在屏障上，同一个进程不会领取两个该任务，进程池因此会启动全部工作进程。
+    """
+    _worker_state["ready"].wait(WORKER_READY_TIMEOUT)
+
+
+def _run_worker_batch(count: int, failure_marker: str) -> tuple[list[int], Counter]:
+    """在工作进程中执行一批调用"""
+    return run_batch(_worker_state["func"], count, failure_marker)
+
+
+def split_batches(requests: int, concurrency: int) -> list[int]:
+    """将请求分成若干批，批数为并发数的4倍，使较慢的工作者不会拖长总耗时"""
+    batches = min(requests, concurrency * 4)
+    size, rest = divmod(requests, batches)
+    return [size + (1 if i < rest else 0) for i in range(batches)]
+
+
+def percentile(samples: list[int], percent: float) -> int:
+    """已排序样本的百分位数"""
+    index = min(len(samples) - 1, max(0, round(len(samples) * percent / 100) - 1))
+    return samples[index]
+
+
+def summarize(command_id: str, pool: str, concurrency: int, elapsed_ns: int,
+              samples: list[int], failures: Counter) -> dict:
+    """汇总压力测试结果"""
+    samples.sort()
+    total = len(samples)
+    failed = sum(failures.values())
+    return {
+        "schema": SCHEMA_VERSION,
+        "command": command_id,
+        "pool": pool,
+        "concurrency": concurrency,
+        "requests": total,
+        "failures": failed,
+        "failure_rate": failed / total if total else 0.0,
+        "elapsed_ns": elapsed_ns,
+        "throughput_per_s": total / (elapsed_ns / 1e9) if elapsed_ns else 0.0,
+        "latency_ns": {
+            "min": samples[0],
+            "mean": round(sum(samples) / total),
+            "p50": percentile(samples, 50),
+            "p90": percentile(samples, 90),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+            "p999": percentile(samples, 99.9),
+            "max": samples[-1],
+        },
+        "failure_reasons": dict(failures.most_common(10)),
+    }
+
+
+def run(command_id: str, requests: int, concurrency: int, pool: str, configs: dict,
+        warmup: int = 10, failure_marker: str = DEFAULT_FAILURE_MARKER, show_output: bool = False) -> dict:
+    """并发执行命令并汇总结果
+
+    Args:
+        command_id: 命令ID
+        requests: 总调用次数
+        concurrency: 线程数或进程数
+        pool: "thread" 或 "process"
+        configs: 插件配置
+        warmup: 正式计时前的预热次数，当前进程和进程池的每个工作进程都各自执行，也用于尽早发现命令不存在等错误
+        failure_marker: 命令返回值包含该字符串时记为失败，为空时只统计异常
+        show_output: 是否保留命令的标准输出
+
+    Returns:
+        dict: 压力测试结果
+    """
+    samples = []
+    failures = Counter()
+    output = contextlib.nullcontext() if show_output else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        plugin, func = load_command(command_id, configs)
+        try:
+            run_batch(func, warmup, failure_marker)
+            if pool == "process":
+                context = multiprocessing.get_context()
+                executor = ProcessPoolExecutor(concurrency, mp_context=context, initializer=_init_worker,
+                                               initargs=(command_id, configs, show_output, warmup, failure_marker,
+                                                         context.Barrier(concurrency)))
+                task, task_args = _run_worker_batch, ()
+            else:
+                executor = ThreadPoolExecutor(concurrency, thread_name_prefix="loadtest")
+                task, task_args = run_batch, (func,)
+
+            with executor:
+                if pool == "process":
+                    # 等待所有工作进程加载插件并预热，启动和冷启动耗时不计入结果
+                    for future in [executor.submit(_wait_worker_ready) for _ in range(concurrency)]:
+                        future.result()
+                start = time.perf_counter_ns()
+                futures = [executor.submit(task, *task_args, count, failure_marker)
+                           for count in split_batches(requests, concurrency)]
+                for future in futures:
+                    batch_samples, batch_failures = future.result()
+                    samples.extend(batch_samples)
+                    failures.update(batch_failures)
+                elapsed_ns = time.perf_counter_ns() - start
+        finally:
+            plugin.cleanup()
+    return summarize(command_id, pool, concurrency, elapsed_ns, samples, failures)
+
+
+def print_table(report: dict) -> None:
+    """以表格形式输出结果"""
+    latency = report["latency_ns"]
+    print(f"命令: {report['command']}  池: {report['pool']} x {report['concurrency']}")
+    print(f"请求: {report['requests']}  失败: {report['failures']} ({report['failure_rate']:.2%})  "
+          f"耗时: {report['elapsed_ns'] / 1e9:.3f} s  吞吐量: {report['throughput_per_s']:.1f} 次/秒")
+    print("延迟(us): " + "  ".join(f"{name}={value / 1e3:.1f}" for name, value in latency.items()))
+    for reason, count in report["failure_reasons"].items():
+        print(f"  {count:>8}  {reason}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数入口"""
+    parser = argparse.ArgumentParser(description="插件命令压力测试")
+    parser.add_argument("command", help="要执行的命令ID，例如 example_config")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="总调用次数")
+    parser.add_argument("-c", "--concurrency", type=int, default=os.cpu_count() or 4, help="线程数或进程数")
+    parser.add_argument("--pool", choices=["thread", "process"], default="thread", help="并发方式")
+    parser.add_argument("--config", action="append", default=[], metavar="KEY=VALUE",
+                        help="插件配置，可重复指定，值按JSON解析，例如 --config lazy_init=false")
+    parser.add_argument("--warmup", type=int, default=10, help="正式计时前的预热次数")
+    parser.add_argument("--failure-marker", default=DEFAULT_FAILURE_MARKER,
+                        help="命令返回值包含该字符串时记为失败，设为空字符串时只统计异常")
+    parser.add_argument("--show-output", action="store_true", help="保留命令的标准输出")
+    parser.add_argument("--format", choices=["json", "table"], default="table", help="输出格式")
+    parser.add_argument("--output", help="JSON结果输出文件")
+    args = parser.parse_args(argv)
+
+    if args.requests < 1 or args.concurrency < 1:
+        parser.error("--requests和--concurrency必须大于0")
+    try:
+        configs = parse_configs(args.config)
+        report = run(args.command, args.requests, args.concurrency, args.pool, configs,
+                     args.warmup, args.failure_marker, args.show_output)
+    except (KeyError, ValueError) as e:
+        print(f"压力测试失败: {e.args[0]}", file=sys.stderr)
+        return 2
+
+    text = json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False)
+    if args.format == "table":
+        print_table(report)
+    else:
+        print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    # 存在失败时返回非零状态码，便于在构建机上判断
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
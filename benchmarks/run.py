@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+插件基准测试套件
+
+使用宿主程序替身加载插件，测量插件接口、命令以及demos/rich中各个渲染函数的单次耗时，
+结果以稳定的JSON格式输出，便于在不同版本之间比较性能回归。
+
+运行方式（在插件根目录下）：
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --filter render. --format table
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable
+
+from benchmarks import host_stub
+
+# 输出格式版本，字段含义变化时递增
+SCHEMA_VERSION = 1
+
+RENDER_WIDTH = 120
+RENDER_HEIGHT = 40
+
+
+def measure(func: Callable[[], object], iterations: int, warmup: int) -> dict[str, float]:
+    """多次执行函数并统计单次耗时（纳秒）"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "min_ns": samples[0],
+        "mean_ns": round(sum(samples) / iterations),
+        "p50_ns": samples[iterations // 2],
+        "p95_ns": samples[min(iterations - 1, iterations * 95 // 100)],
+        "max_ns": samples[-1],
+    }
+
+
+def plugin_benchmarks(plugin, menu_system) -> dict[str, Callable[[], object]]:
+    """插件接口和命令的基准测试"""
+    from fastx_tui_plugin_example.command_metrics import CommandMetrics
+    from fastx_tui_plugin_example.plugin_commands import MENUS, demo, register_menus
+
+    business = plugin.business
+    # 500个演示命令，衡量声明式注册本身的开销（注册时不导入演示模块）
+    many_demos = tuple(demo(f"bench_demo_{i}", f"演示{i}", "基准测试", ".demos.rich.panel_table:main") for i in range(500))
+
+    def register_commands():
+        business.register_commands(host_stub.MenuSystem())
+
+    def register_500_demos():
+        register_menus(host_stub.MenuSystem(), None, CommandMetrics(), many_demos, MENUS)
+
+    return {
+        "plugin.get_info": plugin.get_info,
+        "plugin.get_manual": plugin.get_manual,
+        "plugin.get_config_schema": plugin.get_config_schema,
+        "business.register_commands": register_commands,
+        "registry.register_500_demos": register_500_demos,
+        "command.hello_world": menu_system.get_item_by_id("example_hello").python_func,
+        "command.config_demo": menu_system.get_item_by_id("example_config").python_func,
+    }
+
+
+def render_benchmarks() -> dict[str, Callable[[], object]]:
+    """demos/rich中各个渲染函数的单帧基准测试，每帧推进一次演示状态"""
+    from fastx_tui_plugin_example.demos.rich.render_backend import (
+        OffscreenBackend,
+        frame_drivers,
+    )
+
+    backend = OffscreenBackend(RENDER_WIDTH, RENDER_HEIGHT)
+    return {f"render.{name}": driver for name, driver in frame_drivers(backend).items()}
+
+
+def run(iterations: int, warmup: int, name_filter: str | None, include_render: bool) -> dict:
+    """运行全部基准测试"""
+    plugin, menu_system = host_stub.load_plugin({"lazy_init": False})
+    benchmarks = plugin_benchmarks(plugin, menu_system)
+    if include_render:
+        benchmarks.update(render_benchmarks())
+
+    results = {}
+    for name, func in benchmarks.items():
+        if name_filter and name_filter not in name:
+            continue
+        # 渲染比插件接口慢几个数量级，减少迭代次数以控制总耗时
+        count = max(1, iterations // 20) if name.startswith("render.") else iterations
+        results[name] = measure(func, count, min(warmup, count))
+
+    plugin.cleanup()
+    return {
+        "schema": SCHEMA_VERSION,
+        "plugin_version": plugin.get_version(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": sys.platform,
+        "results": results,
+    }
+
+
+def print_table(report: dict) -> None:
+    """以表格形式输出结果"""
+    print(f"{'基准测试':<36}{'次数':>8}{'min(us)':>12}{'p50(us)':>12}{'p95(us)':>12}")
+    for name, result in report["results"].items():
+        print(f"{name:<36}{result['iterations']:>8}{result['min_ns'] / 1e3:>12.2f}"
+              f"{result['p50_ns'] / 1e3:>12.2f}{result['p95_ns'] / 1e3:>12.2f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数入口"""
+    parser = argparse.ArgumentParser(description="插件基准测试套件")
+    parser.add_argument("--iterations", type=int, default=2000, help="插件接口的迭代次数，渲染基准为其1/20")
+    parser.add_argument("--warmup", type=int, default=20, help="正式计时前的预热次数")
+    parser.add_argument("--filter", help="只运行名称包含该字符串的基准测试")
+    parser.add_argument("--no-render", action="store_true", help="跳过demos/rich渲染基准测试")
+    parser.add_argument("--format", choices=["json", "table"], default="json", help="输出格式")
+    parser.add_argument("--output", help="JSON结果输出文件，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    report = run(args.iterations, args.warmup, args.filter, not args.no_render)
+    if args.format == "table":
+        print_table(report)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    elif args.format == "json":
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+插件启动耗时预算检查
+
+在子进程中以 -X importtime 方式导入插件并执行 ExamplePlugin() / initialize() / register()，
+统计插件自身导入的累计耗时和注册耗时，超过预算时以非零状态码退出，可直接用于CI。
+
+宿主程序的 core 模块在计时开始前预先导入，不计入插件预算。
+
+运行方式（在插件根目录下）：
+    python -m benchmarks.startup_budget --host-root /path/to/FastX-Tui --budget-ms 50
+    python -m benchmarks.startup_budget --stub-host
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 插件通常安装在 <宿主根目录>/plugins/<插件目录> 下
+DEFAULT_HOST_ROOT = os.path.dirname(os.path.dirname(PLUGIN_DIR))
+DEFAULT_BUDGET_MS = 50.0
+
+# 子进程中执行的测量脚本，结果以JSON输出到stdout，importtime输出到stderr
+PROBE = r"""
+import json, os, sys, time
+if os.environ.get("FASTX_STUB_HOST"):
+    from benchmarks import host_stub
+    host_stub.install(force=True)
+import core.menu_system, core.plugin_manager
+print("--- plugin import start ---", file=sys.stderr, flush=True)
+t0 = time.perf_counter_ns()
+import fastx_tui_plugin
+t1 = time.perf_counter_ns()
+plugin = fastx_tui_plugin.ExamplePlugin()
+plugin.initialize()
+t2 = time.perf_counter_ns()
+plugin.register(core.menu_system.MenuSystem())
+t3 = time.perf_counter_ns()
+print(json.dumps({"import_ns": t1 - t0, "initialize_ns": t2 - t1, "register_ns": t3 - t2}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """解析 -X importtime 输出
+
+    只保留插件导入开始标记之后的记录。
+
+    Returns:
+        list[tuple[str, int, int]]: (模块名, 自身耗时us, 累计耗时us) 列表
+    """
+    _, _, tail = stderr.partition("--- plugin import start ---")
+    records = []
+    for line in tail.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        records.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def run_probe(host_root: str, stub_host: bool = False) -> tuple[dict, list[tuple[str, int, int]]]:
+    """在干净的子进程中运行测量脚本"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (PLUGIN_DIR, host_root, env.get("PYTHONPATH")) if p)
+    if stub_host:
+        env["FASTX_STUB_HOST"] = "1"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=PLUGIN_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"测量进程执行失败:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数入口"""
+    parser = argparse.ArgumentParser(description="检查插件导入和注册耗时是否超出预算")
+    parser.add_argument("--host-root", default=DEFAULT_HOST_ROOT, help="包含core包的宿主程序根目录")
+    parser.add_argument("--stub-host", action="store_true", help="使用benchmarks.host_stub代替宿主程序的core包")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="导入+初始化+注册的耗时预算（毫秒）")
+    parser.add_argument("--runs", type=int, default=5, help="测量次数，取最小值以降低噪声")
+    parser.add_argument("--top", type=int, default=10, help="列出自身耗时最高的模块数量")
+    args = parser.parse_args(argv)
+
+    best = None
+    records = []
+    for _ in range(args.runs):
+        timings, run_records = run_probe(args.host_root, args.stub_host)
+        total = sum(timings.values())
+        if best is None or total < sum(best.values()):
+            best, records = timings, run_records
+
+    total_ms = sum(best.values()) / 1e6
+    print(f"导入:   {best['import_ns'] / 1e6:8.2f} ms")
+    print(f"初始化: {best['initialize_ns'] / 1e6:8.2f} ms")
+    print(f"注册:   {best['register_ns'] / 1e6:8.2f} ms")
+    print(f"合计:   {total_ms:8.2f} ms (预算 {args.budget_ms:.2f} ms)")
+
+    if records:
+        print("\n自身导入耗时最高的模块:")
+        for name, self_us, cumulative_us in sorted(records, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"  {self_us:8d} us  {cumulative_us:8d} us  {name.strip()}")
+
+    if total_ms > args.budget_ms:
+        print(f"\n超出启动预算 {total_ms - args.budget_ms:.2f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
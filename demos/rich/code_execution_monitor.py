@@ -1,18 +1,29 @@
+import argparse
 import random
-import time
+import sys
 from datetime import datetime
 
-from rich.console import Console
 from rich.layout import Layout
-from rich.live import Live
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.text import Text
 
+from .log_filter import LogFilter
+from .log_ingest import LogIngestQueue
+from .log_session import DEFAULT_SESSION_DIR, SessionWriter
+from .log_store import DEFAULT_CAPACITY, LogStore
+from .render_backend import get_backend
+
 
 class CodeMonitor:
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, scrollback=DEFAULT_CAPACITY, session=None):
+        """初始化代码执行监控
+
+        Args:
+            scrollback: 最多保留的日志条数
+            session: 会话持久化（log_session.SessionWriter），所有日志在后台写入gzip会话文件
+        """
+        self.console = get_backend().create_console()
         self.layout = Layout()
 
         # 初始化状态变量
@@ -20,7 +31,9 @@ class CodeMonitor:
         self.errors = 0
         self.warnings = 0
         self.current_line = 0  # 先初始化这个属性
-        self.log_content = Text()
+        self.logs = LogStore(scrollback)  # 最多保留scrollback条日志
+        self.ingest = LogIngestQueue(self.logs, sink=session)  # 日志在每次渲染前批量写入
+        self.filter = LogFilter(self.logs)  # 日志的级别和正则过滤条件
 
         # 创建三栏布局：代码 + 日志 + 状态
         self.layout.split_row(
@@ -29,6 +42,7 @@ class CodeMonitor:
         )
         self.layout["logs"].split(
             Layout(name="log_content", ratio=3),
+            Layout(name="filter", size=1, visible=False),  # 过滤栏，设置过滤条件后显示
             Layout(name="status", size=6)  # 状态栏
         )
 
@@ -87,7 +101,7 @@ def save_results(results, filename):
     pass
 
 if __name__ == "__main__":
-    main()'''
+    main(sys.argv[1:])'''
 
         self.highlight_line = 0
 
@@ -132,16 +146,15 @@ if __name__ == "__main__":
 
     def init_log_panel(self):
         """初始化日志面板"""
-        self.log_content.append("[dim]系统初始化完成，等待执行命令...\n[/dim]")
-
         self.layout["log_content"].update(
             Panel(
-                self.log_content,
+                self.logs.view("[dim]系统初始化完成，等待执行命令...[/dim]", self.ingest, self.filter),
                 title="[bold yellow]执行日志[/bold yellow]",
                 border_style="yellow",
                 padding=(1, 1)
             )
         )
+        self.layout["filter"].update(self.filter)
 
     def init_status_bar(self):
         """初始化状态栏"""
@@ -209,52 +222,15 @@ if __name__ == "__main__":
             )
         )
 
-    def add_log(self, message, level="INFO"):
-        """添加日志消息"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-
-        # 根据日志级别设置样式
-        if level == "INFO":
-            style = "white"
-            prefix = "[INFO]"
-        elif level == "WARNING":
-            style = "yellow"
-            prefix = "[WARN]"
-        elif level == "ERROR":
-            style = "red"
-            prefix = "[ERR]"
-        elif level == "SUCCESS":
-            style = "bold green"
-            prefix = "[OK]"
-        elif level == "DEBUG":
-            style = "dim"
-            prefix = "[DBG]"
-        else:
-            style = "white"
-            prefix = "[LOG]"
-
-        # 添加新日志
-        log_line = Text()
-        log_line.append(f"{timestamp} ", style="dim cyan")
-        log_line.append(f"{prefix} ", style=style)
-        log_line.append(f"{message}\n", style=style)
-
-        self.log_content.append(log_line)
+    def set_filter(self, levels=None, pattern=None):
+        """设置日志过滤条件（级别名称集合和正则表达式），有过滤条件时显示过滤栏"""
+        self.filter.set_levels(levels)
+        self.filter.set_pattern(pattern)
+        self.layout["filter"].visible = self.filter.active
 
-        # 限制日志行数
-        lines = str(self.log_content).split('\n')
-        if len(lines) > 25:  # 保留最近25行
-            self.log_content = Text("\n".join(lines[-25:]) + "\n")
-
-        # 更新日志面板
-        self.layout["log_content"].update(
-            Panel(
-                self.log_content,
-                title="[bold yellow]执行日志[/bold yellow]",
-                border_style="yellow",
-                padding=(1, 1)
-            )
-        )
+    def add_log(self, message, level="INFO"):
+        """添加日志消息，可以从任意线程调用，日志面板渲染时才批量写入并绘制可见的行"""
+        self.ingest.put(message, level)
 
     def update_code_execution(self):
         """更新代码执行位置"""
@@ -294,7 +270,8 @@ if __name__ == "__main__":
 
     def run(self):
         """运行监控系统"""
-        with Live(self.layout, refresh_per_second=10, screen=True):
+        backend = get_backend()
+        with backend.live(self.layout, refresh_per_second=10, screen=True):
             self.console.print("[bold cyan]🚀 开始代码执行监控...[/bold cyan]\n")
 
             # 初始日志
@@ -304,7 +281,7 @@ if __name__ == "__main__":
 
             # 模拟执行过程
             for step in range(1, 101):
-                time.sleep(0.1)
+                backend.sleep(0.1)
                 self.progress = step
 
                 # 更新代码执行位置
@@ -356,18 +333,33 @@ if __name__ == "__main__":
             # 最终状态
             self.add_log("✅ 程序执行成功完成！", "SUCCESS")
             self.add_log(f"总耗时: 10.2秒 | 错误: {self.errors} | 警告: {self.warnings}", "INFO")
-            time.sleep(2)
+            backend.sleep(2)
+
+
+def main(argv=None):
+    """主函数入口
 
+    Args:
+        argv: 命令行参数，None时（从插件菜单运行）不保存会话
+    """
+    parser = argparse.ArgumentParser(description="代码执行监控")
+    parser.add_argument("--record", action="store_true", help="把所有日志写入gzip压缩的会话文件")
+    parser.add_argument("--session-dir", default=DEFAULT_SESSION_DIR, help="会话文件目录")
+    args = parser.parse_args([] if argv is None else argv)
 
-def main():
-    """主函数入口"""
+    session = None
     try:
-        monitor = CodeMonitor()
+        session = SessionWriter(args.session_dir) if args.record else None
+        monitor = CodeMonitor(session=session)
         monitor.run()
     except KeyboardInterrupt:
         print("\n[yellow]程序被用户中断[/yellow]")
     except Exception as e:
         print(f"[red]程序执行出错: {e}[/red]")
+    finally:
+        if session is not None:
+            session.close()
+            print(f"会话已保存: {session.session_id}，{session.written} 条日志")
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -1,30 +1,76 @@
+import argparse
+import asyncio
+import json
+import os
 import random
+import re
+import sys
+import threading
 import time
 from datetime import datetime
 
-from rich.console import Console
 from rich.layout import Layout
-from rich.live import Live
 from rich.panel import Panel
 from rich.text import Text
 
+from .log_filter import LogFilter
+from .log_ingest import LogIngestQueue
+from .log_session import (
+    DEFAULT_SESSION_DIR,
+    OVERFLOW_POLICIES,
+    SessionWriter,
+    list_sessions,
+    load_session,
+    resolve_session,
+)
+from .log_store import DEFAULT_CAPACITY, LEVEL_IDS, LEVELS, LogStore
+from .log_structured import JsonLinesParser, LogAggregates, LogEvent
+from .log_tail import FileTailer, create_waiter
+from .log_viewer import LineIndex, LogFileView, key_reader
+from .render_backend import get_backend
+
+# 各级别的 (前缀, 样式)，按log_store.LEVELS的顺序排列
+LEVEL_STYLES = (
+    ("·", "white"),
+    ("ℹ", "green"),
+    ("✓", "bold green"),
+    ("⚠", "yellow"),
+    ("✗", "red"),
+    ("·", "white"),
+)
+
 
 class StatusBar:
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, scrollback=DEFAULT_CAPACITY, session=None):
+        """初始化日志监控
+
+        Args:
+            scrollback: 最多保留的日志条数
+            session: 会话持久化（log_session.SessionWriter），所有日志在后台写入gzip会话文件
+        """
+        self.console = get_backend().create_console()
         self.layout = Layout()
 
-        # 分割布局：日志区 + 状态栏
+        # 分割布局：日志区 + 过滤栏 + 状态栏
         self.layout.split(
             Layout(name="logs", ratio=5),  # 日志区域
+            Layout(name="filter", size=1, visible=False),  # 过滤栏，设置过滤条件后显示
             Layout(name="status", size=3)  # 状态栏
         )
 
-        # 初始化日志
-        self.log_content = Text()
+        # 初始化日志，最多保留scrollback条
+        self.logs = LogStore(scrollback, LEVEL_STYLES, time_format="%H:%M:%S", millis=True, time_template="[{}] ")
+        # 日志先进入写入队列，每次渲染前批量写入，过载时采样或丢弃
+        self.ingest = LogIngestQueue(self.logs, sink=session)
+        # JSON日志解析和滚动统计，状态栏的错误和警告计数来自统计结果
+        self.parser = JsonLinesParser()
+        self.aggregates = LogAggregates()
+        self.filter = LogFilter(self.logs)
+        self.layout["filter"].update(self.filter)
+        self.log_view = self.logs.view(ingest=self.ingest, log_filter=self.filter)
         self.layout["logs"].update(
             Panel(
-                self.log_content,
+                self.log_view,
                 title="[bold]系统日志[/bold]",
                 border_style="green",
                 padding=(1, 1)
@@ -38,8 +84,14 @@ class StatusBar:
                            status="准备中",
                            progress=0,
                            errors=0,
-                           warnings=0):
-        """创建状态栏内容"""
+                           warnings=0,
+                           lines=None,
+                           dropped=0,
+                           position=None,
+                           error_sources=None,
+                           failed_sources=None):
+        """创建状态栏内容，指定lines时（跟踪或查看文件）显示行数而不是进度，指定position时显示可见的行号范围，
+        failed_sources为读取失败、已停止跟踪的来源名称"""
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # 创建进度条
@@ -53,27 +105,49 @@ class StatusBar:
         # 动态状态样式
         if status == "准备中":
             status_text.append(f"{status}", style="cyan")
-        elif status == "运行中":
+        elif status in ("运行中", "跟踪中", "浏览"):
             status_text.append(f"{status}", style="green")
+        elif status == "索引中":
+            status_text.append(f"{status} {progress}%", style="cyan")
         elif status == "警告":
             status_text.append(f"{status}", style="yellow")
-        elif status == "错误":
+        elif status in ("错误", "会话写入失败"):
             status_text.append(f"{status}", style="red")
         else:
             status_text.append(f"{status}", style="white")
 
         status_text.append(" | ", style="dim")
-        status_text.append("进度: ", style="bold")
-        status_text.append(f"{progress_bar} {progress:3d}%", style="cyan")
-        status_text.append(" | ", style="dim")
-        status_text.append("任务: ", style="bold")
-        status_text.append(f"{progress}", style="magenta")
+        if lines is None:
+            status_text.append("进度: ", style="bold")
+            status_text.append(f"{progress_bar} {progress:3d}%", style="cyan")
+            status_text.append(" | ", style="dim")
+            status_text.append("任务: ", style="bold")
+            status_text.append(f"{progress}", style="magenta")
+        else:
+            status_text.append("行数: ", style="bold")
+            status_text.append(f"{lines}", style="magenta")
+        if position is not None:
+            status_text.append(" | ", style="dim")
+            status_text.append("位置: ", style="bold")
+            status_text.append(position, style="cyan")
         status_text.append(" | ", style="dim")
         status_text.append("错误: ", style="bold red")
         status_text.append(f"{errors}", style="red")
         status_text.append(" | ", style="dim")
         status_text.append("警告: ", style="bold yellow")
         status_text.append(f"{warnings}", style="yellow")
+        if error_sources:
+            status_text.append(" | ", style="dim")
+            status_text.append("来源: ", style="bold red")
+            status_text.append(" ".join(f"{logger or '-'}×{count}" for logger, count in error_sources), style="red")
+        if failed_sources:
+            status_text.append(" | ", style="dim")
+            status_text.append("失败来源: ", style="bold red")
+            status_text.append(" ".join(failed_sources), style="red")
+        if dropped:
+            status_text.append(" | ", style="dim")
+            status_text.append("丢弃: ", style="bold magenta")
+            status_text.append(f"{dropped}", style="magenta")
         status_text.append(" | ", style="dim")
         status_text.append(now, style="blue")
 
@@ -88,93 +162,127 @@ class StatusBar:
         """更新状态栏"""
         self.layout["status"].update(self._create_status_bar(**kwargs))
 
-    def add_log(self, message, level="INFO"):
-        """添加日志消息"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-
-        # 根据日志级别设置样式
-        if level == "INFO":
-            style = "green"
-            prefix = "ℹ"
-        elif level == "WARNING":
-            style = "yellow"
-            prefix = "⚠"
-        elif level == "ERROR":
-            style = "red"
-            prefix = "✗"
-        elif level == "SUCCESS":
-            style = "bold green"
-            prefix = "✓"
-        else:
-            style = "white"
-            prefix = "·"
-
-        # 添加新日志（显示最新的在最下面）
-        log_line = Text()
-        log_line.append(f"[{timestamp}] ", style="dim cyan")
-        log_line.append(f"{prefix} ", style=style)
-        log_line.append(f"{message}\n", style=style)
-
-        self.log_content.append(log_line)
+    def set_filter(self, levels=None, pattern=None):
+        """设置日志过滤条件，有过滤条件时显示过滤栏
+
+        Args:
+            levels: 只显示这些级别的日志，None表示全部级别
+            pattern: 只显示匹配该正则表达式的日志（忽略大小写），None表示不过滤
+
+        Raises:
+            ValueError: 未知的日志级别
+            re.error: 正则表达式无效
+        """
+        self.filter.set_levels(levels)
+        self.filter.set_pattern(pattern)
+        self.layout["filter"].visible = self.filter.active
+
+    def read_key(self, read_key, timeout=0.0):
+        """读取一个按键，修改过滤条件的按键（l、/、c）在这里处理
+
+        从插件菜单运行时没有命令行参数，过滤条件只能在界面中修改。
+
+        Args:
+            read_key: key_reader产出的函数
+            timeout: 等待按键的秒数
+
+        Returns:
+            str | None: 没有被过滤栏处理的按键，没有按键时为None
+        """
+        log_filter = self.filter
+        key = read_key(timeout, raw=log_filter.editing is not None)
+        if key is None or not log_filter.handle_key(key):
+            return key
+        self.layout["filter"].visible = log_filter.visible
+        return None
+
+    def add_event(self, event):
+        """添加一条结构化日志（LogEvent），计入滚动统计后进入写入队列，可以从任意线程调用"""
+        self.aggregates.add(event)
+        message = f"{event.logger}: {event.message}" if event.logger else event.message
+        self.ingest.put(message, event.level, event.timestamp_ms)
+
+    def add_json(self, line):
+        """添加一行JSON日志，不是JSON的行按文本日志识别级别"""
+        self.add_event(self.parser.parse_line(line))
 
-        # 限制日志行数，防止内存过大
-        lines = str(self.log_content).split('\n')
-        if len(lines) > 30:  # 保留最近30行
-            self.log_content = Text("\n".join(lines[-30:]) + "\n")
-
-        # 更新日志面板
-        self.layout["logs"].update(
-            Panel(
-                self.log_content,
-                title="[bold]系统日志[/bold]",
-                border_style="green",
-                padding=(1, 1)
-            )
+    def add_log(self, message, level="INFO"):
+        """添加日志消息，可以从任意线程调用，日志面板渲染时才批量写入并绘制可见的行"""
+        self.add_event(LogEvent(time.time_ns() // 1_000_000, level, "", message))
+
+    def update_counters(self, status, **kwargs):
+        """用滚动统计中的错误和警告条数更新状态栏，其余参数同_create_status_bar
+
+        会话文件写入失败时状态显示为"会话写入失败"。
+        """
+        aggregates = self.aggregates
+        session = self.ingest.sink
+        if session is not None and session.error is not None:
+            status = "会话写入失败"
+        self.update_status_bar(
+            status=status,
+            errors=aggregates.total("ERROR"),
+            warnings=aggregates.total("WARNING"),
+            error_sources=aggregates.top_error_loggers(),
+            **kwargs
         )
 
+    def tick(self, status, lines, **kwargs):
+        """把排队的日志写入日志存储，并用滚动统计更新状态栏，其余参数同_create_status_bar"""
+        ingest = self.ingest
+        ingest.drain()
+        if status == "跟踪中" and self.aggregates.last_minute("ERROR"):
+            status = "错误"
+        self.update_counters(status, lines=lines, dropped=ingest.dropped, **kwargs)
+
     def run(self):
-        """运行状态栏示例"""
+        """运行状态栏示例
+
+        l切换级别过滤，/输入正则过滤，c清除过滤条件，q退出。
+        """
         # 模拟任务处理
         tasks = [
-            ("初始化系统...", "INFO"),
-            ("加载配置文件 config.yaml", "INFO"),
-            ("连接数据库...", "INFO"),
-            ("数据库连接成功", "SUCCESS"),
-            ("开始处理用户数据", "INFO"),
-            ("处理第1批数据 (100条记录)", "INFO"),
-            ("检测到异常数据格式", "WARNING"),
-            ("数据验证通过", "SUCCESS"),
-            ("处理第2批数据 (200条记录)", "INFO"),
-            ("内存使用率超过80%", "WARNING"),
-            ("清理临时文件...", "INFO"),
-            ("生成统计报告", "INFO"),
-            ("写入输出文件 output.csv", "INFO"),
-            ("文件保存成功", "SUCCESS"),
-            ("发送邮件通知...", "INFO"),
-            ("邮件发送失败，重试中...", "ERROR"),
-            ("邮件发送成功", "SUCCESS"),
-            ("任务执行完成", "INFO"),
+            ("初始化系统...", "INFO", "app"),
+            ("加载配置文件 config.yaml", "INFO", "config"),
+            ("连接数据库...", "INFO", "db"),
+            ("数据库连接成功", "SUCCESS", "db"),
+            ("开始处理用户数据", "INFO", "worker"),
+            ("处理第1批数据 (100条记录)", "INFO", "worker"),
+            ("检测到异常数据格式", "WARNING", "validator"),
+            ("数据验证通过", "SUCCESS", "validator"),
+            ("处理第2批数据 (200条记录)", "INFO", "worker"),
+            ("内存使用率超过80%", "WARNING", "monitor"),
+            ("清理临时文件...", "INFO", "worker"),
+            ("生成统计报告", "INFO", "report"),
+            ("写入输出文件 output.csv", "INFO", "report"),
+            ("文件保存成功", "SUCCESS", "report"),
+            ("发送邮件通知...", "INFO", "mailer"),
+            ("邮件发送失败，重试中...", "ERROR", "mailer"),
+            ("邮件发送成功", "SUCCESS", "mailer"),
+            ("任务执行完成", "INFO", "app"),
         ]
 
         # 实时更新状态栏和日志
-        with Live(self.layout, refresh_per_second=10, screen=True):
-            errors = 0
-            warnings = 0
+        backend = get_backend()
+        with backend.live(self.layout, refresh_per_second=10, screen=True), key_reader() as read_key:
+            self.add_log("按l切换级别过滤，/输入正则过滤，c清除过滤条件，q退出", "INFO")
             task_index = 0
 
             for progress in range(1, 101):
-                time.sleep(0.15)  # 稍微慢一点，方便观察
+                backend.sleep(0.15)  # 稍微慢一点，方便观察
+                if self.read_key(read_key) == "quit":
+                    return
 
                 # 根据进度触发日志
                 if task_index < len(tasks) and progress >= (task_index + 1) * (100 // len(tasks)):
-                    message, level = tasks[task_index]
-                    self.add_log(message, level)
-
-                    # 更新错误/警告计数
-                    if level == "ERROR":
-                        errors += 1
-                    elif level == "WARNING":
-                        warnings += 1
+                    # 模拟服务输出的JSON日志，错误和警告计数由结构化解析后的统计得出
+                    message, level, logger = tasks[task_index]
+                    self.add_json(json.dumps({
+                        "timestamp": datetime.now().astimezone().isoformat(),
+                        "level": level,
+                        "logger": logger,
+                        "message": message,
+                    }, ensure_ascii=False))
 
                     task_index += 1
 
@@ -199,24 +307,327 @@ class StatusBar:
                     self.add_log(random.choice(extra_messages), "INFO")
 
                 # 更新状态栏
-                self.update_status_bar(
-                    status=status,
-                    progress=progress,
-                    errors=errors,
-                    warnings=warnings
-                )
+                self.update_counters(status, progress=progress)
 
             # 最后一条完成日志
             self.add_log("所有任务执行完成！", "SUCCESS")
-            time.sleep(2)
-
+            backend.sleep(2)
+
+    def follow(self, path, from_end=True, duration=None):
+        """跟踪一个真实的日志文件（tail -f），JSON日志按字段解析，错误和警告计数来自日志内容
+
+        多个来源由multiplex()按时间戳合并。l切换级别过滤，/输入正则过滤，c清除过滤条件，q退出。
+
+        Args:
+            path: 日志文件路径
+            from_end: 是否从文件末尾开始跟踪
+            duration: 跟踪的秒数，None表示一直跟踪到Ctrl+C
+        """
+        tailer = FileTailer(path, from_end=from_end)
+        waiter = create_waiter([path])
+        backend = get_backend()
+        deadline = None if duration is None else time.monotonic() + duration
+        total = 0
+
+        try:
+            with backend.live(self.layout, refresh_per_second=10, screen=True), key_reader() as read_key:
+                self.add_log(f"开始跟踪: {path}", "INFO")
+                self.tick("跟踪中", total)
+                while deadline is None or time.monotonic() < deadline:
+                    if self.read_key(read_key) == "quit":
+                        break
+                    lines = tailer.read_lines()
+                    for line in lines:
+                        self.add_event(self.parser.parse_line(line))
+
+                    if lines:
+                        total += len(lines)
+                        self.tick("跟踪中", total)
+                        waiter.reset()
+                        # 离屏后端在这里渲染一帧，真实终端由Live定时刷新
+                        backend.sleep(0)
+                    else:
+                        waiter.wait()
+        finally:
+            tailer.close()
+            waiter.close()
+
+    def view_file(self, path, duration=None):
+        """查看大日志文件：mmap映射后在后台建立行索引，只渲染可见的行
+
+        方向键、PgUp/PgDn、Home/End（或j/k、空格、g/G）滚动和跳转，q退出。
+
+        Args:
+            path: 日志文件路径
+            duration: 查看的秒数，None表示一直查看到按q或Ctrl+C
+        """
+        index = LineIndex(path)
+        view = LogFileView(index)
+        self.layout["logs"].update(
+            Panel(
+                view,
+                title=f"[bold]{os.path.basename(path)}[/bold]",
+                border_style="green",
+                padding=(0, 1)
+            )
+        )
+        backend = get_backend()
+        deadline = None if duration is None else time.monotonic() + duration
+
+        try:
+            with backend.live(self.layout, refresh_per_second=10, screen=True), key_reader() as read_key:
+                while deadline is None or time.monotonic() < deadline:
+                    lines = index.lines
+                    bottom = min(view.top + view.height, lines)
+                    self.update_status_bar(
+                        status="浏览" if index.done else "索引中",
+                        progress=int(index.progress * 100),
+                        lines=lines,
+                        position=f"{min(view.top + 1, bottom)}-{bottom}"
+                    )
+                    key = read_key(0.1)
+                    if key is not None and not view.handle_key(key):
+                        break
+                    # 离屏后端在这里渲染一帧，真实终端由Live定时刷新
+                    backend.sleep(0)
+        finally:
+            index.close()
+
+    def multiplex(self, specs, from_end=True, duration=None, window_ms=500):
+        """同时跟踪多个日志来源，按时间戳合并为一个有序的流，每个来源用不同的颜色标记
+
+        所有来源在一个asyncio事件循环中读取，不为每个来源创建线程，可以同时跟踪上百个来源。
+        单个来源读取失败时只停止该来源，状态栏列出失败的来源。l切换级别过滤，/输入正则过滤，c清除过滤条件，q退出。
+
+        Args:
+            specs: 来源列表：文件或命名管道路径、"-"表示标准输入、"cmd:命令"表示命令的输出
+            from_end: 文件是否从末尾开始跟踪
+            duration: 跟踪的秒数，None表示一直跟踪到Ctrl+C或所有来源结束
+            window_ms: 重排窗口的毫秒数，时间戳乱序不超过该窗口的日志能按顺序显示
+        """
+        asyncio.run(self._multiplex(specs, from_end, duration, window_ms))
+
+    def _emit_source_event(self, source, event):
+        """合并器按时间顺序输出的日志，带上来源编号进入写入队列"""
+        self.aggregates.add(event)
+        message = f"{event.logger}: {event.message}" if event.logger else event.message
+        self.ingest.put(message, event.level, event.timestamp_ms, source.index)
+
+    async def _multiplex(self, specs, from_end, duration, window_ms):
+        from .log_multiplex import LogMultiplexer
+
+        multiplexer = LogMultiplexer(specs, self._emit_source_event, window_ms=window_ms, from_end=from_end)
+        self.logs.sources = [(source.label, source.style) for source in multiplexer.sources]
+        backend = get_backend()
+        loop = asyncio.get_running_loop()
+        deadline = None if duration is None else loop.time() + duration
+        reading = asyncio.create_task(multiplexer.run())
+
+        try:
+            with backend.live(self.layout, refresh_per_second=10, screen=True), key_reader() as read_key:
+                self.add_log(f"开始合并 {len(specs)} 个日志来源", "INFO")
+                while deadline is None or loop.time() < deadline:
+                    await asyncio.sleep(0.1)
+                    # 超时为0，不阻塞事件循环
+                    if self.read_key(read_key) == "quit":
+                        break
+                    # 所有来源都结束后输出堆中剩余的日志
+                    multiplexer.flush(force=reading.done())
+                    self.tick("跟踪中", multiplexer.emitted,
+                              failed_sources=[source.label for source in multiplexer.failed])
+                    # 离屏后端在这里渲染一帧，真实终端由Live定时刷新
+                    backend.sleep(0)
+                    if reading.done():
+                        break
+        finally:
+            reading.cancel()
+            try:
+                await reading
+            except asyncio.CancelledError:
+                pass
+
+    def open_session(self, session, directory=DEFAULT_SESSION_DIR, duration=None):
+        """重新打开保存的日志会话，分块解压后批量写入日志存储，可以滚动浏览和过滤
+
+        方向键、PgUp/PgDn、Home/End（或j/k、空格、g/G）滚动，l切换级别过滤，/输入正则过滤，
+        c清除过滤条件，q退出。
+
+        Args:
+            session: 会话ID、"latest"或会话分卷文件路径
+            directory: 会话目录
+            duration: 浏览的秒数，None表示一直浏览到按q或Ctrl+C
+
+        Raises:
+            FileNotFoundError: 会话不存在
+        """
+        paths = resolve_session(session, directory)
+        start = time.perf_counter()
+        result = load_session(paths, self.logs)
+        elapsed = time.perf_counter() - start
+        self.add_log(f"已载入会话 {os.path.basename(paths[0])} 等{len(paths)}个分卷，"
+                     f"{result['records']} 条日志，耗时 {elapsed:.2f} 秒", "INFO")
+        if result["truncated"]:
+            self.add_log(f"会话不完整：{', '.join(os.path.basename(path) for path in result['truncated'])} "
+                         f"没有正常结束，只载入了其中完整的日志", "WARNING")
+        view = self.log_view
+        errors = self.logs.count([LEVEL_IDS["ERROR"]])
+        warnings = self.logs.count([LEVEL_IDS["WARNING"]])
+        backend = get_backend()
+        deadline = None if duration is None else time.monotonic() + duration
+
+        with backend.live(self.layout, refresh_per_second=10, screen=True), key_reader() as read_key:
+            while deadline is None or time.monotonic() < deadline:
+                self.update_status_bar(status="回放", errors=errors, warnings=warnings,
+                                       lines=result["records"], dropped=result["dropped"])
+                key = self.read_key(read_key, 0.1)
+                if key == "quit":
+                    break
+                # LogView的偏移量表示距离最新日志的行数，向上翻页为正数
+                if key == "pgup":
+                    view.scroll(view.height)
+                elif key == "pgdn":
+                    view.scroll(-view.height)
+                elif key == "up":
+                    view.scroll(1)
+                elif key == "down":
+                    view.scroll(-1)
+                elif key == "home":
+                    view.scroll(len(self.logs))
+                elif key == "end":
+                    view.offset = 0
+                backend.sleep(0)
+        return result
+
+    def stress(self, rate, duration=5.0, producers=4):
+        """压力测试：多个生产者线程以指定总速率写入日志，界面每0.1秒批量处理一次
+
+        l切换级别过滤，/输入正则过滤，c清除过滤条件，q提前结束。
+
+        Args:
+            rate: 每秒写入的总行数
+            duration: 持续秒数
+            producers: 生产者线程数
+
+        Returns:
+            dict: 实际写入速率和丢弃的行数
+        """
+        backend = get_backend()
+        stop = threading.Event()
+        produced = [0] * producers
+        levels = ["INFO"] * 17 + ["DEBUG", "WARNING", "ERROR"]
+
+        def produce(index):
+            # 每10毫秒写入一批，按总速率平均分配给各个线程
+            per_burst = max(1, round(rate / producers / 100))
+            next_burst = time.monotonic()
+            count = 0
+            add_log = self.add_log
+            while not stop.is_set():
+                for _ in range(per_burst):
+                    add_log(f"worker-{index} 处理记录 #{count}", levels[count % len(levels)])
+                    count += 1
+                next_burst += 0.01
+                delay = next_burst - time.monotonic()
+                if delay > 0:
+                    stop.wait(delay)
+            produced[index] = count
+
+        threads = [threading.Thread(target=produce, args=(index,), daemon=True) for index in range(producers)]
+        start = time.monotonic()
+        with backend.live(self.layout, refresh_per_second=10, screen=True), key_reader() as read_key:
+            for thread in threads:
+                thread.start()
+            try:
+                while time.monotonic() - start < duration:
+                    backend.sleep(0.1)
+                    if self.read_key(read_key) == "quit":
+                        break
+                    self.tick("运行中", self.logs.total)
+            finally:
+                # Ctrl+C时也要停止生产者线程
+                stop.set()
+                for thread in threads:
+                    thread.join()
+            self.tick("完成", self.logs.total)
+        elapsed = time.monotonic() - start
+        return {"produced": sum(produced), "rate": sum(produced) / elapsed, "dropped": self.ingest.dropped}
+
+
+def main(argv=None):
+    """主函数入口
+
+    Args:
+        argv: 命令行参数，None时（从插件菜单运行）播放内置的演示任务
+    """
+    parser = argparse.ArgumentParser(description="实时日志监控")
+    parser.add_argument("-f", "--follow", nargs="+", metavar="PATH",
+                        help="跟踪真实的日志文件（tail -f）；多个来源、命名管道、-（标准输入）或cmd:命令按时间戳合并显示")
+    parser.add_argument("--reorder-window", type=int, default=500, metavar="MS",
+                        help="合并多个来源时的重排窗口（毫秒）")
+    parser.add_argument("--from-start", action="store_true", help="先显示文件中已有的内容")
+    parser.add_argument("--view", metavar="PATH", help="查看大日志文件，支持多GB的文件，PgUp/PgDn/Home/End跳转")
+    parser.add_argument("--duration", type=float, help="跟踪或查看的秒数，默认一直运行到Ctrl+C")
+    parser.add_argument("--scrollback", type=int, default=DEFAULT_CAPACITY, help="最多保留的日志条数")
+    parser.add_argument("--stress", type=int, metavar="RATE", help="以每秒RATE行的速率写入模拟日志，测试高频写入")
+    parser.add_argument("--level", nargs="+", choices=LEVELS, help="只显示这些级别的日志")
+    parser.add_argument("--grep", metavar="PATTERN", help="只显示匹配该正则表达式的日志（忽略大小写）")
+    parser.add_argument("--record", action="store_true", help="把所有日志写入gzip压缩的会话文件")
+    parser.add_argument("--overflow", choices=OVERFLOW_POLICIES, default="drop_oldest",
+                        help="会话写入跟不上时的处理策略")
+    parser.add_argument("--session-dir", default=DEFAULT_SESSION_DIR, help="会话文件目录")
+    parser.add_argument("--sessions", action="store_true", help="列出保存的会话")
+    parser.add_argument("--open", metavar="SESSION", help="重新打开保存的会话，SESSION为会话ID、latest或文件路径")
+    args = parser.parse_args([] if argv is None else argv)
+
+    if args.sessions:
+        for item in list_sessions(args.session_dir):
+            print(f"{item['id']:<28}{len(item['paths']):>4} 个分卷{item['size'] / 1024:>12.1f} KB")
+        return
 
-def main():
-    """主函数入口"""
     print("[bold cyan]开始运行实时日志监控系统...[/bold cyan]\n")
-    status_bar = StatusBar()
-    status_bar.run()
+    session = SessionWriter(args.session_dir, overflow=args.overflow) if args.record and not args.open else None
+    status_bar = StatusBar(args.scrollback, session=session)
+    # 会话写入线程是守护线程，Ctrl+C或出错时也要写完排队的日志并关闭会话，否则会话文件被截断
+    try:
+        try:
+            status_bar.set_filter(args.level, args.grep)
+        except re.error as e:
+            parser.error(f"无效的正则表达式: {e}")
+        if args.stress:
+            result = status_bar.stress(args.stress, duration=args.duration or 5.0)
+            print(f"写入 {result['produced']} 行，{result['rate']:.0f} 行/秒，丢弃 {result['dropped']} 行")
+        elif args.view:
+            try:
+                status_bar.view_file(args.view, duration=args.duration)
+            except OSError as e:
+                print(f"[red]无法打开文件: {e}[/red]")
+        elif args.follow and (len(args.follow) > 1 or any(not os.path.isfile(spec) for spec in args.follow)):
+            status_bar.multiplex(args.follow, from_end=not args.from_start, duration=args.duration,
+                                 window_ms=args.reorder_window)
+        elif args.follow:
+            status_bar.follow(args.follow[0], from_end=not args.from_start, duration=args.duration)
+        elif args.open:
+            try:
+                status_bar.open_session(args.open, args.session_dir, duration=args.duration)
+            except OSError as e:
+                print(f"[red]无法打开会话: {e}[/red]")
+        else:
+            status_bar.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        status_bar.filter.close()
+        if session is not None:
+            # 还在写入队列中、没有被界面取出的日志也写入会话
+            status_bar.ingest.drain()
+            try:
+                session.close()
+            except OSError as e:
+                print(f"[red]会话写入失败: {e}，已写入 {session.written} 条日志，丢弃 {session.dropped} 条[/red]")
+            else:
+                print(f"会话已保存: {session.paths[0] if session.paths else session.session_id}，"
+                      f"{session.written} 条日志，丢弃 {session.dropped} 条")
     print("\n[bold green]程序执行完毕！[/bold green]")
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
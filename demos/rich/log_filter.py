@@ -0,0 +1,266 @@
+"""
+日志过滤
+
+按级别过滤直接使用LogStore维护的级别索引，切换级别不需要扫描历史记录，百万行的滚动历史也是即时的。
+按正则过滤时，后台线程从最新的记录开始向旧的方向分块搜索，每搜完一块就把匹配的序号写入与级别索引
+结构相同的结果索引，界面随后的刷新即可显示；历史搜完后继续检查新写入的日志。
+"""
+import re
+import threading
+from collections import deque
+from itertools import islice
+
+from rich.text import Text
+
+from .log_store import LEVEL_IDS, LEVELS
+
+# 每次搜索的记录条数，搜完一块后发布结果并检查新写入的日志
+SEARCH_CHUNK = 5000
+# 历史搜完后检查新日志的间隔（秒）
+SEARCH_POLL_INTERVAL = 0.05
+# 界面中按l依次切换的级别过滤条件
+LEVEL_PRESETS = (None, ("WARNING", "ERROR"), ("ERROR",))
+
+
+class LogSearch:
+    """在后台线程中用正则搜索日志存储"""
+
+    def __init__(self, store, pattern: re.Pattern, chunk_size: int = SEARCH_CHUNK):
+        """创建并启动搜索
+
+        Args:
+            store: 要搜索的LogStore
+            pattern: 已编译的正则表达式，匹配消息内容
+            chunk_size: 每次搜索的记录条数
+        """
+        self.store = store
+        self.pattern = pattern
+        self.chunk_size = chunk_size
+        # 匹配记录的序号，结构与LogStore.level_index相同
+        self.matches = tuple(deque() for _ in LEVELS)
+        # 读取matches时需要持有该锁
+        self.lock = threading.Lock()
+        # 启动时历史记录的条数，取得快照前为None
+        self.history = None
+        self.scanned = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-search", daemon=True)
+        self._thread.start()
+
+    @property
+    def progress(self) -> float:
+        """历史记录的搜索进度，0到1"""
+        if self.history is None:
+            return 0.0
+        return self.scanned / self.history if self.history else 1.0
+
+    @property
+    def done(self) -> bool:
+        """历史记录是否已经搜索完毕"""
+        return self.history is not None and self.scanned >= self.history
+
+    def stop(self) -> None:
+        """停止搜索线程"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        store = self.store
+        with store.lock:
+            snapshot = list(store.records)
+            base = store.first_seq
+        self.history = len(snapshot)
+        tail = base + len(snapshot)
+
+        search = self.pattern.search
+        end = len(snapshot)
+        while end > 0 and not self._stop.is_set():
+            start = max(0, end - self.chunk_size)
+            found = [[] for _ in LEVELS]
+            for position in range(end - 1, start - 1, -1):
+                record = snapshot[position]
+                if search(record[2]):
+                    found[record[1]].append(base + position)
+            # found中的序号从大到小，extendleft后结果索引仍然从小到大
+            with self.lock:
+                for seqs, new in zip(self.matches, found):
+                    seqs.extendleft(new)
+                self.scanned += end - start
+            end = start
+            tail = self._scan_new(tail)
+        del snapshot
+
+        while not self._stop.wait(SEARCH_POLL_INTERVAL):
+            tail = self._scan_new(tail)
+
+    def _scan_new(self, tail: int) -> int:
+        """搜索序号不小于tail的新日志，返回下一次开始的序号"""
+        store = self.store
+        with store.lock:
+            total = store.total
+            start = max(tail, store.first_seq)
+            # 新日志在deque的右端，从右侧取出，避免从左侧跳过全部历史
+            new = list(islice(reversed(store.records), total - start))
+        if not new:
+            return total
+        new.reverse()
+        search = self.pattern.search
+        found = [[] for _ in LEVELS]
+        for seq, record in enumerate(new, start):
+            if search(record[2]):
+                found[record[1]].append(seq)
+        with self.lock:
+            for seqs, new_seqs in zip(self.matches, found):
+                seqs.extend(new_seqs)
+        return total
+
+
+class LogFilter:
+    """日志存储的级别和正则过滤条件"""
+
+    def __init__(self, store):
+        self.store = store
+        self.levels = None
+        self.pattern = None
+        self.search = None
+        # 界面中正在输入的正则表达式，不在输入时为None
+        self.editing = None
+        self.error = None
+
+    @property
+    def active(self) -> bool:
+        """是否设置了任何过滤条件"""
+        return self.levels is not None or self.search is not None
+
+    @property
+    def visible(self) -> bool:
+        """过滤栏是否需要显示：设置了过滤条件或正在输入正则"""
+        return self.active or self.editing is not None
+
+    def handle_key(self, key: str) -> bool:
+        """在界面中修改过滤条件
+
+        l依次切换级别过滤（全部、WARNING及ERROR、只有ERROR），/开始输入正则，c清除所有过滤条件；
+        输入正则时按键是原始文本（key_reader的raw模式），回车确认，Esc取消，退格删除。
+
+        Args:
+            key: key_reader返回的按键
+
+        Returns:
+            bool: 按键是否已被处理
+        """
+        if self.editing is not None:
+            if key in ("\n", "\r"):
+                try:
+                    self.set_pattern(self.editing)
+                except re.error as e:
+                    # 保留输入的内容，修改后重新确认
+                    self.error = str(e)
+                else:
+                    self.editing = None
+                    self.error = None
+            elif key == "\x1b":
+                self.editing = None
+                self.error = None
+            elif key in ("\x7f", "\b"):
+                self.editing = self.editing[:-1]
+            elif not key.startswith("\x1b"):
+                # 粘贴时一次读到多个字符，忽略其中的控制字符；方向键等转义序列整体忽略
+                self.editing += "".join(char for char in key if char.isprintable())
+            return True
+        if key == "l":
+            # self.levels是排好序的级别编号，与预设逐个比较，不在预设中时从第一个预设开始
+            presets = [None if preset is None else sorted(LEVEL_IDS[level] for level in preset)
+                       for preset in LEVEL_PRESETS]
+            position = presets.index(self.levels) + 1 if self.levels in presets else 0
+            self.set_levels(LEVEL_PRESETS[position % len(presets)])
+        elif key == "/":
+            self.editing = self.pattern or ""
+        elif key == "c":
+            self.set_levels(None)
+            self.set_pattern(None)
+        else:
+            return False
+        return True
+
+    def set_levels(self, levels=None) -> None:
+        """只显示指定级别的日志
+
+        Args:
+            levels: 级别名称的集合，例如 {"WARNING", "ERROR"}，None或空集合表示全部级别
+
+        Raises:
+            ValueError: 包含未知的级别名称
+        """
+        if not levels:
+            self.levels = None
+            return
+        unknown = [level for level in levels if level not in LEVEL_IDS]
+        if unknown:
+            raise ValueError(f"未知的日志级别: {', '.join(unknown)}")
+        self.levels = sorted(LEVEL_IDS[level] for level in levels)
+
+    def set_pattern(self, pattern: str | None, ignore_case: bool = True) -> None:
+        """只显示消息匹配正则表达式的日志，在后台线程中搜索已有的历史
+
+        Args:
+            pattern: 正则表达式，None或空字符串表示取消正则过滤
+            ignore_case: 是否忽略大小写
+
+        Raises:
+            re.error: 正则表达式无效，原有的过滤条件保持不变
+        """
+        compiled = re.compile(pattern, re.IGNORECASE if ignore_case else 0) if pattern else None
+        if self.search is not None:
+            self.search.stop()
+        self.pattern = pattern or None
+        self.search = LogSearch(self.store, compiled) if compiled is not None else None
+
+    def close(self) -> None:
+        """停止后台搜索"""
+        if self.search is not None:
+            self.search.stop()
+
+    def count(self) -> int:
+        """匹配的日志条数，正则搜索进行中时为已找到的条数"""
+        search = self.search
+        if search is None:
+            return self.store.count(self.levels)
+        with search.lock:
+            self.store.trim_index(search.matches)
+            return self.store.count(self.levels, search.matches)
+
+    def render(self, height: int, offset: int = 0) -> Text:
+        """渲染匹配的日志中的可见窗口"""
+        search = self.search
+        if search is None:
+            return self.store.render(height, offset, self.levels)
+        with search.lock:
+            self.store.trim_index(search.matches)
+            return self.store.render(height, offset, self.levels, search.matches)
+
+    def __rich__(self) -> Text:
+        """过滤栏：当前的过滤条件、匹配条数和搜索进度"""
+        text = Text(no_wrap=True, overflow="ellipsis")
+        if self.editing is not None:
+            text.append("正则: ", style="bold")
+            text.append(f"/{self.editing}▏", style="magenta")
+            if self.error is not None:
+                text.append(f" {self.error}", style="red")
+            else:
+                text.append(" 回车确认，Esc取消", style="dim")
+            return text
+        text.append("过滤 ", style="bold")
+        text.append("级别: ", style="bold")
+        names = "全部" if self.levels is None else ",".join(LEVELS[level] for level in self.levels)
+        text.append(names, style="cyan")
+        if self.pattern is not None:
+            text.append(" | ", style="dim")
+            text.append("正则: ", style="bold")
+            text.append(f"/{self.pattern}/", style="magenta")
+        text.append(" | ", style="dim")
+        text.append("匹配: ", style="bold")
+        text.append(f"{self.count()}/{len(self.store)}", style="green")
+        if self.search is not None and not self.search.done:
+            text.append(" | ", style="dim")
+            text.append(f"搜索中 {self.search.progress:.0%}", style="yellow")
+        return text
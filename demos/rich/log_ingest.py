@@ -0,0 +1,135 @@
+"""
+高频日志写入队列
+
+生产者线程只向deque追加一条元组（CPython中deque.append是原子操作，不需要加锁），
+界面每次刷新时一次性取出排队的日志并批量写入LogStore，日志再多每秒也只处理约10批。
+
+过载时分两级处理，丢弃的行数在状态栏中显示：
+- 一批超过tick_budget条时按间隔采样，警告和错误始终保留
+- 队列积压超过max_pending条时直接丢弃新的日志，put()返回False，生产者可以据此减速
+
+设置sink（例如log_session.SessionWriter）时，每批日志在采样之前整体提交给sink持久化。
+"""
+import math
+import threading
+import time
+from collections import deque
+
+from .log_store import LEVEL_IDS, LEVELS, LOG
+
+DEFAULT_MAX_PENDING = 100_000
+DEFAULT_TICK_BUDGET = 20_000
+
+# 采样时始终保留的级别编号（警告、错误）；LOG的编号虽然更大，但它是没有级别的普通行，照常采样
+_KEEP_LEVELS = frozenset({LEVEL_IDS["WARNING"], LEVEL_IDS["ERROR"]})
+
+
+class LogIngestQueue:
+    """日志写入队列"""
+
+    def __init__(self, store, max_pending: int = DEFAULT_MAX_PENDING, tick_budget: int = DEFAULT_TICK_BUDGET,
+                 sink=None):
+        """初始化写入队列
+
+        Args:
+            store: 目标LogStore
+            max_pending: 最多积压的日志条数，超出时丢弃新的日志
+            tick_budget: 每批最多写入的日志条数，超出时采样
+            sink: 持久化目标，提供submit(batch, sources)方法，不能阻塞
+        """
+        self.store = store
+        self.sink = sink
+        self.max_pending = max_pending
+        self.tick_budget = tick_budget
+        # 已写入（含被采样掉的）日志按级别编号统计的条数
+        self.level_counts = [0] * len(LEVELS)
+        self.sampled_out = 0
+        self.rejected = 0
+        self._pending = deque()
+        self._drain_lock = threading.Lock()
+        self._reject_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        """被采样掉或因积压被拒绝的日志条数"""
+        return self.sampled_out + self.rejected
+
+    @property
+    def pending(self) -> int:
+        """排队中的日志条数"""
+        return len(self._pending)
+
+    def count(self, level: str) -> int:
+        """指定级别已写入的日志条数，包括被采样掉的"""
+        return self.level_counts[LEVEL_IDS.get(level, LOG)]
+
+    def put(self, message: str, level: str = "INFO", timestamp_ms: int | None = None,
+            source: int | None = None) -> bool:
+        """追加一条日志，可以从任意线程调用
+
+        Args:
+            message: 日志消息
+            level: 日志级别名称
+            timestamp_ms: 毫秒时间戳，默认为当前时间
+            source: 来源编号，对应LogStore.sources中的名称和样式
+
+        Returns:
+            bool: 是否进入队列，积压过多被拒绝时返回False
+        """
+        if len(self._pending) >= self.max_pending:
+            with self._reject_lock:
+                self.rejected += 1
+            return False
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        if source is None:
+            self._pending.append((timestamp_ms, LEVEL_IDS.get(level, LOG), message))
+        else:
+            self._pending.append((timestamp_ms, LEVEL_IDS.get(level, LOG), message, source))
+        return True
+
+    def drain(self) -> int:
+        """把排队的日志批量写入LogStore，通常在每次界面刷新前调用
+
+        Returns:
+            int: 本批取出的日志条数
+        """
+        with self._drain_lock:
+            pending = self._pending
+            size = len(pending)
+            if not size:
+                return 0
+            popleft = pending.popleft
+            batch = [popleft() for _ in range(size)]
+
+            counts = self.level_counts
+            for record in batch:
+                counts[record[1]] += 1
+            if self.sink is not None:
+                self.sink.submit(batch, self.store.sources)
+
+            budget = self.tick_budget
+            if size > budget:
+                batch = self._sample(batch, budget)
+                self.sampled_out += size - len(batch)
+            self.store.extend(batch)
+            return size
+
+    @staticmethod
+    def _sample(batch: list, budget: int) -> list:
+        """按间隔采样普通日志，保留全部警告和错误，保持原有顺序"""
+        important = sum(1 for record in batch if record[1] in _KEEP_LEVELS)
+        room = budget - important
+        if room <= 0:
+            return [record for record in batch if record[1] in _KEEP_LEVELS]
+        stride = math.ceil((len(batch) - important) / room)
+        kept = []
+        index = 0
+        for record in batch:
+            if record[1] in _KEEP_LEVELS:
+                kept.append(record)
+            else:
+                if index % stride == 0:
+                    kept.append(record)
+                index += 1
+        return kept
@@ -0,0 +1,317 @@
+"""
+多个日志来源按时间顺序合并
+
+所有来源在同一个asyncio事件循环中读取，不为每个来源创建线程：
+- 普通文件共用一个协程，Linux上把inotify描述符注册到事件循环，文件变化时才读取，其他平台指数退避轮询
+- 命名管道、标准输入（"-"）和命令输出（"cmd:命令"）各用一个协程读取StreamReader
+
+读到的行解析为LogEvent后放入按时间戳排序的堆，用k路归并的方式输出：
+所有仍在运行的来源都已经读到比它晚一个重排窗口的日志时，堆顶的日志可以安全输出；
+某个来源长时间没有新日志时，日志在堆中最多等待重排窗口（window_ms）后输出，
+堆中的日志超过max_buffered条时直接输出最早的日志，内存占用有上限。
+
+单个来源读取失败（没有权限、文件被替换为目录等）时只停止该来源，记录错误并输出一条ERROR日志，其他来源继续合并。
+"""
+import asyncio
+import colorsys
+import heapq
+import itertools
+import os
+import stat
+import subprocess
+import sys
+import time
+
+from .log_structured import JsonLinesParser, LogEvent
+from .log_tail import FileTailer, PollingWaiter, create_waiter
+
+DEFAULT_WINDOW_MS = 500
+DEFAULT_MAX_BUFFERED = 100_000
+# 管道单行的最大字节数，超过时只保留行首
+STREAM_LIMIT = 1024 * 1024
+
+# 前几个来源使用的颜色，更多来源时按黄金角在色环上取色，相邻来源的颜色差别明显
+_BASE_COLORS = ("cyan", "magenta", "bright_green", "yellow", "bright_blue", "bright_red", "bright_cyan", "orange1")
+
+
+def source_color(index: int) -> str:
+    """第index个来源的颜色"""
+    if index < len(_BASE_COLORS):
+        return _BASE_COLORS[index]
+    hue = (index * 0.618033988749895) % 1.0
+    red, green, blue = colorsys.hsv_to_rgb(hue, 0.65, 1.0)
+    return f"#{int(red * 255):02x}{int(green * 255):02x}{int(blue * 255):02x}"
+
+
+class LogSource:
+    """一个日志来源"""
+
+    __slots__ = ("index", "spec", "label", "style", "latest_ts", "lines", "closed", "error")
+
+    def __init__(self, index: int, spec: str, label: str):
+        self.index = index
+        self.spec = spec
+        self.label = label
+        self.style = source_color(index)
+        # 该来源已读到的最大时间戳，单个来源内的日志视为按时间排列
+        self.latest_ts = 0
+        self.lines = 0
+        self.closed = False
+        # 读取失败的原因，失败后该来源不再读取
+        self.error = None
+
+    @property
+    def kind(self) -> str:
+        """来源类型：cmd、stdin、pipe或file"""
+        if self.spec.startswith("cmd:"):
+            return "cmd"
+        if self.spec == "-":
+            return "stdin"
+        try:
+            return "pipe" if stat.S_ISFIFO(os.stat(self.spec).st_mode) else "file"
+        except FileNotFoundError:
+            return "file"
+
+
+async def read_line(reader: asyncio.StreamReader, limit: int = STREAM_LIMIT) -> bytes:
+    """从StreamReader读取一行（包含换行符）
+
+    超过limit的行只返回前limit字节，该行的其余部分读出后丢弃，下一次读取从下一行开始。
+
+    Returns:
+        bytes: 读到的行，EOF时为空
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        # EOF，最后一行没有换行符
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        # 数据仍在缓冲区中，consumed是已经检查过、不含换行符的字节数
+        head = await reader.read(e.consumed)
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError:
+            break
+        except asyncio.LimitOverrunError as e:
+            await reader.read(e.consumed)
+        else:
+            break
+    return head[:limit]
+
+
+def source_labels(specs: list[str]) -> list[str]:
+    """生成来源的显示名称：文件名、命令的第一个词或stdin，重名时追加序号"""
+    labels = []
+    for spec in specs:
+        if spec.startswith("cmd:"):
+            words = spec[4:].split()
+            labels.append(os.path.basename(words[0]) if words else "cmd")
+        elif spec == "-":
+            labels.append("stdin")
+        else:
+            labels.append(os.path.basename(spec) or spec)
+    seen = {}
+    for index, label in enumerate(labels):
+        if labels.count(label) > 1:
+            seen[label] = seen.get(label, 0) + 1
+            labels[index] = f"{label}#{seen[label]}"
+    return labels
+
+
+class LogMultiplexer:
+    """把多个日志来源合并为一个按时间排序的流"""
+
+    def __init__(self, specs: list[str], emit, window_ms: int = DEFAULT_WINDOW_MS,
+                 max_buffered: int = DEFAULT_MAX_BUFFERED, from_end: bool = True):
+        """初始化合并器
+
+        Args:
+            specs: 来源列表：文件或命名管道路径、"-"表示标准输入、"cmd:命令"表示命令的输出
+            emit: 按时间顺序输出日志的回调，参数为 (LogSource, LogEvent)
+            window_ms: 重排窗口，日志在堆中最多等待的毫秒数
+            max_buffered: 堆中最多保留的日志条数
+            from_end: 文件是否从末尾开始跟踪
+        """
+        self.sources = [LogSource(index, spec, label) for index, (spec, label) in
+                        enumerate(zip(specs, source_labels(specs)))]
+        self.emit = emit
+        self.window_ms = window_ms
+        self.max_buffered = max_buffered
+        self.from_end = from_end
+        self.parser = JsonLinesParser()
+        self.emitted = 0
+        # 早于已输出日志的时间戳、无法按顺序输出的日志条数
+        self.late = 0
+        self._heap = []
+        self._counter = itertools.count()
+        self._last_emitted_ts = 0
+
+    @property
+    def buffered(self) -> int:
+        """堆中等待输出的日志条数"""
+        return len(self._heap)
+
+    def push(self, source: LogSource, line: str | bytes) -> None:
+        """解析一行日志并放入重排堆"""
+        event = self.parser.parse_line(line)
+        timestamp_ms = event.timestamp_ms
+        if timestamp_ms > source.latest_ts:
+            source.latest_ts = timestamp_ms
+        source.lines += 1
+        arrival_ms = time.monotonic_ns() // 1_000_000
+        heapq.heappush(self._heap, (timestamp_ms, next(self._counter), arrival_ms, source, event))
+        if len(self._heap) > self.max_buffered:
+            self._pop()
+
+    @property
+    def failed(self) -> list[LogSource]:
+        """读取失败的来源"""
+        return [source for source in self.sources if source.error is not None]
+
+    def fail(self, source: LogSource, error: Exception) -> None:
+        """停止读取失败的来源，输出一条说明原因的ERROR日志"""
+        source.closed = True
+        source.error = f"{type(error).__name__}: {error}"
+        now_ms = time.time_ns() // 1_000_000
+        event = LogEvent(now_ms, "ERROR", source.label, f"来源读取失败，已停止跟踪: {source.error}")
+        heapq.heappush(self._heap, (now_ms, next(self._counter), time.monotonic_ns() // 1_000_000, source, event))
+
+    def _pop(self) -> None:
+        timestamp_ms, _, _, source, event = heapq.heappop(self._heap)
+        if timestamp_ms < self._last_emitted_ts:
+            self.late += 1
+        else:
+            self._last_emitted_ts = timestamp_ms
+        self.emitted += 1
+        self.emit(source, event)
+
+    def flush(self, force: bool = False) -> int:
+        """输出可以按顺序输出的日志
+
+        Args:
+            force: 是否输出堆中的全部日志
+
+        Returns:
+            int: 输出的日志条数
+        """
+        heap = self._heap
+        if not heap:
+            return 0
+        latest = [source.latest_ts for source in self.sources if not source.closed]
+        # 所有仍在运行的来源都已读到比safe_ts晚一个重排窗口的日志，同一来源内不超过窗口的乱序也能排好
+        safe_ts = min(latest) - self.window_ms if latest else float("inf")
+        deadline = time.monotonic_ns() // 1_000_000 - self.window_ms
+        emitted = self.emitted
+        while heap and (force or heap[0][0] <= safe_ts or heap[0][2] <= deadline):
+            self._pop()
+        return self.emitted - emitted
+
+    async def run(self) -> None:
+        """读取所有来源直到全部结束或任务被取消"""
+        files = []
+        readers = []
+        for source in self.sources:
+            kind = source.kind
+            if kind == "file":
+                files.append(source)
+            else:
+                readers.append(self._guard(source, self._read_stream(source, kind)))
+        if files:
+            readers.append(self._follow_files(files))
+        await asyncio.gather(*readers)
+
+    async def _guard(self, source: LogSource, reader) -> None:
+        """运行一个来源的读取协程，出错时只停止该来源"""
+        try:
+            await reader
+        except Exception as e:
+            self.fail(source, e)
+
+    async def _follow_files(self, sources: list[LogSource]) -> None:
+        """在一个协程中跟踪所有普通文件"""
+        loop = asyncio.get_running_loop()
+        opened = []
+        for source in sources:
+            try:
+                opened.append((source, FileTailer(source.spec, from_end=self.from_end)))
+            except OSError as e:
+                self.fail(source, e)
+        if not opened:
+            return
+        sources = [source for source, _ in opened]
+        tailers = [tailer for _, tailer in opened]
+        waiter = create_waiter([source.spec for source in sources])
+        changed = asyncio.Event()
+        inotify = not isinstance(waiter, PollingWaiter)
+        if inotify:
+            def on_change():
+                waiter.drain()
+                changed.set()
+            loop.add_reader(waiter.fileno(), on_change)
+        try:
+            while True:
+                # 读取前清除标记，读取期间发生的变化会在下一轮处理
+                changed.clear()
+                received = 0
+                for source, tailer in zip(sources, tailers):
+                    if source.error is not None:
+                        continue
+                    try:
+                        lines = tailer.read_lines()
+                    except OSError as e:
+                        self.fail(source, e)
+                        continue
+                    for line in lines:
+                        self.push(source, line)
+                    received += len(lines)
+                if all(source.error is not None for source in sources):
+                    break
+                if inotify:
+                    try:
+                        await asyncio.wait_for(changed.wait(), waiter.max_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    if received:
+                        waiter.reset()
+                    await asyncio.sleep(waiter.interval)
+                    waiter.interval = min(waiter.interval * 2, waiter.max_interval)
+        finally:
+            if inotify:
+                loop.remove_reader(waiter.fileno())
+            waiter.close()
+            for tailer in tailers:
+                tailer.close()
+
+    async def _read_stream(self, source: LogSource, kind: str) -> None:
+        """逐行读取管道、标准输入或命令的输出"""
+        loop = asyncio.get_running_loop()
+        process = None
+        if kind == "cmd":
+            # 不使用asyncio.create_subprocess_shell：Python 3.12之前它为每个子进程创建一个等待线程，
+            # 这里直接把子进程的stdout接入事件循环，读到EOF后再回收子进程
+            process = subprocess.Popen(source.spec[4:], shell=True, stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            pipe = process.stdout
+        elif kind == "stdin":
+            pipe = sys.stdin.buffer
+        else:
+            # 以读写方式打开命名管道，写入端全部关闭时不会读到EOF
+            pipe = open(os.open(source.spec, os.O_RDWR | os.O_NONBLOCK), "rb", buffering=0)
+        reader = asyncio.StreamReader(limit=STREAM_LIMIT)
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        try:
+            while True:
+                line = await read_line(reader)
+                if not line:
+                    break
+                self.push(source, line.rstrip(b"\r\n"))
+        finally:
+            source.closed = True
+            transport.close()
+            if process is not None:
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
@@ -0,0 +1,355 @@
+"""
+日志会话持久化
+
+SessionWriter在后台线程中把日志写入gzip压缩的会话文件，日志面板关闭后仍然可以重新打开。
+写入队列（LogIngestQueue）每次渲染前取出的一批日志整体提交给SessionWriter，提交只是向deque追加一个列表，
+压缩和写盘都在后台线程中进行，渲染循环不会因为磁盘IO而阻塞。
+
+待写入的日志条数有上限，超出时按overflow策略处理，被丢弃的条数写入会话文件，读取时可以看到缺口：
+- drop_oldest（默认）：丢弃最早排队的批次，与日志面板的环形缓冲一致，保留最新的日志
+- drop_new：丢弃新提交的批次，保留已经排队的日志
+- block：提交时最多等待block_timeout秒，超时后丢弃新提交的批次
+
+会话文件按未压缩的字节数轮转：<会话ID>-<分卷号>.log.gz，每行一条日志，字段以制表符分隔：
+毫秒时间戳、级别名称、来源名称、消息（消息中的反斜杠、制表符和换行转义），以#开头的行是注释。
+"""
+import glob
+import gzip
+import os
+import threading
+import time
+from collections import deque
+
+from .log_store import LEVEL_IDS, LEVELS, LOG
+
+DEFAULT_SESSION_DIR = os.environ.get("FASTX_LOG_SESSION_DIR") or os.path.join(
+    os.path.expanduser("~"), ".fastx", "log_sessions")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_PENDING = 200_000
+DEFAULT_KEEP_SESSIONS = 20
+OVERFLOW_POLICIES = ("drop_oldest", "drop_new", "block")
+
+_HEADER = "#fastx-log-session v1"
+_ESCAPE = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+_UNESCAPE = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r"}
+
+
+def _unescape(message: str) -> str:
+    result = []
+    index = 0
+    while index < len(message):
+        pair = message[index:index + 2]
+        if pair in _UNESCAPE:
+            result.append(_UNESCAPE[pair])
+            index += 2
+        else:
+            result.append(message[index])
+            index += 1
+    return "".join(result)
+
+
+class SessionWriter:
+    """后台线程写入的gzip会话日志"""
+
+    def __init__(self, directory: str = DEFAULT_SESSION_DIR, session_id: str | None = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_pending: int = DEFAULT_MAX_PENDING,
+                 overflow: str = "drop_oldest", block_timeout: float = 0.05, flush_interval: float = 0.5,
+                 compresslevel: int = 6, keep_sessions: int = DEFAULT_KEEP_SESSIONS):
+        """创建会话并启动写入线程
+
+        Args:
+            directory: 会话文件目录
+            session_id: 会话ID，默认为当前时间
+            max_bytes: 每个分卷未压缩的最大字节数，超出后轮转到下一个分卷
+            max_pending: 最多排队等待写入的日志条数
+            overflow: 队列满时的处理策略，drop_oldest、drop_new或block
+            block_timeout: block策略下提交时最多等待的秒数
+            flush_interval: 写入线程两次写盘之间的最长间隔（秒）
+            compresslevel: gzip压缩级别
+            keep_sessions: 最多保留的会话数，创建会话时删除更早的会话
+
+        Raises:
+            ValueError: 未知的溢出策略
+            OSError: 无法创建目录
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"未知的溢出策略: {overflow}，可选: {', '.join(OVERFLOW_POLICIES)}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.session_id = session_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.flush_interval = flush_interval
+        self.compresslevel = compresslevel
+        self.written = 0
+        self.dropped = 0
+        # 写入线程遇到的OSError（磁盘已满、目录被删除等），出错后不再接受新的日志
+        self.error = None
+        self.part = 0
+        self.paths = []
+        self._sources = []
+        self._batches = deque()
+        self._pending = 0
+        self._unreported = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._file = None
+        self._file_bytes = 0
+        prune_sessions(directory, keep_sessions - 1)
+        self._thread = threading.Thread(target=self._run, name="log-session", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """排队等待写入的日志条数"""
+        return self._pending
+
+    def submit(self, batch: list, sources: list | None = None) -> bool:
+        """提交一批 (毫秒时间戳, 级别编号, 消息[, 来源编号]) 记录
+
+        Args:
+            batch: 日志记录，提交后不应再修改
+            sources: 来源的 (名称, 样式) 列表，按记录中的来源编号索引
+
+        Returns:
+            bool: 是否全部进入队列，因队列已满被丢弃时返回False
+        """
+        size = len(batch)
+        if not size:
+            return True
+        with self._condition:
+            if sources is not None:
+                self._sources = sources
+            if self.error is not None:
+                self._count_dropped(size)
+                return False
+            if self._closed:
+                return False
+            if self._pending + size > self.max_pending:
+                if self.overflow == "block":
+                    self._condition.wait_for(lambda: self._pending + size <= self.max_pending,
+                                             self.block_timeout)
+                elif self.overflow == "drop_oldest":
+                    while self._batches and self._pending + size > self.max_pending:
+                        oldest = len(self._batches.popleft())
+                        self._pending -= oldest
+                        self._count_dropped(oldest)
+                if self._pending + size > self.max_pending:
+                    self._count_dropped(size)
+                    return False
+            self._batches.append(batch)
+            self._pending += size
+            self._condition.notify()
+        return True
+
+    def _count_dropped(self, size: int) -> None:
+        self.dropped += size
+        self._unreported += size
+
+    def _open_part(self) -> None:
+        self.part += 1
+        path = os.path.join(self.directory, f"{self.session_id}-{self.part:03d}.log.gz")
+        self._file = gzip.open(path, "wb", compresslevel=self.compresslevel)
+        self._file_bytes = 0
+        self.paths.append(path)
+        self._write_raw(f"{_HEADER} session={self.session_id} part={self.part}\n".encode("utf-8"))
+
+    def _write_raw(self, data: bytes) -> None:
+        if self._file is None or self._file_bytes >= self.max_bytes:
+            if self._file is not None:
+                self._file.close()
+            self._open_part()
+        self._file.write(data)
+        self._file_bytes += len(data)
+
+    def _format(self, batches: list, sources: list) -> bytes:
+        lines = []
+        levels = LEVELS
+        escape = _ESCAPE
+        for batch in batches:
+            for record in batch:
+                source = sources[record[3]][0] if len(record) > 3 and record[3] < len(sources) else ""
+                lines.append(f"{record[0]}\t{levels[record[1]]}\t{source}\t{record[2].translate(escape)}\n")
+        return "".join(lines).encode("utf-8")
+
+    def _run(self) -> None:
+        condition = self._condition
+        while True:
+            with condition:
+                if not self._batches and not self._closed:
+                    condition.wait(self.flush_interval)
+                batches = list(self._batches)
+                self._batches.clear()
+                count = self._pending
+                self._pending = 0
+                unreported, self._unreported = self._unreported, 0
+                sources = self._sources
+                closed = self._closed
+                # 唤醒block策略下等待的提交
+                condition.notify_all()
+
+            try:
+                self._write(batches, count, unreported, sources)
+            except OSError as e:
+                with condition:
+                    self.error = e
+                    self._closed = True
+                    # 出错时取出的和仍在排队的日志都无法写入
+                    self._count_dropped(count + self._pending)
+                    self._batches.clear()
+                    self._pending = 0
+                    condition.notify_all()
+                break
+            if closed:
+                break
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                if self.error is None:
+                    self.error = e
+
+    def _write(self, batches: list, count: int, unreported: int, sources: list) -> None:
+        if unreported:
+            self._write_raw(f"# dropped {unreported} records\n".encode("utf-8"))
+        if batches:
+            data = self._format(batches, sources)
+            # 按行边界写入，单批很大时也能在分卷之间轮转
+            if self._file_bytes + len(data) > self.max_bytes and len(data) > 1:
+                for line in data.splitlines(keepends=True):
+                    self._write_raw(line)
+            else:
+                self._write_raw(data)
+            self.written += count
+        if self._file is not None and (batches or unreported):
+            self._file.flush()
+
+    def close(self) -> None:
+        """写完排队的日志后关闭会话
+
+        Raises:
+            OSError: 写入线程在会话期间遇到的错误，出错之后的日志已计入dropped
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+def prune_sessions(directory: str, keep: int) -> None:
+    """只保留最近的keep个会话"""
+    sessions = list_sessions(directory)
+    for session in sessions[:max(0, len(sessions) - keep)]:
+        for path in session["paths"]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def list_sessions(directory: str = DEFAULT_SESSION_DIR) -> list[dict]:
+    """列出目录中的会话，按会话ID（创建时间）从旧到新排列
+
+    Returns:
+        list[dict]: 每个会话的id、paths（分卷路径）、size（压缩后的字节数）和mtime
+    """
+    sessions = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*-[0-9][0-9][0-9].log.gz"))):
+        session_id = os.path.basename(path)[:-len("-000.log.gz")]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        session = sessions.setdefault(session_id, {"id": session_id, "paths": [], "size": 0, "mtime": 0.0})
+        session["paths"].append(path)
+        session["size"] += stat.st_size
+        session["mtime"] = max(session["mtime"], stat.st_mtime)
+    return [sessions[session_id] for session_id in sorted(sessions)]
+
+
+def resolve_session(session: str, directory: str = DEFAULT_SESSION_DIR) -> list[str]:
+    """把会话ID、"latest"或分卷文件路径转换为按顺序排列的分卷路径
+
+    Raises:
+        FileNotFoundError: 会话不存在
+    """
+    if os.path.isfile(session):
+        return [session]
+    sessions = list_sessions(directory)
+    if session == "latest" and sessions:
+        return sessions[-1]["paths"]
+    for item in sessions:
+        if item["id"] == session:
+            return item["paths"]
+    raise FileNotFoundError(f"会话不存在: {session}")
+
+
+def load_session(paths: list[str], store, chunk_size: int = 1024 * 1024) -> dict:
+    """把会话日志读入LogStore，分块解压并批量写入，超出容量时保留最新的日志
+
+    写入进程被强制结束（kill -9、断电）时分卷没有gzip结尾，读出其中完整的日志，并在truncated中返回该分卷。
+
+    Args:
+        paths: 会话分卷路径，按顺序读取
+        store: 目标LogStore，来源名称写入store.sources
+        chunk_size: 每次解压的字节数
+
+    Returns:
+        dict: records（读取的条数）、dropped（会话中记录的丢弃条数）和truncated（没有正常结束的分卷路径）
+    """
+    sources = {}
+    source_list = list(store.sources)
+    level_ids = LEVEL_IDS
+    records = 0
+    dropped = 0
+    truncated = []
+    for path in paths:
+        partial = b""
+        with gzip.open(path, "rb") as f:
+            while True:
+                try:
+                    # read1每次只解压一段，流被截断时已经解压出的数据不会随异常一起丢失
+                    chunk = f.read1(chunk_size)
+                except EOFError:
+                    # 写入进程被强制结束，gzip流没有结尾：保留已经读出的日志，丢弃最后不完整的一行
+                    truncated.append(path)
+                    chunk = partial = b""
+                data = partial + chunk
+                if not data:
+                    break
+                # 在最后一个换行处切开后整块解码，换行符不会出现在多字节字符中间
+                cut = data.rfind(b"\n") if chunk else len(data)
+                if cut < 0:
+                    partial = data
+                    continue
+                partial = data[cut + 1:]
+                batch = []
+                for line in data[:cut].decode("utf-8", errors="replace").split("\n"):
+                    fields = line.split("\t", 3)
+                    if len(fields) != 4:
+                        # 注释行中没有制表符
+                        if line.startswith("# dropped "):
+                            dropped += int(line.split()[2])
+                        continue
+                    timestamp, level, source, message = fields
+                    if "\\" in message:
+                        message = _unescape(message)
+                    record = (int(timestamp), level_ids.get(level, LOG), message)
+                    if source:
+                        index = sources.get(source)
+                        if index is None:
+                            from .log_multiplex import source_color
+                            index = sources[source] = len(source_list)
+                            source_list.append((source, source_color(index)))
+                        record += (index,)
+                    batch.append(record)
+                store.extend(batch)
+                records += len(batch)
+                if not chunk:
+                    break
+    store.sources = source_list
+    return {"records": records, "dropped": dropped, "truncated": truncated}
@@ -0,0 +1,242 @@
+"""
+环形缓冲日志存储
+
+日志以 (毫秒时间戳, 级别编号, 消息) 元组保存在有界deque中（多个来源合并时追加第四项来源编号），追加是O(1)的，超出容量时自动丢弃最旧的记录。
+渲染时才把可见窗口内的记录转换为带样式的Text，滚动历史可以很深而内存仍然有上限。
+每条记录按写入顺序有一个序号，每个级别维护一个记录序号的索引，按级别过滤时只需合并所选级别的索引，
+不需要扫描全部历史。
+"""
+import heapq
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from rich.text import Text
+
+DEFAULT_CAPACITY = 10000
+
+# 级别名称 -> 级别编号，未知级别使用LOG
+LEVELS = ("DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "LOG")
+LEVEL_IDS = {name: index for index, name in enumerate(LEVELS)}
+LOG = LEVEL_IDS["LOG"]
+
+# 各级别的 (前缀, 样式)，按级别编号索引
+DEFAULT_LEVEL_STYLES = (
+    ("[DBG]", "dim"),
+    ("[INFO]", "white"),
+    ("[OK]", "bold green"),
+    ("[WARN]", "yellow"),
+    ("[ERR]", "red"),
+    ("[LOG]", "white"),
+)
+
+
+def level_id(level: str) -> int:
+    """获取级别编号"""
+    return LEVEL_IDS.get(level, LOG)
+
+
+class LogStore:
+    """容量有限的日志存储"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, level_styles: tuple = DEFAULT_LEVEL_STYLES,
+                 time_format: str = "%H:%M:%S", millis: bool = False, time_template: str = "{} ",
+                 time_style: str = "dim cyan"):
+        """初始化日志存储
+
+        Args:
+            capacity: 最多保留的日志条数（滚动历史深度）
+            level_styles: 各级别的 (前缀, 样式)，按级别编号索引
+            time_format: 时间戳的strftime格式
+            millis: 时间戳是否显示毫秒
+            time_template: 时间戳的显示模板，例如 "[{}] "
+            time_style: 时间戳的样式
+        """
+        self.records = deque(maxlen=capacity)
+        self.level_styles = level_styles
+        self.time_format = time_format
+        self.millis = millis
+        self.time_template = time_template
+        self.time_style = time_style
+        # 日志来源的 (名称, 样式)，按记录中的来源编号索引
+        self.sources = []
+        self.total = 0
+        # 各级别的记录序号（从小到大），按级别编号索引
+        self.level_index = tuple(deque() for _ in LEVELS)
+        # 后台搜索线程读取记录时持有该锁
+        self.lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """最多保留的日志条数"""
+        return self.records.maxlen
+
+    @property
+    def dropped(self) -> int:
+        """因超出容量或清空而移除的日志条数"""
+        return self.total - len(self.records)
+
+    @property
+    def first_seq(self) -> int:
+        """最旧的一条记录的序号"""
+        return self.total - len(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def append(self, message: str, level: str = "INFO", timestamp_ms: int | None = None) -> None:
+        """追加一条日志
+
+        Args:
+            message: 日志消息
+            level: 日志级别名称
+            timestamp_ms: 毫秒时间戳，默认为当前时间
+        """
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        level = LEVEL_IDS.get(level, LOG)
+        with self.lock:
+            self.records.append((timestamp_ms, level, message))
+            self.level_index[level].append(self.total)
+            self.total += 1
+            self.trim_index(self.level_index)
+
+    def extend(self, records: list[tuple[int, int, str]]) -> None:
+        """批量追加 (毫秒时间戳, 级别编号, 消息) 记录"""
+        level_index = self.level_index
+        with self.lock:
+            seq = self.total
+            for record in records:
+                level_index[record[1]].append(seq)
+                seq += 1
+            self.records.extend(records)
+            self.total = seq
+            self.trim_index(level_index)
+
+    def clear(self) -> None:
+        """清空日志，序号继续递增，已有的搜索结果随之失效"""
+        with self.lock:
+            self.records.clear()
+            for seqs in self.level_index:
+                seqs.clear()
+
+    def trim_index(self, index: tuple[deque, ...]) -> None:
+        """从按级别的序号索引中移除已被丢弃的记录"""
+        first = self.first_seq
+        for seqs in index:
+            while seqs and seqs[0] < first:
+                seqs.popleft()
+
+    def count(self, levels=None, index: tuple[deque, ...] | None = None) -> int:
+        """统计所选级别的记录条数
+
+        Args:
+            levels: 级别编号的集合，None表示全部级别
+            index: 按级别的序号索引，默认为全部记录的级别索引，也可以传入搜索结果
+        """
+        if levels is None and index is None:
+            return len(self.records)
+        index = self.level_index if index is None else index
+        return sum(len(index[level]) for level in (range(len(LEVELS)) if levels is None else levels))
+
+    def window(self, height: int, offset: int = 0, levels=None,
+               index: tuple[deque, ...] | None = None) -> list[tuple[int, int, str]]:
+        """获取可见窗口内的记录，按时间从旧到新排列
+
+        指定levels或index时从新到旧合并所选级别的序号索引，只访问可见窗口及其之后的序号。
+
+        Args:
+            height: 窗口行数
+            offset: 距离最新记录的行数，0表示显示最新的记录
+            levels: 只显示这些级别编号的记录，None表示全部级别
+            index: 按级别的序号索引，例如正则搜索的结果，默认为全部记录的级别索引
+
+        Returns:
+            list[tuple[int, int, str]]: 可见的记录
+        """
+        if height <= 0:
+            return []
+        if levels is None and index is None:
+            offset = max(0, min(offset, len(self.records) - height))
+            visible = list(islice(reversed(self.records), offset, offset + height))
+            visible.reverse()
+            return visible
+
+        index = self.level_index if index is None else index
+        levels = range(len(LEVELS)) if levels is None else levels
+        offset = max(0, min(offset, self.count(levels, index) - height))
+        newest = heapq.merge(*(reversed(index[level]) for level in levels), reverse=True)
+        seqs = list(islice(newest, offset, offset + height))
+        records = self.records
+        first = self.first_seq
+        return [records[seq - first] for seq in reversed(seqs)]
+
+    def format_time(self, timestamp_ms: int) -> str:
+        """格式化时间戳"""
+        seconds, millis = divmod(timestamp_ms, 1000)
+        text = time.strftime(self.time_format, time.localtime(seconds))
+        if self.millis:
+            text = f"{text}.{millis:03d}"
+        return self.time_template.format(text)
+
+    def render(self, height: int, offset: int = 0, levels=None, index: tuple[deque, ...] | None = None) -> Text:
+        """把可见窗口渲染为带样式的Text，每条记录占一行，过长的消息截断显示，参数同window()"""
+        text = Text(no_wrap=True, overflow="ellipsis")
+        level_styles = self.level_styles
+        sources = self.sources
+        for line, record in enumerate(self.window(height, offset, levels, index)):
+            prefix, style = level_styles[record[1]]
+            if line:
+                text.append("\n")
+            text.append(self.format_time(record[0]), style=self.time_style)
+            text.append(f"{prefix} ", style=style)
+            if len(record) > 3:
+                label, source_style = sources[record[3]]
+                text.append(f"{label} ", style=source_style)
+            text.append(record[2], style=style)
+        return text
+
+    def view(self, placeholder: Text | str | None = None, ingest=None, log_filter=None) -> "LogView":
+        """创建在渲染时才读取日志的可渲染对象
+
+        Args:
+            placeholder: 没有日志时显示的内容
+            ingest: 日志写入队列（log_ingest.LogIngestQueue），每次渲染前先把排队的日志批量写入
+            log_filter: 日志过滤器（log_filter.LogFilter），启用时只显示匹配的记录
+        """
+        return LogView(self, placeholder, ingest, log_filter)
+
+
+class LogView:
+    """日志存储的可渲染视图
+
+    放入Panel或Layout后不需要在每次追加日志时重建，渲染时按可用高度只绘制可见窗口。
+    """
+
+    def __init__(self, store: LogStore, placeholder: Text | str | None = None, ingest=None, log_filter=None):
+        self.store = store
+        self.placeholder = placeholder
+        self.ingest = ingest
+        self.log_filter = log_filter
+        self.offset = 0
+        # 最近一次渲染时的可见行数，翻页按该行数计算
+        self.height = 20
+
+    def scroll(self, lines: int) -> None:
+        """向上（正数）或向下（负数）滚动"""
+        log_filter = self.log_filter
+        count = log_filter.count() if log_filter is not None and log_filter.active else len(self.store)
+        self.offset = max(0, min(self.offset + lines, count - 1))
+
+    def __rich_console__(self, console, options):
+        if self.ingest is not None:
+            self.ingest.drain()
+        if not self.store and self.placeholder is not None:
+            yield Text.from_markup(self.placeholder) if isinstance(self.placeholder, str) else self.placeholder
+            return
+        height = self.height = options.height or options.max_height
+        if self.log_filter is not None and self.log_filter.active:
+            yield self.log_filter.render(height, self.offset)
+        else:
+            yield self.store.render(height, self.offset)
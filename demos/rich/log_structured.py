@@ -0,0 +1,261 @@
+"""
+结构化日志（JSON Lines）解析和滚动统计
+
+JsonLinesParser逐行（或按任意大小的数据块）增量解析JSON日志，取出级别、时间戳、logger和消息，
+安装了orjson时使用orjson解析，否则使用标准库json；不是JSON的行按文本日志识别级别。
+
+LogAggregates按分钟统计各级别的日志条数和各logger的错误条数，只保留最近window_minutes分钟，
+总数同样是窗口内的条数，状态栏的错误和警告计数来自这里。
+"""
+import json
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import NamedTuple
+
+from .log_store import LEVEL_IDS, LEVELS
+from .log_tail import detect_level
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+    JSON_BACKEND = "orjson"
+else:
+    _loads = json.loads
+    JSON_BACKEND = "json"
+
+# 各字段的常见名称，按顺序查找第一个存在的字段
+LEVEL_KEYS = ("level", "levelname", "severity", "lvl")
+TIMESTAMP_KEYS = ("timestamp", "time", "ts", "@timestamp", "asctime")
+LOGGER_KEYS = ("logger", "name", "logger_name", "module")
+MESSAGE_KEYS = ("message", "msg", "event")
+
+# 级别名称的别名和Python logging的数值级别 -> log_store中的级别名称
+_LEVEL_ALIASES = {
+    "WARN": "WARNING",
+    "CRITICAL": "ERROR",
+    "FATAL": "ERROR",
+    "ERR": "ERROR",
+    "TRACE": "DEBUG",
+    "NOTICE": "INFO",
+}
+_NUMERIC_LEVELS = ((40, "ERROR"), (30, "WARNING"), (20, "INFO"), (0, "DEBUG"))
+
+# 文本日志行首的时间戳，例如 "2026-10-17 03:00:01,123 INFO ..." 或 "[2026-10-17T03:00:01Z] ..."
+_TEXT_TIMESTAMP = re.compile(r"\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d{3}(?:\d{3})?)?(?:Z|[+-]\d{2}:\d{2})?)")
+
+# 数值时间戳按数量级识别单位：(下限, 换算为毫秒的除数)，从大到小比较，都不满足时按秒处理
+# 当前时间的秒、毫秒、微秒、纳秒时间戳分别约为1.7e9、1.7e12、1.7e15、1.7e18
+_NUMERIC_UNITS = (
+    (100_000_000_000_000_000, 1_000_000),  # 纳秒
+    (100_000_000_000_000, 1_000),  # 微秒
+    (100_000_000_000, 1),  # 毫秒
+)
+# 晚于接收时间超过该毫秒数的时间戳视为错误，改用接收时间，避免滚动统计的窗口被推到未来；
+# 容许主机之间的时钟偏差
+MAX_FUTURE_SKEW_MS = 5 * 60_000
+
+
+class LogEvent(NamedTuple):
+    """一条结构化日志"""
+    timestamp_ms: int
+    level: str
+    logger: str
+    message: str
+
+
+def _first(record: dict, keys: tuple[str, ...]):
+    for key in keys:
+        value = record.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def normalize_level(value) -> str:
+    """把字符串或数值级别转换为log_store中的级别名称，无法识别时返回LOG"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        for threshold, name in _NUMERIC_LEVELS:
+            if value >= threshold:
+                return name
+        return "DEBUG"
+    if not isinstance(value, str):
+        return "LOG"
+    level = value.strip().upper()
+    level = _LEVEL_ALIASES.get(level, level)
+    return level if level in LEVEL_IDS else "LOG"
+
+
+def parse_timestamp(value, default_ms: int) -> int:
+    """把秒/毫秒/微秒/纳秒数值或ISO 8601字符串转换为毫秒时间戳
+
+    数值的单位按数量级识别。无法解析、或晚于default_ms（接收时间）超过MAX_FUTURE_SKEW_MS时返回default_ms。
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        for threshold, divisor in _NUMERIC_UNITS:
+            if value > threshold:
+                # 纳秒时间戳超出float的精度，整数按整数相除
+                timestamp_ms = value // divisor if isinstance(value, int) else int(value / divisor)
+                break
+        else:
+            timestamp_ms = int(value * 1000)
+    elif isinstance(value, str):
+        try:
+            # Python 3.10的fromisoformat不接受末尾的Z
+            parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+        except ValueError:
+            return default_ms
+        timestamp_ms = int(parsed.timestamp() * 1000)
+    else:
+        return default_ms
+    return default_ms if timestamp_ms - default_ms > MAX_FUTURE_SKEW_MS else timestamp_ms
+
+
+class JsonLinesParser:
+    """增量解析JSON Lines日志"""
+
+    def __init__(self, default_logger: str = ""):
+        """初始化解析器
+
+        Args:
+            default_logger: 日志中没有logger字段时使用的名称
+        """
+        self.default_logger = default_logger
+        self.parsed = 0
+        self.invalid = 0
+        self._partial = b""
+
+    def parse_line(self, line: str | bytes) -> LogEvent:
+        """解析一行日志，不是JSON对象的行按文本日志处理，行首有时间戳时使用该时间戳"""
+        now_ms = time.time_ns() // 1_000_000
+        stripped = line.strip()
+        record = None
+        if stripped[:1] in ("{", b"{"):
+            try:
+                record = _loads(stripped)
+            except ValueError:
+                record = None
+        if not isinstance(record, dict):
+            if stripped[:1] in ("{", b"{"):
+                self.invalid += 1
+            text = stripped.decode("utf-8", errors="replace") if isinstance(stripped, bytes) else stripped
+            match = _TEXT_TIMESTAMP.match(text)
+            timestamp_ms = parse_timestamp(match.group(1).replace(",", "."), now_ms) if match else now_ms
+            return LogEvent(timestamp_ms, detect_level(text), self.default_logger, text)
+
+        self.parsed += 1
+        message = _first(record, MESSAGE_KEYS)
+        if message is None:
+            # 没有消息字段时显示除已识别字段外的其余内容
+            known = set(LEVEL_KEYS + TIMESTAMP_KEYS + LOGGER_KEYS)
+            message = " ".join(f"{key}={value}" for key, value in record.items() if key not in known)
+        logger = _first(record, LOGGER_KEYS)
+        return LogEvent(
+            parse_timestamp(_first(record, TIMESTAMP_KEYS), now_ms),
+            normalize_level(_first(record, LEVEL_KEYS)),
+            self.default_logger if logger is None else str(logger),
+            str(message),
+        )
+
+    def feed(self, data: bytes) -> list[LogEvent]:
+        """解析一块数据中的完整行，不完整的最后一行保留到下一次调用"""
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        return [self.parse_line(line) for line in lines if line.strip()]
+
+    def flush(self) -> list[LogEvent]:
+        """解析剩余的不完整行"""
+        partial, self._partial = self._partial, b""
+        return [self.parse_line(partial)] if partial.strip() else []
+
+
+class LogAggregates:
+    """日志的滚动统计，可以从任意线程更新
+
+    总数和错误最多的logger都只统计最近window_minutes分钟内的日志，分钟移出窗口时从中减去。
+    """
+
+    def __init__(self, window_minutes: int = 60, top_n: int = 3):
+        """初始化统计
+
+        Args:
+            window_minutes: 统计窗口的分钟数
+            top_n: top_error_loggers()默认返回的logger数量
+        """
+        self.window_minutes = window_minutes
+        self.top_n = top_n
+        # 分钟序号 -> (各级别的条数（按级别编号索引）, 该分钟内各logger的错误条数)
+        self.minutes = {}
+        # 窗口内各级别的条数和各logger的错误条数
+        self.totals = [0] * len(LEVELS)
+        self.logger_errors = Counter()
+        self._latest_minute = 0
+        self._lock = threading.Lock()
+
+    def add(self, event: LogEvent) -> None:
+        """统计一条日志，早于统计窗口的日志不计入"""
+        level = LEVEL_IDS.get(event.level, LEVEL_IDS["LOG"])
+        minute = event.timestamp_ms // 60_000
+        with self._lock:
+            entry = self.minutes.get(minute)
+            if entry is None:
+                if minute <= self._latest_minute - self.window_minutes:
+                    return
+                entry = self.minutes[minute] = ([0] * len(LEVELS), Counter())
+                if minute > self._latest_minute:
+                    self._latest_minute = minute
+                    self._expire()
+            entry[0][level] += 1
+            self.totals[level] += 1
+            if event.level == "ERROR":
+                entry[1][event.logger] += 1
+                self.logger_errors[event.logger] += 1
+
+    def _expire(self) -> None:
+        oldest = self._latest_minute - self.window_minutes
+        expired = [minute for minute in self.minutes if minute <= oldest]
+        if not expired:
+            return
+        totals = self.totals
+        for minute in expired:
+            counts, errors = self.minutes.pop(minute)
+            for level, count in enumerate(counts):
+                totals[level] -= count
+            self.logger_errors.subtract(errors)
+        # 去掉错误条数已经减为0的logger
+        self.logger_errors = +self.logger_errors
+
+    def total(self, level: str) -> int:
+        """统计窗口内指定级别的条数"""
+        return self.totals[LEVEL_IDS.get(level, LEVEL_IDS["LOG"])]
+
+    def per_minute(self, level: str) -> list[tuple[int, int]]:
+        """统计窗口内指定级别每分钟的条数
+
+        Returns:
+            list[tuple[int, int]]: (分钟序号, 条数)，按时间排序，分钟序号乘以60000即为毫秒时间戳
+        """
+        level = LEVEL_IDS.get(level, LEVEL_IDS["LOG"])
+        with self._lock:
+            return sorted((minute, entry[0][level]) for minute, entry in self.minutes.items())
+
+    def last_minute(self, level: str) -> int:
+        """最近一分钟（最新日志所在的分钟）指定级别的条数"""
+        with self._lock:
+            entry = self.minutes.get(self._latest_minute)
+            return entry[0][LEVEL_IDS.get(level, LEVEL_IDS["LOG"])] if entry else 0
+
+    def top_error_loggers(self, n: int | None = None) -> list[tuple[str, int]]:
+        """统计窗口内错误最多的n个logger
+
+        Returns:
+            list[tuple[str, int]]: (logger, 错误条数)，按错误条数从多到少排列
+        """
+        with self._lock:
+            return self.logger_errors.most_common(self.top_n if n is None else n)
@@ -0,0 +1,223 @@
+"""
+日志文件跟踪（tail -f）
+
+FileTailer按块读取文件新增的数据，在内存中一次性切分出完整的行，不会为每一行发起系统调用；
+文件被截断时从头开始读取，被logrotate重命名后读完旧文件剩余的数据再打开新文件。
+空闲时Linux上使用inotify等待文件变化，其他平台使用指数退避轮询。
+"""
+import os
+import re
+import select
+import sys
+import time
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# 单次read_lines()最多读取的字节数，避免大量积压数据长时间阻塞界面刷新
+DEFAULT_MAX_READ = 4 * 1024 * 1024
+
+# 从日志行中识别级别，映射为log_store中的级别名称
+_LEVEL_PATTERN = re.compile(r"\b(DEBUG|INFO|SUCCESS|WARN(?:ING)?|ERROR|CRITICAL|FATAL)\b", re.IGNORECASE)
+_LEVEL_ALIASES = {"WARN": "WARNING", "CRITICAL": "ERROR", "FATAL": "ERROR"}
+
+
+def detect_level(line: str, default: str = "LOG") -> str:
+    """识别日志行的级别，找不到级别关键字时返回default"""
+    match = _LEVEL_PATTERN.search(line)
+    if match is None:
+        return default
+    level = match.group(1).upper()
+    return _LEVEL_ALIASES.get(level, level)
+
+
+class FileTailer:
+    """跟踪单个日志文件"""
+
+    def __init__(self, path: str, from_end: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_read: int = DEFAULT_MAX_READ, encoding: str = "utf-8"):
+        """初始化文件跟踪
+
+        Args:
+            path: 日志文件路径，文件可以暂时不存在
+            from_end: 是否从文件末尾开始跟踪，False时先读出已有内容
+            chunk_size: 每次read的字节数
+            max_read: 单次read_lines()最多读取的字节数
+            encoding: 文件编码，无法解码的字节替换显示
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.max_read = max_read
+        self.encoding = encoding
+        self.rotations = 0
+        self.truncations = 0
+        self._fd = None
+        self._identity = None
+        self._position = 0
+        self._partial = b""
+        self._open(from_end)
+
+    def _open(self, from_end: bool) -> bool:
+        """打开文件，文件不存在时返回False"""
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(fd)
+        self._fd = fd
+        self._identity = (stat.st_dev, stat.st_ino)
+        self._position = os.lseek(fd, 0, os.SEEK_END if from_end else os.SEEK_SET)
+        self._partial = b""
+        return True
+
+    def _close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read_available(self, budget: int) -> list[bytes]:
+        """从当前位置读取数据直到文件末尾或超出预算，返回读到的块"""
+        chunks = []
+        while budget > 0:
+            data = os.read(self._fd, min(self.chunk_size, budget))
+            if not data:
+                break
+            chunks.append(data)
+            self._position += len(data)
+            budget -= len(data)
+        return chunks
+
+    def _rotated(self) -> bool:
+        """路径是否已经指向另一个文件（被重命名或删除后重新创建）"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def read_lines(self) -> list[str]:
+        """读取新增的完整行
+
+        不完整的最后一行保留到下一次读取；文件被截断或轮转时自动重新定位。
+
+        Returns:
+            list[str]: 新增的行，不含换行符
+        """
+        if self._fd is None and not self._open(from_end=False):
+            return []
+
+        if os.fstat(self._fd).st_size < self._position:
+            # 文件被截断（例如 copytruncate 或 > file），从头开始读取
+            self.truncations += 1
+            self._position = os.lseek(self._fd, 0, os.SEEK_SET)
+            self._partial = b""
+
+        lines = []
+        chunks = self._read_available(self.max_read)
+        if not chunks and self._rotated():
+            # 旧文件已经读完，旧文件末尾没有换行的内容作为一行输出，然后切换到新文件并从头读取
+            if self._partial:
+                lines.append(self._partial)
+            self._close()
+            self.rotations += 1
+            if self._open(from_end=False):
+                chunks = self._read_available(self.max_read)
+        if chunks:
+            lines += (self._partial + b"".join(chunks)).split(b"\n")
+            self._partial = lines.pop()
+
+        encoding = self.encoding
+        return [line.rstrip(b"\r").decode(encoding, errors="replace") for line in lines]
+
+    def close(self) -> None:
+        """关闭文件"""
+        self._close()
+
+
+class PollingWaiter:
+    """指数退避轮询：有新数据时恢复最短间隔，持续空闲时逐渐延长等待"""
+
+    def __init__(self, min_interval: float = 0.05, max_interval: float = 1.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+
+    def reset(self) -> None:
+        """读到新数据后调用"""
+        self.interval = self.min_interval
+
+    def wait(self) -> None:
+        """等待下一次检查"""
+        time.sleep(self.interval)
+        self.interval = min(self.interval * 2, self.max_interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWaiter:
+    """使用inotify等待文件所在目录的变化，仅Linux可用
+
+    监视目录而不是文件本身，文件被重命名、删除或重新创建时同样会被唤醒。
+    """
+
+    # 目录中文件被修改、写入完成、创建、移入、移出或删除
+    _MASK = 0x2 | 0x8 | 0x100 | 0x80 | 0x40 | 0x200
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+
+    def __init__(self, paths: list[str], max_interval: float = 1.0):
+        """初始化inotify
+
+        Args:
+            paths: 要跟踪的文件路径
+            max_interval: 最长等待时间，防止漏掉网络文件系统等不产生事件的修改
+
+        Raises:
+            OSError: 当前平台不支持inotify
+        """
+        import ctypes
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify仅在Linux上可用")
+        # Linux上主程序的符号表中包含libc，不需要查找库文件
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1失败")
+        self.max_interval = max_interval
+        self._fd = fd
+        for directory in {os.path.dirname(os.path.abspath(path)) for path in paths}:
+            if libc.inotify_add_watch(fd, os.fsencode(directory), self._MASK) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), f"无法监视目录: {directory}")
+
+    def reset(self) -> None:
+        pass
+
+    def fileno(self) -> int:
+        """inotify文件描述符，可以注册到事件循环中"""
+        return self._fd
+
+    def drain(self) -> None:
+        """读出并丢弃所有待处理的事件"""
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def wait(self) -> None:
+        """等待文件变化或超时"""
+        readable, _, _ = select.select([self._fd], [], [], self.max_interval)
+        if readable:
+            self.drain()
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_waiter(paths: list[str]):
+    """优先使用inotify，不可用时退回指数退避轮询"""
+    try:
+        return InotifyWaiter(paths)
+    except (OSError, AttributeError):
+        return PollingWaiter()
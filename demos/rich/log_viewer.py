@@ -0,0 +1,259 @@
+"""
+大日志文件查看器
+
+文件通过mmap映射，后台线程按固定大小的块统计换行符，只为每个块记录一个累计行数，
+索引的大小是文件大小的十万分之三左右（每256KB一个整数），已经索引过的页面随即交还给系统，
+查看多GB的文件时内存占用基本不变。
+
+定位任意一行时先二分查找所在的块，再在这一个块内切分出行首，耗时只取决于块大小而与文件大小无关；
+渲染时只读取可见的行，所以PgUp/PgDn/Home/End跳转到文件任意位置的开销都是固定的。
+"""
+import mmap
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from rich.text import Text
+
+from .log_store import DEFAULT_LEVEL_STYLES, level_id
+from .log_tail import detect_level
+
+BLOCK_SIZE = 256 * 1024
+# 单行最多显示的字节数，超长的行截断显示，不会为了找行尾扫描整个文件
+MAX_LINE_BYTES = 4096
+
+# 终端按键的转义序列 -> 按键名称
+_KEY_SEQUENCES = {
+    b"\x1b[5~": "pgup",
+    b"\x1b[6~": "pgdn",
+    b"\x1b[H": "home",
+    b"\x1b[1~": "home",
+    b"\x1bOH": "home",
+    b"\x1b[F": "end",
+    b"\x1b[4~": "end",
+    b"\x1bOF": "end",
+    b"\x1b[A": "up",
+    b"\x1b[B": "down",
+    b" ": "pgdn",
+    b"g": "home",
+    b"G": "end",
+    b"k": "up",
+    b"j": "down",
+    b"q": "quit",
+    b"Q": "quit",
+}
+
+
+class LineIndex:
+    """日志文件的稀疏行索引，在后台线程中建立"""
+
+    def __init__(self, path: str, block_size: int = BLOCK_SIZE):
+        """打开文件并开始建立索引
+
+        Args:
+            path: 日志文件路径，只索引打开时文件已有的内容
+            block_size: 索引块大小，必须是内存页大小的整数倍
+
+        Raises:
+            OSError: 文件无法打开
+        """
+        self.path = path
+        self.block_size = block_size
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # 空文件不能映射
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        # newlines_before[i]: 第i个块之前的换行符数量，最后一项是已索引部分的换行符总数
+        self.newlines_before = array("q", [0])
+        self.indexed = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._build, name="log-index", daemon=True)
+        self._thread.start()
+
+    @property
+    def progress(self) -> float:
+        """索引进度，0到1"""
+        return self.indexed / self.size if self.size else 1.0
+
+    @property
+    def done(self) -> bool:
+        """索引是否已经建立完毕"""
+        return self.indexed >= self.size
+
+    @property
+    def lines(self) -> int:
+        """已索引的行数，索引完成后包括末尾没有换行符的最后一行"""
+        count = self.newlines_before[-1]
+        if self.done and self.size and self.mm[self.size - 1] != ord("\n"):
+            count += 1
+        return count
+
+    def _build(self) -> None:
+        mm = self.mm
+        size = self.size
+        block_size = self.block_size
+        # 已统计过的页面不再需要留在进程中，后续只有可见的行会被重新读入
+        dontneed = getattr(mmap, "MADV_DONTNEED", None)
+        release = mm.madvise if mm is not None and dontneed is not None and hasattr(mm, "madvise") else None
+        count = 0
+        position = 0
+        while position < size and not self._stop.is_set():
+            end = min(position + block_size, size)
+            count += mm[position:end].count(b"\n")
+            self.newlines_before.append(count)
+            self.indexed = end
+            if release is not None:
+                release(dontneed, position, end - position)
+            position = end
+
+    def line_start(self, line: int) -> int:
+        """第line行（从0开始）的起始字节偏移，只在行首所在的块内查找"""
+        if line <= 0:
+            return 0
+        newlines_before = self.newlines_before
+        # 第line行从第line个换行符之后开始，找到包含该换行符的块
+        block = bisect_left(newlines_before, line) - 1
+        start = block * self.block_size
+        skip = line - newlines_before[block]
+        data = self.mm[start:start + self.block_size]
+        rest = data.split(b"\n", skip)[-1]
+        return start + len(data) - len(rest)
+
+    def read_lines(self, first: int, count: int) -> list[str]:
+        """读取从第first行开始的最多count行，超长的行截断"""
+        end_line = min(first + count, self.lines)
+        if first >= end_line:
+            return []
+        mm = self.mm
+        size = self.size
+        position = self.line_start(first)
+        lines = []
+        for line in range(first, end_line):
+            newline = mm.find(b"\n", position, position + MAX_LINE_BYTES)
+            if newline < 0:
+                stop = min(position + MAX_LINE_BYTES, size)
+                lines.append(mm[position:stop])
+                position = self.line_start(line + 1) if stop < size else size
+            else:
+                lines.append(mm[position:newline])
+                position = newline + 1
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines]
+
+    def close(self) -> None:
+        """停止建立索引并关闭文件"""
+        self._stop.set()
+        self._thread.join()
+        if self.mm is not None:
+            self.mm.close()
+        self._file.close()
+
+
+class LogFileView:
+    """大日志文件的虚拟滚动视图，只渲染可见的行"""
+
+    def __init__(self, index: LineIndex, level_styles: tuple = DEFAULT_LEVEL_STYLES):
+        self.index = index
+        self.level_styles = level_styles
+        self.top = 0
+        # 最近一次渲染时的可见行数，翻页按该行数计算
+        self.height = 20
+
+    @property
+    def max_top(self) -> int:
+        return max(0, self.index.lines - self.height)
+
+    def scroll(self, lines: int) -> None:
+        """向下（正数）或向上（负数）滚动"""
+        self.top = max(0, min(self.top + lines, self.max_top))
+
+    def page_up(self) -> None:
+        self.scroll(-self.height)
+
+    def page_down(self) -> None:
+        self.scroll(self.height)
+
+    def home(self) -> None:
+        self.top = 0
+
+    def end(self) -> None:
+        """跳到末尾，索引未完成时跳到已索引部分的末尾"""
+        self.top = self.max_top
+
+    def handle_key(self, key: str) -> bool:
+        """处理按键，按下退出键时返回False"""
+        if key == "quit":
+            return False
+        action = {
+            "pgup": self.page_up,
+            "pgdn": self.page_down,
+            "home": self.home,
+            "end": self.end,
+            "up": lambda: self.scroll(-1),
+            "down": lambda: self.scroll(1),
+        }.get(key)
+        if action is not None:
+            action()
+        return True
+
+    def __rich_console__(self, console, options):
+        self.height = max(1, options.height or options.max_height)
+        self.top = min(self.top, self.max_top)
+        index = self.index
+        gutter = len(str(max(index.lines, 1)))
+        level_styles = self.level_styles
+        text = Text(no_wrap=True, overflow="ellipsis")
+        for number, line in enumerate(index.read_lines(self.top, self.height), self.top + 1):
+            if number > self.top + 1:
+                text.append("\n")
+            text.append(f"{number:>{gutter}} ", style="dim cyan")
+            text.append(line, style=level_styles[level_id(detect_level(line))][1])
+        yield text
+
+
+@contextmanager
+def key_reader():
+    """在终端cbreak模式下读取按键
+
+    产出read_key(timeout, raw=False)函数，返回按键名称，没有名称的可打印字符返回字符本身，
+    超时或无法识别的按键返回None；raw为True时不转换为名称，直接返回读到的文本，用于输入文本。
+    标准输入不是终端或平台不支持termios时read_key只等待超时。
+    """
+    try:
+        import select
+        import termios
+        import tty
+    except ImportError:
+        termios = None
+    if termios is None or not sys.stdin.isatty():
+        def wait_only(timeout: float, raw: bool = False) -> None:
+            time.sleep(timeout)
+            return None
+        yield wait_only
+        return
+
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+
+    def read_key(timeout: float, raw: bool = False) -> str | None:
+        if not select.select([fd], [], [], timeout)[0]:
+            return None
+        # 一次读出整个转义序列
+        data = os.read(fd, 16)
+        if raw:
+            return data.decode("utf-8", "replace")
+        name = _KEY_SEQUENCES.get(data)
+        if name is not None:
+            return name
+        text = data.decode("utf-8", "replace")
+        return text if len(text) == 1 and text.isprintable() else None
+
+    try:
+        # cbreak模式保留输出处理，Rich的输出不受影响
+        tty.setcbreak(fd)
+        yield read_key
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
@@ -1,10 +1,9 @@
-import time
 from datetime import datetime
 
-from rich.console import Console
-from rich.live import Live
 from rich.text import Text
 
+from .render_backend import get_backend
+
 
 def create_simple_status(message="", progress=0):
     """创建简约状态栏"""
@@ -29,12 +28,12 @@ def create_simple_status(message="", progress=0):
 
 def main():
     """主函数入口"""
-    console = Console()
+    backend = get_backend()
 
     # 实时更新状态
-    with Live(create_simple_status(), refresh_per_second=4) as live:
+    with backend.live(create_simple_status(), refresh_per_second=4) as live:
         for i in range(101):
-            time.sleep(0.05)
+            backend.sleep(0.05)
             messages = [
                 "正在初始化...",
                 "加载配置文件...",
@@ -2,10 +2,10 @@ import random
 import time
 
 from rich.columns import Columns
-from rich.console import Console
-from rich.live import Live
 from rich.panel import Panel
 
+from .render_backend import get_backend
+
 
 def generate_dynamic_status(counter):
     """生成动态状态栏内容"""
@@ -95,22 +95,23 @@ def generate_dynamic_status(counter):
 
 def main():
     """主函数入口"""
-    console = Console()
+    backend = get_backend()
+    console = backend.create_console()
 
     # 使用 Live 实时更新
     console.print("[bold]开始实时监控系统状态...[/bold]\n")
     console.print("按 Ctrl+C 停止监控\n")
 
     try:
-        with Live(generate_dynamic_status(0), refresh_per_second=4, screen=True) as live:
+        with backend.live(generate_dynamic_status(0), refresh_per_second=4, screen=True) as live:
             for i in range(1, 21):  # 运行20次迭代
-                time.sleep(0.5)
+                backend.sleep(0.5)
                 # 更新状态
                 live.update(generate_dynamic_status(i))
 
             # 最后显示完成状态
             live.update(generate_dynamic_status(20))
-            time.sleep(1)
+            backend.sleep(1)
 
     except KeyboardInterrupt:
         console.print("\n[yellow]监控已手动停止[/yellow]")
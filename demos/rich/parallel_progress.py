@@ -1,8 +1,4 @@
-import time
-
-from rich.console import Console
 from rich.layout import Layout
-from rich.live import Live
 from rich.panel import Panel
 from rich.progress import (
     BarColumn,
@@ -14,13 +10,12 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 
+from .render_backend import get_backend
 
-def main():
-    """主函数入口"""
-    console = Console()
 
-    # 创建多个进度条
-    progress = Progress(
+def create_progress():
+    """创建多任务进度条"""
+    return Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -30,13 +25,27 @@ def main():
         expand=True
     )
 
-    # 创建布局
+
+def create_layout():
+    """创建头部、进度区和底部状态栏布局"""
     layout = Layout()
     layout.split(
         Layout(name="header", size=3),
         Layout(name="main"),
         Layout(name="footer", size=3)
     )
+    return layout
+
+
+def main():
+    """主函数入口"""
+    backend = get_backend()
+
+    # 创建多个进度条
+    progress = create_progress()
+
+    # 创建布局
+    layout = create_layout()
 
     # 创建任务
     task1 = progress.add_task("[red]下载...", total=100)
@@ -44,7 +53,7 @@ def main():
     task3 = progress.add_task("[blue]上传...", total=100)
 
     # 实时更新
-    with Live(layout, refresh_per_second=10):
+    with backend.live(layout, refresh_per_second=10):
         # 更新头部
         layout["header"].update(
             Panel("[bold cyan]多任务处理系统[/bold cyan]",
@@ -56,7 +65,7 @@ def main():
 
         # 更新底部状态栏
         for i in range(100):
-            time.sleep(0.05)
+            backend.sleep(0.05)
             progress.update(task1, advance=1)
             if i % 2 == 0:
                 progress.update(task2, advance=1)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Rich演示渲染后端
+
+演示通过get_backend()获取控制台、创建Live和等待，默认使用真实终端；
+切换到离屏后端后，输出写入固定尺寸的内存控制台，sleep()不再等待而是渲染一帧，
+演示可以在没有TTY的环境中运行，并统计帧率和每帧输出的字节数。
+
+运行方式（在插件根目录下）：
+    python -m demos.rich.render_backend --frames 200
+    FASTX_RENDER_BACKEND=offscreen python -m demos.rich.log_execution_monitor
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from collections.abc import Callable
+
+from rich.console import Console
+
+try:
+    # 作为插件的子包（fastx_tui_plugin_example.demos）导入时使用插件的命令执行器，命令被取消时等待提前结束
+    from ...command_executor import cancellable_sleep, check_cancelled
+except ImportError:
+    # 单独运行演示时没有命令执行器，也就没有需要响应的取消
+    def cancellable_sleep(seconds: float) -> None:
+        time.sleep(seconds)
+
+    def check_cancelled() -> None:
+        pass
+
+DEFAULT_WIDTH = 120
+DEFAULT_HEIGHT = 40
+
+
+class TerminalBackend:
+    """真实终端渲染后端"""
+
+    def create_console(self) -> Console:
+        """创建控制台"""
+        return Console()
+
+    def live(self, renderable, refresh_per_second: float = 4, screen: bool = False):
+        """创建Live"""
+        from rich.live import Live
+        return Live(renderable, refresh_per_second=refresh_per_second, screen=screen)
+
+    def sleep(self, seconds: float) -> None:
+        """等待下一帧，通过命令执行器运行时可以被取消
+
+        Raises:
+            CommandCancelled: 等待期间命令被取消
+        """
+        cancellable_sleep(seconds)
+
+
+class FrameStats:
+    """离屏渲染统计"""
+
+    __slots__ = ("frames", "bytes", "render_ns")
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.render_ns = 0
+
+    @property
+    def fps(self) -> float:
+        """每秒可渲染的帧数"""
+        return self.frames / (self.render_ns / 1e9) if self.render_ns else 0.0
+
+    @property
+    def bytes_per_frame(self) -> float:
+        """每帧平均输出字节数"""
+        return self.bytes / self.frames if self.frames else 0.0
+
+    def as_dict(self) -> dict:
+        """转换为字典"""
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "render_ns": self.render_ns,
+            "fps": self.fps,
+            "bytes_per_frame": self.bytes_per_frame,
+        }
+
+
+class _OffscreenLive:
+    """离屏后端的Live替身，只记录当前内容，由sleep()和update()驱动渲染"""
+
+    def __init__(self, backend: "OffscreenBackend", renderable):
+        self.backend = backend
+        self.renderable = renderable
+
+    def __enter__(self):
+        self.backend._live = self
+        self.backend.render(self.renderable)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.backend._live = None
+        return False
+
+    def update(self, renderable, refresh: bool = False) -> None:
+        """替换显示的内容，与Live.update相同，不立即渲染"""
+        self.renderable = renderable
+        if refresh:
+            self.backend.render(renderable)
+
+
+class OffscreenBackend:
+    """离屏渲染后端
+
+    所有演示共用一个写入内存的固定尺寸控制台，每帧输出后立即丢弃，只统计字节数。
+    """
+
+    def __init__(self, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT):
+        self.console = Console(file=io.StringIO(), width=width, height=height, force_terminal=True,
+                               color_system="truecolor", legacy_windows=False)
+        self.stats = FrameStats()
+        self.simulated_seconds = 0.0
+        self._live = None
+
+    def create_console(self) -> Console:
+        """返回离屏控制台"""
+        return self.console
+
+    def live(self, renderable, refresh_per_second: float = 4, screen: bool = False) -> _OffscreenLive:
+        """创建离屏Live"""
+        return _OffscreenLive(self, renderable)
+
+    def sleep(self, seconds: float) -> None:
+        """不等待，记录模拟时间并渲染当前Live的一帧
+
+        Raises:
+            CommandCancelled: 命令已被取消
+        """
+        check_cancelled()
+        self.simulated_seconds += seconds
+        if self._live is not None:
+            self.render(self._live.renderable)
+
+    def render(self, renderable) -> None:
+        """渲染一帧"""
+        start = time.perf_counter_ns()
+        self.console.print(renderable)
+        self.stats.render_ns += time.perf_counter_ns() - start
+        self.flush()
+
+    def capture(self, draw: Callable[[], object]) -> None:
+        """运行直接向控制台输出的绘制函数，并把输出记为一帧"""
+        start = time.perf_counter_ns()
+        draw()
+        self.stats.render_ns += time.perf_counter_ns() - start
+        self.flush()
+
+    def flush(self) -> None:
+        """把控制台中尚未统计的输出记为一帧并丢弃"""
+        buffer = self.console.file
+        written = len(buffer.getvalue().encode("utf-8"))
+        if written:
+            self.stats.frames += 1
+            self.stats.bytes += written
+            buffer.seek(0)
+            buffer.truncate()
+
+
+_backend = OffscreenBackend() if os.environ.get("FASTX_RENDER_BACKEND") == "offscreen" else TerminalBackend()
+
+
+def get_backend():
+    """获取当前渲染后端"""
+    return _backend
+
+
+def set_backend(backend):
+    """设置渲染后端，返回原来的后端"""
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+
+def frame_drivers(backend: OffscreenBackend) -> dict[str, Callable[[], None]]:
+    """创建各演示的单帧驱动函数
+
+    每次调用推进一次演示状态，并通过离屏后端渲染一帧。演示模块在这里才导入。
+    """
+    from rich.status import Status
+
+    from . import (
+        code_execution_monitor,
+        components_view,
+        layout_nav,
+        log_execution_monitor,
+        minimal_monitor_2,
+        monitor_dashboard,
+        panel_table,
+        parallel_progress,
+    )
+
+    console = backend.console
+    previous = set_backend(backend)
+    try:
+        code_monitor = code_execution_monitor.CodeMonitor()
+        status_bar = log_execution_monitor.StatusBar()
+        components = components_view.RichDemoMenu()
+        router = layout_nav.RouterApp()
+    finally:
+        set_backend(previous)
+    drivers = {}
+
+    def code_monitor_frame():
+        code_monitor.progress = (code_monitor.progress + 1) % 101
+        code_monitor.update_code_execution()
+        code_monitor.add_log(f"执行进度: {code_monitor.progress}%", "INFO")
+        code_monitor.update_status_bar()
+        backend.render(code_monitor.layout)
+    drivers["code_execution_monitor"] = code_monitor_frame
+
+    components.console = console
+    components.clear_screen = lambda: None
+    components.wait_for_continue = lambda: None
+
+    def components_frame():
+        components._demo_layout()
+        components._demo_syntax()
+    drivers["components_view"] = lambda: backend.capture(components_frame)
+
+    router.console = console
+    sections = [(page, index) for page in router.pages for index in range(len(router.sections[page]))]
+    router_state = {"frame": 0}
+
+    def router_frame():
+        router.current_page, router.current_section = sections[router_state["frame"] % len(sections)]
+        router_state["frame"] += 1
+        router.render()
+    drivers["layout_nav"] = lambda: backend.capture(router_frame)
+
+    status_state = {"progress": 0}
+
+    def status_bar_frame():
+        progress = status_state["progress"] = status_state["progress"] % 100 + 1
+        status_bar.add_log(f"处理进度: {progress}%", "INFO")
+        status_bar.update_status_bar(status="运行中", progress=progress, errors=1, warnings=2)
+        backend.render(status_bar.layout)
+    drivers["log_execution_monitor"] = status_bar_frame
+
+    status = Status("[bold blue]处理中...", spinner="dots")
+    drivers["minimal_monitor_1"] = lambda: backend.render(status.renderable)
+
+    simple_state = {"progress": 0}
+
+    def simple_status_frame():
+        progress = simple_state["progress"] = (simple_state["progress"] + 1) % 101
+        backend.render(minimal_monitor_2.create_simple_status("处理数据...", progress))
+    drivers["minimal_monitor_2"] = simple_status_frame
+
+    dashboard_state = {"counter": 0}
+
+    def dashboard_frame():
+        dashboard_state["counter"] = dashboard_state["counter"] % 20 + 1
+        backend.render(monitor_dashboard.generate_dynamic_status(dashboard_state["counter"]))
+    drivers["monitor_dashboard"] = dashboard_frame
+
+    drivers["panel_table"] = lambda: backend.render(panel_table.create_script_manager())
+
+    progress = parallel_progress.create_progress()
+    progress_layout = parallel_progress.create_layout()
+    progress_layout["main"].update(progress)
+    tasks = [progress.add_task(name, total=100) for name in ("[red]下载...", "[green]处理...", "[blue]上传...")]
+
+    def progress_frame():
+        for task in tasks:
+            progress.update(task, completed=(progress.tasks[task].completed + 1) % 100)
+        backend.render(progress_layout)
+    drivers["parallel_progress"] = progress_frame
+
+    return drivers
+
+
+def run_offscreen(frames: int, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT,
+                  names: list[str] | None = None) -> dict[str, FrameStats]:
+    """离屏驱动各演示渲染指定帧数
+
+    Args:
+        frames: 每个演示渲染的帧数
+        width: 控制台宽度
+        height: 控制台高度
+        names: 只运行这些演示，None表示全部
+
+    Returns:
+        dict[str, FrameStats]: 每个演示的渲染统计
+    """
+    backend = OffscreenBackend(width, height)
+    results = {}
+    for name, driver in frame_drivers(backend).items():
+        if names and name not in names:
+            continue
+        # 每个演示单独统计
+        backend.stats = FrameStats()
+        for _ in range(frames):
+            driver()
+        results[name] = backend.stats
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数入口"""
+    parser = argparse.ArgumentParser(description="离屏渲染Rich演示并统计帧率和每帧字节数")
+    parser.add_argument("--frames", type=int, default=200, help="每个演示渲染的帧数")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="控制台宽度")
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="控制台高度")
+    parser.add_argument("demos", nargs="*", help="只运行这些演示")
+    args = parser.parse_args(argv)
+
+    results = run_offscreen(args.frames, args.width, args.height, args.demos)
+    print(f"{'演示':<26}{'帧数':>8}{'FPS':>10}{'字节/帧':>12}")
+    for name, stats in results.items():
+        print(f"{name:<26}{stats.frames:>8}{stats.fps:>10.1f}{stats.bytes_per_frame:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,14 +5,15 @@
 该文件包含示例插件的业务逻辑，演示了如何使用FastX-Tui插件接口实现业务功能。
 """
 import os
-import sys
+import tempfile
 import time
 
-from core.menu_system import ActionItem, CommandType, MenuSystem
+from core.menu_system import MenuSystem
+
+from fastx_tui_plugin_example.demo_warmup import DemoWarmup
+from fastx_tui_plugin_example.plugin_commands import DEMOS, register_menus
+from fastx_tui_plugin_example.result_cache import config_cached
 
-# 添加demo目录到路径
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))  # 添加项目根目录到路径
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'FastX-Tui-Plugin-Example'))  # 添加插件目录到路径
 
 class ExampleBusiness:
     """示例插件业务逻辑类
@@ -38,97 +39,47 @@ class ExampleBusiness:
         self.greeting_message = "Hello from Example Plugin!"
         self.show_timestamp = True
         self.log_level = "INFO"
+        self.warmup = None
 
     def initialize(self):
         """初始化业务逻辑
         
-        从配置中获取初始化参数，并记录初始化日志。
+        从配置快照中获取初始化参数，并记录初始化日志。
         """
         # 从配置中获取初始化参数
-        self.greeting_message = self.plugin.get_config("greeting_message", "Hello from Example Plugin!")
-        self.show_timestamp = self.plugin.get_config("show_timestamp", True)
-        self.log_level = self.plugin.get_config("log_level", "INFO")
+        config = self.plugin.config_snapshot
+        self.greeting_message = config.greeting_message
+        self.show_timestamp = config.show_timestamp
+        self.log_level = config.log_level
 
         self.plugin.log_info(f"示例插件初始化完成，问候语: {self.greeting_message}")
         self.plugin.log_info(f"显示时间戳: {self.show_timestamp}")
         self.plugin.log_info(f"日志级别: {self.log_level}")
 
+        # 在后台预热演示模块，减少第一次运行演示的等待时间
+        if config.warmup_demos:
+            self.warmup = DemoWarmup((spec.target for spec in DEMOS), self._on_warmup_done)
+            self.warmup.start()
+
+    def _on_warmup_done(self, warmup: DemoWarmup):
+        """记录预热结果，预热耗时即首次执行演示时节省的时间"""
+        self.plugin.lifecycle_stats.record("demo_warmup", warmup.saved_ns, failed=bool(warmup.failures))
+        state = "已取消" if warmup.cancelled else "完成"
+        self.plugin.log_info(
+            f"演示预热{state}，预热 {len(warmup.timings)} 项，首次执行预计节省 {warmup.saved_ns / 1e6:.1f} ms"
+        )
+        for name, error in warmup.failures.items():
+            self.plugin.log_warning(f"预热 {name} 失败: {error}")
+
     def register_commands(self, menu_system: MenuSystem):
         """注册插件命令到菜单系统
         
-        将插件的命令和菜单注册到菜单系统中。
+        将插件的命令和菜单注册到菜单系统中，菜单结构定义在fastx_tui_plugin_example/plugin_commands.py中。
         
         Args:
             menu_system: 菜单系统实例，用于注册插件的命令和菜单
         """
-        # 创建主菜单
-        main_menu = menu_system.create_submenu(
-            menu_id="example_plugin_menu",
-            name="示例插件",
-            description="演示插件的功能"
-        )
-
-        # 注册Hello World命令
-        menu_system.register_item(ActionItem(
-            id="example_hello",
-            name="Hello World",
-            description="演示基本命令执行",
-            command_type=CommandType.PYTHON,
-            python_func=self.hello_world,
-            category="示例"
-        ))
-
-        # 注册配置演示命令
-        menu_system.register_item(ActionItem(
-            id="example_config",
-            name="配置演示",
-            description="演示如何使用插件配置",
-            command_type=CommandType.PYTHON,
-            python_func=self.config_demo,
-            category="示例"
-        ))
-
-        # 创建Rich Demo子菜单
-        rich_demo_menu = menu_system.create_submenu(
-            menu_id="rich_demo_menu",
-            name="Rich演示",
-            description="演示Rich库的各种功能"
-        )
-
-        # 注册Rich Demo命令
-        rich_demos = [
-            ("rich_code_execution_monitor", "代码执行监控", "演示实时代码执行监控界面", self.rich_code_execution_monitor),
-            ("rich_components_view", "Rich组件演示", "演示Rich库的各种组件", self.rich_components_view),
-            ("rich_layout_nav", "布局导航", "演示带路由功能的布局导航系统", self.rich_layout_nav),
-            ("rich_log_execution_monitor", "日志执行监控", "演示实时日志监控系统", self.rich_log_execution_monitor),
-            ("rich_minimal_monitor_1", "简约监控1", "使用Status组件创建简约任务监控", self.rich_minimal_monitor_1),
-            ("rich_minimal_monitor_2", "简约监控2", "使用Live组件创建实时更新状态栏", self.rich_minimal_monitor_2),
-            ("rich_monitor_dashboard", "监控仪表板", "创建多面板系统监控仪表板", self.rich_monitor_dashboard),
-            ("rich_panel_table", "面板表格", "演示Panel和Table组件创建脚本管理器", self.rich_panel_table),
-            ("rich_parallel_progress", "并行进度条", "创建多任务并行进度条系统", self.rich_parallel_progress)
-        ]
-
-        for demo_id, demo_name, demo_desc, demo_func in rich_demos:
-            menu_system.register_item(ActionItem(
-                id=demo_id,
-                name=demo_name,
-                description=demo_desc,
-                command_type=CommandType.PYTHON,
-                python_func=demo_func,
-                category="Rich演示"
-            ))
-            rich_demo_menu.add_item(demo_id)
-
-        # 将命令添加到菜单
-        main_menu.add_item("example_hello")
-        main_menu.add_item("example_config")
-        main_menu.add_item("rich_demo_menu")
-
-        # 将菜单添加到主菜单
-        main_menu_id = "main_menu"
-        main_menu_item = menu_system.get_item_by_id(main_menu_id)
-        if main_menu_item and hasattr(main_menu_item, "add_item"):
-            main_menu_item.add_item("example_plugin_menu")
+        register_menus(menu_system, lambda spec: getattr(self, spec.handler), self.plugin.command_metrics)
 
     def hello_world(self) -> str:
         """演示基本命令执行
@@ -138,183 +89,147 @@ class ExampleBusiness:
         Returns:
             str: 包含问候信息、时间戳和插件版本的字符串
         """
-        # 获取配置
-        greeting = self.plugin.get_config("greeting_message", "Hello World!")
-        show_timestamp = self.plugin.get_config("show_timestamp", True)
+        # 获取配置快照，配置未修改时不经过宿主程序的配置接口
+        config = self.plugin.config_snapshot
 
         # 构建响应
-        result = f"{greeting}\n"
-        if show_timestamp:
+        result = f"{config.greeting_message}\n"
+        if config.show_timestamp:
             result += f"当前时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
         result += f"插件版本: {self.plugin.get_info().version}\n"
         result += "命令执行成功!"
 
         return result
 
+    @config_cached
     def config_demo(self) -> str:
         """演示如何使用插件配置
         
-        返回一个包含当前配置信息的字符串。
+        返回一个包含当前配置信息的字符串。结果只依赖配置，按配置快照版本号缓存。
         
         Returns:
             str: 包含当前配置信息的字符串
         """
-        # 获取所有配置
-        greeting = self.plugin.get_config("greeting_message", "Default Greeting")
-        show_timestamp = self.plugin.get_config("show_timestamp", True)
-        log_level = self.plugin.get_config("log_level", "INFO")
-        enabled = self.plugin.get_config("enabled", True)
+        # 获取配置快照
+        config = self.plugin.config_snapshot
 
         # 构建响应
-        result = "配置演示\n\n"
-        result += "当前配置:\n"
-        result += f"- 问候信息: {greeting}\n"
-        result += f"- 显示时间戳: {'是' if show_timestamp else '否'}\n"
-        result += f"- 日志级别: {log_level}\n"
-        result += f"- 插件启用: {'是' if enabled else '否'}\n"
-        result += "\n配置读取成功!"
-
-        return result
+        return "\n".join((
+            "配置演示",
+            "",
+            "当前配置:",
+            f"- 问候信息: {config.greeting_message}",
+            f"- 显示时间戳: {'是' if config.show_timestamp else '否'}",
+            f"- 日志级别: {config.log_level}",
+            f"- 插件启用: {'是' if config.enabled else '否'}",
+            "",
+            "配置读取成功!",
+        ))
 
-    # Rich Demo 函数接口
-    def rich_code_execution_monitor(self) -> str:
-        """代码执行监控演示
+    def binary_demo(self) -> str:
+        """二进制工作进程演示
         
-        演示如何使用Rich库创建实时代码执行监控界面，包括代码高亮、日志输出和状态监控。
+        通过常驻工作进程向插件二进制发送请求，并在Rich Live面板中实时显示输出。
         
         Returns:
             str: 命令执行结果
         """
         try:
-            from demos.rich.code_execution_monitor import main
-            main()
-            return "代码执行监控演示完成"
+            result = self.plugin.binary_runner.request_live("hello from fastx tui".encode("utf-8"))
+            return f"工作进程返回: {result.decode('utf-8', errors='replace')}"
         except Exception as e:
             return f"演示失败: {str(e)}"
 
-    def rich_components_view(self) -> str:
-        """Rich组件演示
+    def plugin_performance(self) -> str:
+        """插件性能统计
         
-        演示Rich库的各种组件，包括面板、表格、树状结构、布局管理等。
+        以表格形式显示插件各生命周期阶段的耗时和内存变化，并导出为JSON文件。
         
         Returns:
-            str: 命令执行结果
+            str: 命令执行结果，包含JSON文件路径
         """
         try:
-            from demos.rich.components_view import main
-            main()
-            return "Rich组件演示完成"
-        except Exception as e:
-            return f"演示失败: {str(e)}"
+            from rich.console import Console
 
-    def rich_layout_nav(self) -> str:
-        """布局导航演示
-        
-        演示如何使用Rich库创建带路由功能的布局导航系统。
-        
-        Returns:
-            str: 命令执行结果
-        """
-        try:
-            from demos.rich.layout_nav import main
-            main()
-            return "布局导航演示完成"
+            stats = self.plugin.lifecycle_stats
+            Console().print(stats.render_table())
+            export_dir = self.plugin.plugin_path or tempfile.gettempdir()
+            path = stats.export_json(os.path.join(export_dir, "plugin_performance.json"))
+            return f"性能数据已导出: {path}"
         except Exception as e:
-            return f"演示失败: {str(e)}"
+            return f"导出性能数据失败: {str(e)}"
 
-    def rich_log_execution_monitor(self) -> str:
-        """日志执行监控
+    def command_latency(self) -> str:
+        """命令延迟统计
         
-        演示如何使用Rich库创建实时日志监控系统。
+        以表格形式显示每个命令的调用次数、错误次数和p50/p95/p99/最大延迟。
         
         Returns:
             str: 命令执行结果
         """
         try:
-            from demos.rich.log_execution_monitor import main
-            main()
-            return "日志执行监控演示完成"
-        except Exception as e:
-            return f"演示失败: {str(e)}"
+            from rich.console import Console
 
-    def rich_minimal_monitor_1(self) -> str:
-        """简约监控1
-        
-        演示使用Rich库的Status组件创建简约的任务监控。
-        
-        Returns:
-            str: 命令执行结果
-        """
-        try:
-            from demos.rich.minimal_monitor_1 import main
-            main()
-            return "简约监控1演示完成"
+            Console().print(self.plugin.command_metrics.render_table())
+            return "命令延迟统计显示完成"
         except Exception as e:
-            return f"演示失败: {str(e)}"
+            return f"显示命令延迟失败: {str(e)}"
 
-    def rich_minimal_monitor_2(self) -> str:
-        """简约监控2
+    def result_cache_stats(self) -> str:
+        """结果缓存统计
         
-        演示使用Rich库的Live组件创建实时更新的简约状态栏。
+        以表格形式显示每个缓存命令的命中、未命中次数和命中率，以及缓存容量和淘汰次数。
         
         Returns:
             str: 命令执行结果
         """
         try:
-            from demos.rich.minimal_monitor_2 import main
-            main()
-            return "简约监控2演示完成"
-        except Exception as e:
-            return f"演示失败: {str(e)}"
+            from rich.console import Console
 
-    def rich_monitor_dashboard(self) -> str:
-        """监控仪表板
-        
-        演示使用Rich库创建多面板的系统监控仪表板。
-        
-        Returns:
-            str: 命令执行结果
-        """
-        try:
-            from demos.rich.monitor_dashboard import main
-            main()
-            return "监控仪表板演示完成"
+            Console().print(self.plugin.result_cache.render_table())
+            return "结果缓存统计显示完成"
         except Exception as e:
-            return f"演示失败: {str(e)}"
+            return f"显示结果缓存失败: {str(e)}"
 
-    def rich_panel_table(self) -> str:
-        """面板表格示例
+    async def async_countdown(self, seconds: int = 5) -> str:
+        """异步命令演示
         
-        演示使用Rich库的Panel和Table组件创建脚本管理器界面。
+        每秒输出一次剩余时间的协程命令。通过命令执行器运行时不占用线程，
+        取消时在当前的await处立即结束。
+        
+        Args:
+            seconds: 倒计时秒数
         
         Returns:
             str: 命令执行结果
         """
-        try:
-            from demos.rich.panel_table import main
-            main()
-            return "面板表格示例演示完成"
-        except Exception as e:
-            return f"演示失败: {str(e)}"
+        import asyncio
+
+        for remaining in range(seconds, 0, -1):
+            print(f"异步命令剩余 {remaining} 秒...")
+            await asyncio.sleep(1)
+        return "异步命令执行完成"
 
-    def rich_parallel_progress(self) -> str:
-        """并行进度条
+    def cancel_commands(self) -> str:
+        """取消运行中的命令
         
-        演示使用Rich库创建多任务并行进度条系统。
+        取消通过命令执行器运行的其他所有命令，同步命令会在下一次检查取消状态时结束。
         
         Returns:
             str: 命令执行结果
         """
         try:
-            from demos.rich.parallel_progress import main
-            main()
-            return "并行进度条演示完成"
+            cancelled = self.plugin.command_executor.cancel_all()
+            return f"已取消 {cancelled} 个命令" if cancelled else "没有运行中的命令"
         except Exception as e:
-            return f"演示失败: {str(e)}"
+            return f"取消命令失败: {str(e)}"
 
     def cleanup(self):
         """清理业务逻辑资源
         
         清理业务逻辑使用的资源，并记录清理日志。
         """
+        if self.warmup:
+            self.warmup.cancel()
+            self.warmup = None
         self.plugin.log_info("示例插件业务逻辑清理完成")
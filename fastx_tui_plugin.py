@@ -4,16 +4,41 @@ FastX-Tui Example Plugin - 入口文件
 这个文件是插件的入口，包含插件的配置信息和基本结构
 业务逻辑请参考 example_business.py
 """
-import json
+import copy
 import os
-from typing import Any
-
-import toml
-from example_business import ExampleBusiness
+import threading
+from typing import TYPE_CHECKING, Any
 
 from core.menu_system import MenuSystem
 from core.plugin_manager import Plugin, PluginInfo
 
+from fastx_tui_plugin_example.command_metrics import CommandMetrics
+from fastx_tui_plugin_example.config_snapshot import ConfigSnapshot, ConfigSnapshotStore
+from fastx_tui_plugin_example.config_validator import CompiledSchema, SchemaCache
+from fastx_tui_plugin_example.manual_cache import ManualCache, ManualDocument
+from fastx_tui_plugin_example.plugin_commands import CommandSpec, register_menus
+from fastx_tui_plugin_example.plugin_metadata import PluginMetadata
+from fastx_tui_plugin_example.plugin_stats import PluginStats, timed_phase
+from fastx_tui_plugin_example.resource_manager import ResourceManager
+
+if TYPE_CHECKING:
+    from fastx_tui_plugin_example.binary_runner import BinaryRunner
+    from fastx_tui_plugin_example.command_executor import CommandExecutor
+    from fastx_tui_plugin_example.result_cache import ResultCache
+
+# 插件元数据缓存，pyproject.toml未变化时get_info()不再重复解析文件
+_METADATA = PluginMetadata(os.path.dirname(os.path.abspath(__file__)))
+
+# config_schema.json不存在或读取失败时使用的默认配置模式
+DEFAULT_CONFIG_SCHEMA = {
+    "enabled": {
+        "type": "boolean",
+        "default": True,
+        "description": "是否启用该插件",
+        "required": True
+    }
+}
+
 
 class ExamplePlugin(Plugin):
     """示例插件，演示如何使用FastX-Tui插件接口
@@ -35,32 +60,43 @@ class ExamplePlugin(Plugin):
         """初始化插件"""
         super().__init__()
         self.business = None
+        self.lifecycle_stats = PluginStats("示例插件")
+        self.command_metrics = CommandMetrics()
+        self._business_lock = threading.Lock()
+        self._resources = None
+        self._binary_runner = None
+        self._command_executor = None
+        self._result_cache = None
+        self._manual_cache = None
+        self._schema_cache = None
+        self._default_schema = None
+        # get_config由宿主程序在加载后动态替换，这里延迟到调用时再查找
+        self._config_store = ConfigSnapshotStore(
+            lambda name, default: self.get_config(name, default),
+            lambda: self.get_config_validator().defaults
+        )
 
     @classmethod
     def get_version(cls) -> str:
-        """从pyproject.toml获取当前版本号"""
-        try:
-            # 获取当前文件所在目录
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # 构建pyproject.toml的路径
-            pyproject_path = os.path.join(current_dir, "pyproject.toml")
-            # 读取文件
-            with open(pyproject_path, encoding="utf-8") as f:
-                data = toml.load(f)
-            # 返回版本号
-            return data["project"]["version"]
-        except Exception:
-            # 如果读取失败，返回默认版本
-            return "1.0.0"
+        """从pyproject.toml获取当前版本号
+
+        结果按pyproject.toml的修改时间缓存，文件不存在时使用构建时生成的版本号
+        """
+        return _METADATA.version
 
     def get_info(self) -> PluginInfo:
         """获取插件信息
 
         必须实现此方法，返回插件的详细信息
         """
+        return _METADATA.get_info(self._build_info)
+
+    @staticmethod
+    def _build_info(version: str) -> PluginInfo:
+        """构建插件信息，仅在元数据缓存失效时调用"""
         return PluginInfo(
             name="示例插件",
-            version=self.get_version(),
+            version=version,
             author="FastX Team",
             description="演示如何使用FastX-Tui插件接口，包括插件手册、配置管理和业务逻辑分离",
             category="工具",  # 插件分类
@@ -75,16 +111,52 @@ class ExamplePlugin(Plugin):
             downloads=0  # 下载次数
         )
 
+    @timed_phase("initialize")
     def initialize(self):
         """初始化插件
 
         必须实现此方法，用于初始化插件的资源、连接数据库等
+
+        启用lazy_init配置（默认）时只记录菜单元数据，业务对象及其依赖在第一次执行命令时才创建，
+        以缩短宿主程序的启动时间。
         """
-        # 初始化业务逻辑
-        self.business = ExampleBusiness(self)
-        self.business.initialize()
+        self._track_config_writes()
+        if not self.config_snapshot.lazy_init:
+            self._ensure_business()
         self.log_info("示例插件初始化完成")
 
+    @property
+    def config_snapshot(self) -> ConfigSnapshot:
+        """当前配置快照
+
+        命令代码直接读取快照属性，只有配置值变化时快照才会重建。通过set_config()写入的配置立即生效，
+        其他途径修改的配置在快照过期（约1秒）后的下一次读取时同步
+        """
+        return self._config_store.snapshot
+
+    def refresh_config(self) -> ConfigSnapshot:
+        """从宿主程序重新读取全部配置
+
+        配置不是通过set_config()修改时（例如直接编辑了配置文件），快照过期后会自动同步，
+        需要立即生效时调用此方法
+        """
+        return self._config_store.refresh()
+
+    def _track_config_writes(self):
+        """包装宿主程序注入的set_config，配置值变化时同步更新配置快照"""
+        host_set_config = self.set_config
+        if getattr(host_set_config, "_tracks_snapshot", False):
+            return
+
+        def set_config(config_name, value):
+            result = host_set_config(config_name, value)
+            self._config_store.update(config_name, value)
+            return result
+
+        set_config._tracks_snapshot = True
+        self.set_config = set_config
+
+    @timed_phase("cleanup")
     def cleanup(self):
         """清理插件资源
 
@@ -95,7 +167,22 @@ class ExamplePlugin(Plugin):
         if self.business:
             self.business.cleanup()
             self.business = None
+        # 释放命令结果缓存
+        if self._result_cache:
+            self._result_cache.clear()
+        # 释放资源缓存和mmap映射
+        if self._resources:
+            self._resources.clear()
+        # 关闭常驻的二进制工作进程
+        if self._binary_runner:
+            self._binary_runner.close()
+            self._binary_runner = None
+        # 取消仍在运行的命令
+        if self._command_executor:
+            self._command_executor.shutdown()
+            self._command_executor = None
 
+    @timed_phase("register")
     def register(self, menu_system: MenuSystem):
         """注册插件命令到菜单系统
 
@@ -104,13 +191,49 @@ class ExamplePlugin(Plugin):
         参数：
         - menu_system: 菜单系统实例，用于注册命令和菜单
         """
-        # 调用业务逻辑注册命令
-        self.business.register_commands(menu_system)
+        if self.business:
+            # 调用业务逻辑注册命令
+            self.business.register_commands(menu_system)
+        else:
+            # 延迟初始化模式：注册代理命令，第一次执行时再创建业务对象
+            register_menus(menu_system, self._deferred_command, self.command_metrics)
 
         # 更新主菜单计数
         self.main_menus_registered += 1
         self.main_menu_id = "example_plugin_menu"
 
+    def _ensure_business(self):
+        """获取业务逻辑对象，不存在时导入业务模块并完成初始化"""
+        business = self.business
+        if business is None:
+            with self._business_lock:
+                if self.business is None:
+                    with self.lifecycle_stats.measure("business_init"):
+                        from example_business import ExampleBusiness
+                        business = ExampleBusiness(self)
+                        business.initialize()
+                    self.business = business
+                business = self.business
+        return business
+
+    def _deferred_command(self, spec: CommandSpec):
+        """创建延迟初始化模式下的代理命令
+
+        参数：
+        - spec: 命令定义，handler为ExampleBusiness上的方法名
+        """
+        handler = spec.handler
+
+        if spec.is_async:
+            async def run(*args, **kwargs):
+                return await getattr(self._ensure_business(), handler)(*args, **kwargs)
+        else:
+            def run(*args, **kwargs):
+                return getattr(self._ensure_business(), handler)(*args, **kwargs)
+
+        run.__name__ = handler
+        return run
+
     def get_manual(self) -> str:
         """获取插件手册，返回Markdown格式的帮助内容
         
@@ -118,51 +241,76 @@ class ExamplePlugin(Plugin):
             str: Markdown格式的插件手册，从manual.md文件中读取
         """
         try:
-            # 获取插件目录路径
-            if self.plugin_path:
-                manual_path = os.path.join(self.plugin_path, "manual.md")
-                if os.path.exists(manual_path):
-                    with open(manual_path, encoding="utf-8") as f:
-                        return f.read()
+            document = self.get_manual_document()
+            if document is not None:
+                return document.text
             # 如果文件不存在或plugin_path未设置，返回默认内容
             return "# 插件手册\n\n该插件未提供帮助文档。"
         except Exception as e:
             self.log_error(f"读取插件手册失败: {e}")
             return "# 插件手册\n\n读取帮助文档失败。"
 
+    def get_manual_document(self) -> ManualDocument | None:
+        """获取解析后的插件手册
+
+        文档按manual.md的修改时间缓存，提供标题索引和分页渲染，供帮助界面直接跳转章节、按页显示。
+
+        Returns:
+            ManualDocument | None: 解析后的手册，文件不存在或plugin_path未设置时返回None
+        """
+        if not self.plugin_path:
+            return None
+        manual_path = os.path.join(self.plugin_path, "manual.md")
+        if self._manual_cache is None or self._manual_cache.manual_path != manual_path:
+            self._manual_cache = ManualCache(manual_path, read_text=self.resources.read_text)
+        return self._manual_cache.get()
+
     def get_config_schema(self) -> dict[str, Any]:
         """获取插件配置模式，从config_schema.json文件中读取
         
         Returns:
-            Dict[str, Any]: 配置项模式，包含配置名、类型、默认值、说明、可选值等
+            Dict[str, Any]: 配置项模式，包含配置名、类型、默认值、说明、可选值等，
+            每次返回新的副本，调用方修改它不会影响缓存的配置模式
+        """
+        return copy.deepcopy(self.get_config_validator().schema)
+
+    def get_config_validator(self) -> CompiledSchema:
+        """获取编译后的配置模式
+
+        配置模式按config_schema.json的修改时间缓存，配置界面可以用它反复校验修改的值，
+        每个配置项的校验只需要常数时间。
+
+        Returns:
+            CompiledSchema: 编译后的配置模式，提供validate()和validate_all()
         """
         try:
             # 获取插件目录路径
             if self.plugin_path:
                 config_schema_path = os.path.join(self.plugin_path, "config_schema.json")
-                if os.path.exists(config_schema_path):
-                    with open(config_schema_path, encoding="utf-8") as f:
-                        return json.load(f)
-            # 如果文件不存在或plugin_path未设置，返回默认配置
-            return {
-                "enabled": {
-                    "type": "boolean",
-                    "default": True,
-                    "description": "是否启用该插件",
-                    "required": True
-                }
-            }
+                if self._schema_cache is None or self._schema_cache.schema_path != config_schema_path:
+                    self._schema_cache = SchemaCache(config_schema_path, read_text=self.resources.read_text)
+                compiled = self._schema_cache.get()
+                if compiled is not None:
+                    return compiled
         except Exception as e:
             self.log_error(f"读取配置模式失败: {e}")
-            # 返回默认配置
-            return {
-                "enabled": {
-                    "type": "boolean",
-                    "default": True,
-                    "description": "是否启用该插件",
-                    "required": True
-                }
-            }
+        # 如果文件不存在或plugin_path未设置，返回默认配置
+        if self._default_schema is None:
+            self._default_schema = CompiledSchema(DEFAULT_CONFIG_SCHEMA)
+        return self._default_schema
+
+    @property
+    def resources(self) -> ResourceManager:
+        """插件资源管理器
+
+        按资源大小使用LRU缓存、mmap或流式读取，例如：
+        self.resources.read_text("example.txt")
+        manual.md和config_schema.json也通过它读取，cleanup()时释放缓存和mmap映射。
+        """
+        if self._resources is None:
+            # get_resource_path可能由宿主程序替换，这里延迟到调用时再查找
+            self._resources = ResourceManager(lambda name: self.get_resource_path(name))
+        return self._resources
 
     def get_binary_path(self) -> str:
         """获取插件二进制文件路径
@@ -171,3 +319,52 @@ class ExamplePlugin(Plugin):
         """
         # 示例：返回bin目录下的example_binary文件
         return self.get_resource_path("../bin/example_binary")
+
+    @property
+    def binary_runner(self) -> "BinaryRunner":
+        """插件二进制的常驻工作进程池
+
+        工作进程在第一次请求时启动，并发数由binary_pool_size配置项决定
+        """
+        if self._binary_runner is None:
+            # subprocess等模块导入较慢，用到时才导入
+            from fastx_tui_plugin_example.binary_runner import (
+                BinaryRunner,
+                binary_command,
+            )
+            self._binary_runner = BinaryRunner(
+                binary_command(self.get_binary_path()),
+                pool_size=self.config_snapshot.binary_pool_size,
+                cwd=self.plugin_path
+            )
+        return self._binary_runner
+
+    @property
+    def result_cache(self) -> "ResultCache":
+        """命令结果缓存
+
+        业务方法通过@config_cached加入缓存，配置快照版本号变化时缓存结果自动失效
+        """
+        if self._result_cache is None:
+            from fastx_tui_plugin_example.result_cache import ResultCache
+            self._result_cache = ResultCache()
+        return self._result_cache
+
+    @property
+    def command_executor(self) -> "CommandExecutor":
+        """插件命令的异步执行器
+
+        宿主程序在事件循环中通过它执行菜单命令，界面线程不会被长时间运行的命令阻塞，例如：
+        await plugin.command_executor.run(item.python_func, name=item.id)
+
+        最大并发数和默认超时时间由max_concurrent_commands和command_timeout配置项决定
+        """
+        if self._command_executor is None:
+            # asyncio导入较慢，用到时才导入
+            from fastx_tui_plugin_example.command_executor import CommandExecutor
+            config = self.config_snapshot
+            self._command_executor = CommandExecutor(
+                max_concurrent=config.max_concurrent_commands,
+                default_timeout=config.command_timeout or None
+            )
+        return self._command_executor
@@ -0,0 +1,11 @@
+"""
+示例插件的内部模块
+
+插件入口fastx_tui_plugin.py和业务逻辑example_business.py之外的模块都放在这个以插件命名的包中，
+宿主进程同时加载多个由本模板创建的插件时，各插件的同名模块不会在sys.modules中互相覆盖。
+基于本模板创建新插件时，请把这个包改为新插件的名称。
+"""
+from . import plugin_importer
+
+# 插件目录下的demos包以fastx_tui_plugin_example.demos导入
+plugin_importer.install()
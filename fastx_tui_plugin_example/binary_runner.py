@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+插件二进制工作进程
+
+该文件让插件二进制文件以常驻工作进程的方式运行，避免每次执行命令都重新创建进程：
+- 请求和响应通过stdin/stdout上带长度前缀的帧传输
+- 可配置并发数的工作进程池，工作进程按需启动
+- 每个请求单独设置超时，超时的工作进程会被终止并在下次使用时重启
+- 工作进程崩溃后自动重启
+- 工作进程输出的OUTPUT帧可以实时显示在Rich Live面板中
+
+帧格式：1字节类型 + 4字节大端长度 + 负载
+"""
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+FRAME_HEADER = struct.Struct(">BI")
+
+# 帧类型
+FRAME_REQUEST = 1  # 插件 -> 工作进程：请求
+FRAME_OUTPUT = 2  # 工作进程 -> 插件：执行过程中的输出
+FRAME_RESULT = 3  # 工作进程 -> 插件：请求执行成功
+FRAME_ERROR = 4  # 工作进程 -> 插件：请求执行失败
+
+DEFAULT_TIMEOUT = 30.0
+
+
+class BinaryRunnerError(RuntimeError):
+    """工作进程执行请求失败"""
+
+
+class WorkerCrashedError(BinaryRunnerError):
+    """工作进程在执行请求时退出"""
+
+
+def write_frame(stream, kind: int, payload: bytes) -> None:
+    """写入一帧数据"""
+    stream.write(FRAME_HEADER.pack(kind, len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+
+def read_exact(stream, size: int) -> bytes | None:
+    """读取恰好size字节，流在读满之前结束时返回None
+
+    管道上的无缓冲读取一次可能只返回一部分数据（通常最多64KB），需要循环读取直到读满。
+    """
+    chunks = []
+    received = 0
+    while received < size:
+        data = stream.read(size - received)
+        if not data:
+            return None
+        chunks.append(data)
+        received += len(data)
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+def read_frame(stream) -> tuple[int, bytes] | None:
+    """读取一帧数据，流结束时返回None"""
+    header = read_exact(stream, FRAME_HEADER.size)
+    if header is None:
+        return None
+    kind, length = FRAME_HEADER.unpack(header)
+    payload = read_exact(stream, length)
+    if payload is None:
+        return None
+    return kind, payload
+
+
+def binary_command(binary_path: str) -> list[str]:
+    """构建启动二进制文件的命令
+
+    以Python shebang开头的脚本使用当前解释器运行，便于在没有执行权限的平台上使用替身脚本。
+    """
+    try:
+        with open(binary_path, "rb") as f:
+            first_line = f.readline(128)
+    except OSError:
+        first_line = b""
+    if first_line.startswith(b"#!") and b"python" in first_line:
+        return [sys.executable, binary_path]
+    return [binary_path]
+
+
+class _Worker:
+    """单个常驻工作进程"""
+
+    def __init__(self, command: list[str], cwd: str | None):
+        self.process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        self.frames = queue.SimpleQueue()
+        # 后台线程持续读取stdout，请求线程可以带超时地等待响应
+        self.reader = threading.Thread(target=self._read_loop, daemon=True)
+        self.reader.start()
+
+    def _read_loop(self):
+        """读取工作进程输出的帧，进程退出时放入None"""
+        stdout = self.process.stdout
+        while True:
+            frame = read_frame(stdout)
+            self.frames.put(frame)
+            if frame is None:
+                break
+
+    @property
+    def alive(self) -> bool:
+        """工作进程是否仍在运行"""
+        return self.process.poll() is None
+
+    def request(self, payload: bytes, timeout: float, on_output: Callable[[bytes], None] | None) -> bytes:
+        """发送请求并等待结果"""
+        try:
+            write_frame(self.process.stdin, FRAME_REQUEST, payload)
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerCrashedError(f"工作进程已退出: {e}") from e
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"请求超过 {timeout:.1f} 秒未完成")
+            try:
+                frame = self.frames.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if frame is None:
+                raise WorkerCrashedError(f"工作进程意外退出，退出码: {self._reap()}")
+
+            kind, data = frame
+            if kind == FRAME_OUTPUT:
+                if on_output:
+                    on_output(data)
+            elif kind == FRAME_RESULT:
+                return data
+            elif kind == FRAME_ERROR:
+                raise BinaryRunnerError(data.decode("utf-8", errors="replace"))
+
+    def _reap(self) -> int:
+        """输出流已经结束，回收工作进程并返回退出码
+
+        输出流也可能因为帧不完整而结束，此时进程仍在运行，短暂等待后直接终止，不会无限期等待。
+        """
+        try:
+            return self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            return self.process.wait()
+
+    def stop(self):
+        """关闭工作进程"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+
+
+class BinaryRunner:
+    """常驻工作进程池"""
+
+    def __init__(self,
+                 command: list[str],
+                 pool_size: int = 2,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 cwd: str | None = None):
+        """初始化工作进程池
+
+        Args:
+            command: 启动工作进程的命令
+            pool_size: 最大并发工作进程数
+            timeout: 默认请求超时时间（秒）
+            cwd: 工作进程的工作目录
+        """
+        self.command = command
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.cwd = cwd
+        self.restarts = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._closed = False
+
+    def _acquire(self, timeout: float) -> _Worker:
+        """获取一个空闲的工作进程，必要时启动新进程"""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"等待空闲工作进程超过 {timeout:.1f} 秒")
+        try:
+            while True:
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._spawn()
+                if worker.alive:
+                    return worker
+                # 空闲期间崩溃的工作进程直接丢弃
+                self._discard(worker, crashed=True)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _spawn(self) -> _Worker:
+        """启动新的工作进程"""
+        with self._lock:
+            if self._closed:
+                raise BinaryRunnerError("工作进程池已关闭")
+            worker = _Worker(self.command, self.cwd)
+            self._workers.add(worker)
+            return worker
+
+    def _discard(self, worker: _Worker, crashed: bool):
+        """停止并移除工作进程，下一次请求时会启动新进程替代它"""
+        with self._lock:
+            self._workers.discard(worker)
+            if crashed:
+                self.restarts += 1
+        worker.stop()
+
+    def request(self,
+                payload: bytes,
+                timeout: float | None = None,
+                on_output: Callable[[bytes], None] | None = None) -> bytes:
+        """向工作进程发送请求
+
+        Args:
+            payload: 请求负载
+            timeout: 请求超时时间（秒），默认使用初始化时的设置
+            on_output: 接收OUTPUT帧的回调函数
+
+        Returns:
+            bytes: 工作进程返回的结果
+
+        Raises:
+            TimeoutError: 等待工作进程或请求执行超时
+            WorkerCrashedError: 工作进程在执行请求时退出
+            BinaryRunnerError: 工作进程返回错误
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        worker = self._acquire(timeout)
+        try:
+            result = worker.request(payload, timeout - (time.monotonic() - started), on_output)
+        except WorkerCrashedError:
+            self._discard(worker, crashed=True)
+            self._slots.release()
+            raise
+        except BinaryRunnerError:
+            # 工作进程返回了完整的错误帧，本次交互已经结束，可以继续使用
+            self._idle.put(worker)
+            self._slots.release()
+            raise
+        except BaseException:
+            # 超时、on_output抛出异常或Ctrl+C时请求还在进行，后续的帧仍会到达，
+            # 放回池中会让下一个请求读到本次的结果，与崩溃的工作进程一样直接替换
+            self._discard(worker, crashed=False)
+            self._slots.release()
+            raise
+        self._idle.put(worker)
+        self._slots.release()
+        return result
+
+    def request_live(self, payload: bytes, title: str = "二进制输出", timeout: float | None = None) -> bytes:
+        """发送请求，并在Rich Live面板中实时显示工作进程的输出"""
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.text import Text
+
+        output = Text()
+
+        def render():
+            return Panel(output, title=f"[bold]{title}[/bold]", border_style="cyan", padding=(0, 1))
+
+        with Live(render(), refresh_per_second=10) as live:
+            def on_output(data: bytes):
+                output.append(data.decode("utf-8", errors="replace"))
+                live.update(render())
+
+            return self.request(payload, timeout=timeout, on_output=on_output)
+
+    @property
+    def worker_count(self) -> int:
+        """当前运行中的工作进程数"""
+        return len(self._workers)
+
+    def close(self) -> None:
+        """关闭所有工作进程"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+
+def main():
+    """直接运行时启动插件自带的替身二进制并发送一个请求"""
+    plugin_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runner = BinaryRunner(binary_command(os.path.join(plugin_dir, "bin", "example_binary")), cwd=plugin_dir)
+    text = " ".join(sys.argv[1:]) or "hello from fastx"
+    try:
+        print(runner.request_live(text.encode("utf-8")).decode("utf-8"))
+    finally:
+        runner.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+非阻塞命令执行
+
+该文件让插件命令可以在不阻塞界面线程的情况下执行：
+- 每个命令在单独的任务中运行，取消命令只取消这个任务，不影响等待它的调用方任务
+- 协程命令（async def）直接在事件循环中运行
+- 同步命令放到线程池中运行
+- 支持超时、取消（Ctrl+C或菜单操作）和最大并发数限制
+
+线程无法被强制终止，同步命令的取消是协作式的：命令可以调用check_cancelled()或cancellable_sleep()，
+在取消后尽快退出；不检查取消状态的命令会继续在后台线程中运行到结束，但等待它的界面会立即返回。
+"""
+import asyncio
+import contextvars
+import inspect
+import signal
+import threading
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+DEFAULT_MAX_CONCURRENT = 4
+
+
+class CommandCancelled(Exception):
+    """命令被取消"""
+
+
+class CancelToken:
+    """协作式取消标记"""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """请求取消"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """等待取消请求，返回是否已取消"""
+        return self._event.wait(timeout)
+
+
+# 当前线程中正在执行的同步命令的取消标记
+_current_token = contextvars.ContextVar("fastx_command_cancel_token", default=None)
+
+
+def check_cancelled() -> None:
+    """在同步命令中检查是否已被取消
+
+    Raises:
+        CommandCancelled: 命令已被取消
+    """
+    token = _current_token.get()
+    if token is not None and token.cancelled:
+        raise CommandCancelled("命令已取消")
+
+
+def cancellable_sleep(seconds: float) -> None:
+    """可被取消的sleep，用于替代同步命令中的time.sleep
+
+    Raises:
+        CommandCancelled: 等待期间命令被取消
+    """
+    token = _current_token.get()
+    if token is None:
+        threading.Event().wait(seconds)
+    elif token.wait(seconds):
+        raise CommandCancelled("命令已取消")
+
+
+def _coroutine_target(func: Callable) -> Callable | None:
+    """沿__wrapped__链查找协程函数，不存在时返回None"""
+    target = inspect.unwrap(func, stop=inspect.iscoroutinefunction)
+    return target if inspect.iscoroutinefunction(target) else None
+
+
+def _caller_cancelling() -> bool:
+    """当前任务自身是否正在被取消（Python 3.11之前无法区分，视为没有）"""
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)
+    return bool(cancelling()) if cancelling is not None else False
+
+
+class _RunningCommand:
+    """正在执行的命令"""
+
+    __slots__ = ("name", "token", "task", "loop", "cancel_requested")
+
+    def __init__(self, name: str, token: CancelToken, task: asyncio.Task):
+        self.name = name
+        self.token = token
+        # 命令自己的任务，不是调用run()的任务
+        self.task = task
+        self.loop = task.get_loop()
+        self.cancel_requested = False
+
+    def cancel(self) -> None:
+        """请求取消命令，可以从任意线程调用，命令已经结束时不做任何事"""
+        if self.task.done():
+            return
+        self.cancel_requested = True
+        self.token.cancel()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            self.task.cancel()
+        elif not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self._cancel_task)
+            except RuntimeError:
+                # 事件循环在检查后关闭
+                pass
+
+    def _cancel_task(self) -> None:
+        # 从其他线程请求到事件循环执行之间命令可能已经结束
+        if not self.task.done():
+            self.task.cancel()
+
+    def is_caller(self) -> bool:
+        """当前代码是否就在这个命令中执行"""
+        if _current_token.get() is self.token:
+            return True
+        try:
+            return asyncio.current_task() is self.task
+        except RuntimeError:
+            return False
+
+
+class CommandExecutor:
+    """异步命令执行器"""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, default_timeout: float | None = None):
+        """初始化命令执行器
+
+        Args:
+            max_concurrent: 同时执行的最大命令数
+            default_timeout: 默认超时时间（秒），None表示不限制
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.default_timeout = default_timeout
+        # 事件循环 -> 信号量，asyncio.Semaphore会绑定到第一次使用它的事件循环，每个事件循环单独创建
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._pool = None
+        self._running = {}
+
+    @property
+    def running(self) -> list[str]:
+        """正在执行的命令名称"""
+        return [command.name for command in self._running.values()]
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """获取同步命令使用的线程池，第一次使用时创建"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="fastx-command")
+        return self._pool
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取当前事件循环的并发限制信号量，第一次使用时创建"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent)
+        return semaphore
+
+    @staticmethod
+    def _call_sync(token: CancelToken, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """在线程池中执行同步命令"""
+        reset = _current_token.set(token)
+        try:
+            if token.cancelled:
+                raise CommandCancelled("命令已取消")
+            return func(*args, **kwargs)
+        finally:
+            _current_token.reset(reset)
+
+    async def run(self, func: Callable, *args, timeout: float | None = None, name: str | None = None,
+                  **kwargs) -> Any:
+        """执行命令
+
+        命令在单独的任务中执行；调用方的任务被取消时，命令也会被取消。
+
+        Args:
+            func: 命令可调用对象，可以是协程函数、plugin_commands.sync_entry包装的协程函数或普通函数
+            timeout: 超时时间（秒），默认使用初始化时的设置
+            name: 命令名称，用于按名称取消
+
+        Returns:
+            Any: 命令返回值
+
+        Raises:
+            TimeoutError: 命令执行超时
+            CommandCancelled: 命令被cancel()或cancel_all()取消
+            asyncio.CancelledError: 调用方的任务被取消
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        name = name or getattr(func, "__name__", repr(func))
+        token = CancelToken()
+        task = asyncio.ensure_future(self._execute(self._get_semaphore(), token, name, func, args, kwargs, timeout))
+        command = _RunningCommand(name, token, task)
+        key = id(command)
+        self._running[key] = command
+        try:
+            return await task
+        except asyncio.CancelledError:
+            token.cancel()
+            # 只有命令自己的任务被取消、调用方没有被取消时，转换为普通异常，不让调用方误以为自己被取消
+            if command.cancel_requested and task.cancelled() and not _caller_cancelling():
+                raise CommandCancelled(f"命令 {name} 已取消") from None
+            raise
+        finally:
+            del self._running[key]
+
+    async def _execute(self, semaphore: asyncio.Semaphore, token: CancelToken, name: str, func: Callable,
+                       args: tuple, kwargs: dict, timeout: float | None) -> Any:
+        """在命令自己的任务中执行命令"""
+        async with semaphore:
+            coroutine_func = _coroutine_target(func)
+            if coroutine_func is not None:
+                awaitable = coroutine_func(*args, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                awaitable = loop.run_in_executor(self._get_pool(), self._call_sync, token, func, args, kwargs)
+            try:
+                return await asyncio.wait_for(awaitable, timeout)
+            except asyncio.TimeoutError:
+                token.cancel()
+                raise TimeoutError(f"命令 {name} 超过 {timeout} 秒未完成") from None
+            except asyncio.CancelledError:
+                token.cancel()
+                raise
+
+    def cancel(self, name: str) -> int:
+        """取消指定名称的所有命令，返回取消的数量"""
+        commands = [command for command in list(self._running.values()) if command.name == name]
+        for command in commands:
+            command.cancel()
+        return len(commands)
+
+    def cancel_all(self) -> int:
+        """取消除调用者自身以外的所有命令，返回取消的数量
+
+        可以在菜单命令（无论同步还是协程命令）或信号处理函数中调用。
+        """
+        commands = [command for command in list(self._running.values()) if not command.is_caller()]
+        for command in commands:
+            command.cancel()
+        return len(commands)
+
+    def install_sigint_handler(self) -> bool:
+        """让Ctrl+C取消正在执行的命令而不是中断整个程序
+
+        需要在事件循环中调用；Windows不支持add_signal_handler，此时返回False。
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.cancel_all)
+            return True
+        except (NotImplementedError, RuntimeError):
+            return False
+
+    def shutdown(self) -> None:
+        """取消所有命令并关闭线程池，不等待仍在运行的同步命令"""
+        self.cancel_all()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,113 @@
+"""
+插件配置快照
+
+该文件提供不可变的配置快照，命令代码直接读取快照属性，不必每次执行都经过宿主程序的get_config()。
+快照由配置模式默认值和已保存的配置值构建，只有配置值真正变化时才会重建并递增版本号。
+通过插件的set_config()写入的配置立即生效；其他途径的修改（宿主程序的配置界面、直接编辑配置文件等）
+在快照超过max_age秒后的下一次读取时重新核对，最多延迟max_age秒生效。
+"""
+import dataclasses
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """插件配置快照"""
+    version: int
+    enabled: bool = True
+    greeting_message: str = "Hello from Example Plugin!"
+    show_timestamp: bool = True
+    log_level: str = "INFO"
+    lazy_init: bool = True
+    binary_pool_size: int = 2
+    warmup_demos: bool = False
+    max_concurrent_commands: int = 4
+    command_timeout: float = 0.0
+
+
+# 快照中的配置项及其内置默认值（不含版本号）
+_FIELD_DEFAULTS = {field.name: field.default for field in dataclasses.fields(ConfigSnapshot) if field.name != "version"}
+CONFIG_FIELDS = tuple(_FIELD_DEFAULTS)
+
+# 快照的默认有效期（秒），超过后读取时重新核对宿主程序中的配置
+DEFAULT_MAX_AGE = 1.0
+
+
+class ConfigSnapshotStore:
+    """配置快照管理
+
+    读取快照只是一次属性访问和一次时钟比较；写入时在锁内比较新旧值，值未变化时保持原快照和版本号不变。
+    快照过期后重新读取全部配置核对，配置未变化时仍然返回原快照，版本号不变。
+    """
+
+    def __init__(self, get_config: Callable[[str, Any], Any], defaults: Callable[[], dict[str, Any]],
+                 max_age: float = DEFAULT_MAX_AGE):
+        """初始化配置快照管理
+
+        Args:
+            get_config: 读取已保存配置的函数，签名与Plugin.get_config相同
+            defaults: 返回配置模式默认值的函数，仅在构建快照时调用
+            max_age: 快照的有效期（秒），超过后读取时重新核对配置，0表示每次读取都核对
+        """
+        self._get_config = get_config
+        self._defaults = defaults
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._expires = 0.0
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """当前配置快照，第一次访问或快照过期时重新读取配置"""
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() >= self._expires:
+            snapshot = self.refresh()
+        return snapshot
+
+    def invalidate(self) -> None:
+        """使快照过期，下一次读取时重新核对配置"""
+        self._expires = 0.0
+
+    def refresh(self) -> ConfigSnapshot:
+        """从宿主程序重新读取全部配置并构建快照
+
+        快照过期时自动调用；配置不是通过set_config()修改时（例如直接修改了配置文件），也可以调用此方法立即同步。
+        """
+        # 先更新有效期，核对期间的并发读取直接使用原快照
+        self._expires = time.monotonic() + self.max_age
+        defaults = self._defaults()
+        values = {}
+        for name, default in _FIELD_DEFAULTS.items():
+            values[name] = self._get_config(name, defaults.get(name, default))
+
+        with self._lock:
+            previous = self._snapshot
+            if previous is not None and all(getattr(previous, name) == value for name, value in values.items()):
+                return previous
+            version = previous.version + 1 if previous is not None else 1
+            self._snapshot = ConfigSnapshot(version=version, **values)
+            return self._snapshot
+
+    def update(self, name: str, value: Any) -> ConfigSnapshot:
+        """记录一次配置写入
+
+        Args:
+            name: 配置项名称
+            value: 新的配置值
+
+        Returns:
+            ConfigSnapshot: 写入后的快照，值未变化或不是快照中的配置项时返回原快照
+        """
+        current = self.snapshot
+        if name not in _FIELD_DEFAULTS or getattr(current, name) == value:
+            return current
+        with self._lock:
+            snapshot = self._snapshot
+            if getattr(snapshot, name) != value:
+                snapshot = dataclasses.replace(snapshot, version=snapshot.version + 1, **{name: value})
+                self._snapshot = snapshot
+        return snapshot
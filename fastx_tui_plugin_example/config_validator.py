@@ -0,0 +1,164 @@
+"""
+插件配置模式校验
+
+该文件将config_schema.json编译为校验器对象：类型检查、可选值集合和取值范围都在加载时预先计算，
+校验单个配置项只需要一次字典查找和几次比较。编译结果按文件修改时间缓存。
+"""
+import json
+import os
+from collections.abc import Callable
+from typing import Any
+
+# 配置类型到Python类型的映射
+TYPE_MAP = {
+    "string": (str,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+}
+
+
+class ConfigValidationError(ValueError):
+    """配置值不符合配置模式"""
+
+    def __init__(self, name: str, message: str):
+        super().__init__(f"{name}: {message}")
+        self.name = name
+        self.message = message
+
+
+class FieldValidator:
+    """单个配置项的校验器"""
+
+    __slots__ = ("name", "type_name", "types", "reject_bool", "choices", "minimum", "maximum", "required", "default")
+
+    def __init__(self, name: str, spec: dict[str, Any]):
+        """根据配置项定义预先计算校验规则
+
+        Args:
+            name: 配置项名称
+            spec: 配置项定义，包含type、default、choices、min、max等字段
+        """
+        self.name = name
+        self.type_name = spec.get("type")
+        self.types = TYPE_MAP.get(self.type_name)
+        # bool 是 int 的子类，数值类型需要单独排除
+        self.reject_bool = self.type_name in ("integer", "number")
+        choices = spec.get("choices")
+        try:
+            self.choices = frozenset(choices) if choices is not None else None
+        except TypeError:
+            # 不可哈希的可选值只能线性比较
+            self.choices = tuple(choices)
+        self.minimum = spec.get("min")
+        self.maximum = spec.get("max")
+        self.required = bool(spec.get("required", False))
+        self.default = spec.get("default")
+
+    def check(self, value: Any) -> str | None:
+        """校验配置值
+
+        Returns:
+            str | None: 错误信息，校验通过时返回None
+        """
+        if self.types is not None:
+            if not isinstance(value, self.types) or (self.reject_bool and isinstance(value, bool)):
+                return f"类型应为{self.type_name}，实际为{type(value).__name__}"
+        if self.choices is not None and value not in self.choices:
+            return f"取值应为{sorted(self.choices, key=str)}之一"
+        if self.minimum is not None and value < self.minimum:
+            return f"不能小于{self.minimum}"
+        if self.maximum is not None and value > self.maximum:
+            return f"不能大于{self.maximum}"
+        return None
+
+
+class CompiledSchema:
+    """编译后的配置模式"""
+
+    def __init__(self, schema: dict[str, dict[str, Any]]):
+        """编译配置模式
+
+        Args:
+            schema: get_config_schema()格式的配置模式
+        """
+        self.schema = schema
+        self.fields = {name: FieldValidator(name, spec) for name, spec in schema.items()}
+        self.defaults = {name: field.default for name, field in self.fields.items()}
+        self.required = frozenset(name for name, field in self.fields.items() if field.required)
+
+    def validate(self, name: str, value: Any) -> None:
+        """校验单个配置项
+
+        Raises:
+            ConfigValidationError: 配置项不存在或取值不合法
+        """
+        field = self.fields.get(name)
+        if field is None:
+            raise ConfigValidationError(name, "未知配置项")
+        error = field.check(value)
+        if error is not None:
+            raise ConfigValidationError(name, error)
+
+    def validate_all(self, values: dict[str, Any]) -> dict[str, str]:
+        """校验一组配置
+
+        Args:
+            values: 配置项名称到取值的映射
+
+        Returns:
+            dict[str, str]: 配置项名称到错误信息的映射，全部通过时为空字典
+        """
+        errors = {}
+        fields = self.fields
+        for name, value in values.items():
+            field = fields.get(name)
+            if field is None:
+                errors[name] = "未知配置项"
+                continue
+            error = field.check(value)
+            if error is not None:
+                errors[name] = error
+        for name in self.required.difference(values):
+            errors[name] = "缺少必填配置项"
+        return errors
+
+
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+class SchemaCache:
+    """按文件修改时间缓存的配置模式"""
+
+    def __init__(self, schema_path: str, read_text: Callable[[str], str] | None = None):
+        """初始化配置模式缓存
+
+        Args:
+            schema_path: config_schema.json文件路径
+            read_text: 按路径读取文本的函数，插件传入ResourceManager.read_text，默认直接读取文件
+        """
+        self.schema_path = schema_path
+        self.read_text = read_text or _read_file
+        self._stamp = None
+        self._compiled = None
+
+    def get(self) -> CompiledSchema | None:
+        """获取编译后的配置模式，文件不存在时返回None
+
+        Raises:
+            OSError: 读取文件失败
+            ValueError: 文件不是合法的JSON
+        """
+        try:
+            stat = os.stat(self.schema_path)
+        except FileNotFoundError:
+            self._stamp = self._compiled = None
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp or self._compiled is None:
+            self._compiled = CompiledSchema(json.loads(self.read_text(self.schema_path)))
+            self._stamp = stamp
+        return self._compiled
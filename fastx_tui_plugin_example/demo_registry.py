@@ -0,0 +1,62 @@
+"""
+演示命令注册表
+
+演示命令以 "模块:函数" 字符串声明，第一次执行时才通过importlib导入，解析结果按目标字符串缓存，
+之后的调用不再经过导入锁和sys.modules查找。注册命令时不会导入任何演示模块。
+
+模块名以 "." 开头时相对于本插件包：插件目录下的demos包由plugin_importer以本插件包的子包名称导入，
+".demos.rich.panel_table:main" 导入的是fastx_tui_plugin_example.demos.rich.panel_table，
+不需要把插件目录加入sys.path，也不占用全局的demos名称。
+"""
+import importlib
+from collections.abc import Callable
+
+# 目标字符串 -> 已解析的可调用对象，插件重新注册命令时可以复用
+_resolved = {}
+
+
+def resolve_target(target: str) -> Callable:
+    """解析 "模块:函数" 形式的目标，函数名省略时默认为main，模块名以 "." 开头时相对于本插件包
+
+    Raises:
+        ImportError: 模块无法导入
+        AttributeError: 模块中不存在该函数
+    """
+    func = _resolved.get(target)
+    if func is None:
+        module_name, _, attr = target.partition(":")
+        func = getattr(importlib.import_module(module_name, __package__), attr or "main")
+        _resolved[target] = func
+    return func
+
+
+class DemoCommand:
+    """延迟导入的演示命令"""
+
+    __slots__ = ("target", "label", "_func")
+
+    def __init__(self, target: str, label: str):
+        """创建演示命令
+
+        Args:
+            target: "模块:函数" 形式的演示入口
+            label: 演示名称，用于生成执行结果
+        """
+        self.target = target
+        self.label = label if label.endswith("演示") else f"{label}演示"
+        self._func = None
+
+    def __call__(self) -> str:
+        """运行演示
+
+        Returns:
+            str: 命令执行结果
+        """
+        try:
+            func = self._func
+            if func is None:
+                func = self._func = resolve_target(self.target)
+            func()
+            return f"{self.label}完成"
+        except Exception as e:
+            return f"演示失败: {str(e)}"
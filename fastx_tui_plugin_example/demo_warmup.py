@@ -0,0 +1,97 @@
+"""
+演示模块后台预热
+
+Rich演示第一次运行时需要导入rich.layout、rich.live、rich.syntax（以及Pygments词法分析器）、rich.progress等模块，
+这些耗时都落在用户点击命令的时刻。预热在后台守护线程中提前导入演示模块、创建开销较大的对象，
+线程以低优先级运行，每完成一步都主动让出CPU，并且可以随时取消。
+"""
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+from .demo_registry import resolve_target
+
+
+def warm_lexers() -> None:
+    """预先创建演示中用到的Pygments词法分析器并完成一次高亮"""
+    from pygments.lexers import JsonLexer, PythonLexer
+    from rich.syntax import Syntax
+
+    PythonLexer()
+    JsonLexer()
+    code = "def main():\n    return {'ok': True}\n"
+    Syntax(code, "python").highlight(code)
+
+
+class DemoWarmup:
+    """演示模块后台预热"""
+
+    def __init__(self, targets: Iterable[str], on_done: Callable[["DemoWarmup"], None] | None = None):
+        """初始化预热任务
+
+        Args:
+            targets: 需要预热的 "模块:函数" 演示入口
+            on_done: 预热结束（完成或取消）后在预热线程中调用的回调
+        """
+        self.steps = [(target, lambda target=target: resolve_target(target)) for target in targets]
+        self.steps.append(("pygments.lexers", warm_lexers))
+        self.on_done = on_done
+        self.timings = {}  # 步骤名称 -> 耗时（纳秒），即首次执行时节省的时间
+        self.failures = {}  # 步骤名称 -> 错误信息
+        self.cancelled = False
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """启动预热线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="demo-warmup", daemon=True)
+            self._thread.start()
+
+    def cancel(self, timeout: float = 1.0) -> None:
+        """取消预热并等待线程结束
+
+        正在进行的导入无法中断，线程会在当前步骤完成后退出。
+        """
+        self._cancel.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def done(self) -> bool:
+        """预热是否已经结束"""
+        return self._thread is not None and not self._thread.is_alive()
+
+    @property
+    def saved_ns(self) -> int:
+        """预热完成的步骤总耗时，即首次执行演示时节省的时间"""
+        return sum(self.timings.values())
+
+    @staticmethod
+    def _lower_priority() -> None:
+        """降低预热线程的调度优先级（仅Linux支持按线程设置）"""
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+    def _run(self) -> None:
+        """依次执行预热步骤"""
+        self._lower_priority()
+        try:
+            for name, step in self.steps:
+                if self._cancel.is_set():
+                    self.cancelled = True
+                    break
+                start = time.perf_counter_ns()
+                try:
+                    step()
+                    self.timings[name] = time.perf_counter_ns() - start
+                except Exception as e:
+                    self.failures[name] = str(e)
+                # 让出CPU，避免与界面线程争抢GIL
+                time.sleep(0.005)
+        finally:
+            if self.on_done:
+                self.on_done(self)
@@ -0,0 +1,155 @@
+"""
+插件手册缓存
+
+该文件负责缓存解析后的manual.md，避免每次打开帮助界面都重新读取和解析文件：
+- 按文件修改时间缓存文档，文件未变化时直接复用
+- 建立标题索引，查看器可以直接跳转到指定章节
+- 按块（段落、表格、代码块）切分页面，只在页面第一次显示时才构建Rich渲染对象
+"""
+import bisect
+import os
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+DEFAULT_PAGE_LINES = 120
+
+
+class Heading(NamedTuple):
+    """手册标题"""
+    level: int
+    title: str
+    line: int  # 标题所在行号（从0开始）
+    page: int  # 标题所在页码（从0开始）
+
+
+class ManualDocument:
+    """解析后的手册文档
+
+    解析时只做一次线性扫描，记录标题和页面边界；页面的Rich渲染对象按需构建并缓存。
+    """
+
+    def __init__(self, text: str, page_lines: int = DEFAULT_PAGE_LINES):
+        """解析手册文本
+
+        Args:
+            text: Markdown格式的手册内容
+            page_lines: 每页的目标行数，单个块超过该行数时不会被拆开
+        """
+        self.text = text
+        self.lines = text.splitlines()
+        self.page_starts = []
+        self.headings = []
+        self._rendered = {}
+        self._parse(max(1, page_lines))
+        self._by_title = {heading.title: heading for heading in self.headings}
+
+    def _parse(self, page_lines: int) -> None:
+        """扫描文档，确定页面边界和标题位置"""
+        in_fence = False
+        page_start = 0
+        block_start = 0
+        self.page_starts.append(0)
+
+        for index, line in enumerate(self.lines):
+            stripped = line.lstrip()
+            if stripped.startswith(("```", "~~~")):
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+
+            # 标题和空行之后都是可以分页的块边界
+            is_heading = stripped.startswith("#")
+            if is_heading or not stripped:
+                boundary = index if is_heading else index + 1
+                if boundary - page_start >= page_lines and block_start > page_start:
+                    page_start = block_start
+                    self.page_starts.append(page_start)
+                block_start = boundary
+
+            if is_heading:
+                level = len(stripped) - len(stripped.lstrip("#"))
+                title = stripped[level:].strip()
+                if title:
+                    self.headings.append(Heading(level, title, index, len(self.page_starts) - 1))
+
+    @property
+    def page_count(self) -> int:
+        """页面数量"""
+        return len(self.page_starts)
+
+    def page_of(self, line: int) -> int:
+        """获取指定行所在的页码"""
+        return max(0, bisect.bisect_right(self.page_starts, line) - 1)
+
+    def page_text(self, page: int) -> str:
+        """获取指定页面的Markdown文本"""
+        start = self.page_starts[page]
+        end = self.page_starts[page + 1] if page + 1 < self.page_count else len(self.lines)
+        return "\n".join(self.lines[start:end])
+
+    def find_heading(self, title: str) -> Heading | None:
+        """根据标题文本查找章节"""
+        return self._by_title.get(title)
+
+    def section_text(self, title: str) -> str | None:
+        """获取指定章节的Markdown文本，包含所有下级章节"""
+        heading = self._by_title.get(title)
+        if heading is None:
+            return None
+        end = len(self.lines)
+        for other in self.headings[self.headings.index(heading) + 1:]:
+            if other.level <= heading.level:
+                end = other.line
+                break
+        return "\n".join(self.lines[heading.line:end])
+
+    def render_page(self, page: int) -> Any:
+        """获取指定页面的Rich渲染对象，第一次访问时才构建"""
+        renderable = self._rendered.get(page)
+        if renderable is None:
+            from rich.markdown import Markdown
+            renderable = self._rendered[page] = Markdown(self.page_text(page))
+        return renderable
+
+
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+class ManualCache:
+    """按文件修改时间缓存的手册"""
+
+    def __init__(self, manual_path: str, page_lines: int = DEFAULT_PAGE_LINES,
+                 read_text: Callable[[str], str] | None = None):
+        """初始化手册缓存
+
+        Args:
+            manual_path: manual.md文件路径
+            page_lines: 每页的目标行数
+            read_text: 按路径读取文本的函数，插件传入ResourceManager.read_text，默认直接读取文件
+        """
+        self.manual_path = manual_path
+        self.page_lines = page_lines
+        self.read_text = read_text or _read_file
+        self._stamp = None
+        self._document = None
+
+    def get(self) -> ManualDocument | None:
+        """获取手册文档，文件不存在时返回None
+
+        Raises:
+            OSError: 读取文件失败
+        """
+        try:
+            stat = os.stat(self.manual_path)
+        except FileNotFoundError:
+            self._stamp = self._document = None
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp or self._document is None:
+            self._document = ManualDocument(self.read_text(self.manual_path), self.page_lines)
+            self._stamp = stamp
+        return self._document
@@ -0,0 +1,142 @@
+"""
+示例插件菜单定义
+
+该文件以数据表的形式描述插件的菜单和命令，只依赖菜单系统，不导入业务逻辑。
+插件在延迟初始化模式下可以只根据这些元数据注册菜单，直到命令第一次执行时才创建业务对象。
+
+Rich演示命令以 "模块:函数" 声明（模块名相对于本插件包），新增演示只需要在DEMOS中添加一行。
+"""
+import functools
+from collections.abc import Callable
+from typing import NamedTuple
+
+from core.menu_system import ActionItem, CommandType, MenuSystem
+
+from .command_metrics import CommandMetrics
+from .demo_registry import DemoCommand
+
+# 插件一级菜单ID
+MAIN_MENU_ID = "example_plugin_menu"
+
+
+class MenuSpec(NamedTuple):
+    """子菜单定义"""
+    id: str
+    name: str
+    description: str
+    parent: str  # 父菜单ID
+
+
+class CommandSpec(NamedTuple):
+    """命令定义"""
+    id: str
+    name: str
+    description: str
+    handler: str  # ExampleBusiness上的方法名
+    category: str
+    menu: str  # 所属菜单ID
+    target: str = ""  # "模块:函数" 形式的演示入口，设置时不经过业务对象
+    is_async: bool = False  # 业务方法是否为协程函数
+
+
+MENUS = (
+    MenuSpec(MAIN_MENU_ID, "示例插件", "演示插件的功能", "main_menu"),
+    MenuSpec("rich_demo_menu", "Rich演示", "演示Rich库的各种功能", MAIN_MENU_ID),
+)
+
+COMMANDS = (
+    CommandSpec("example_hello", "Hello World", "演示基本命令执行", "hello_world", "示例", MAIN_MENU_ID),
+    CommandSpec("example_config", "配置演示", "演示如何使用插件配置", "config_demo", "示例", MAIN_MENU_ID),
+    CommandSpec("example_binary", "二进制工作进程", "通过常驻工作进程调用插件二进制", "binary_demo", "示例", MAIN_MENU_ID),
+    CommandSpec("example_performance", "插件性能", "显示插件各生命周期阶段的耗时和内存变化",
+                "plugin_performance", "示例", MAIN_MENU_ID),
+    CommandSpec("example_latency", "命令延迟", "显示每个命令的调用次数和延迟分布",
+                "command_latency", "示例", MAIN_MENU_ID),
+    CommandSpec("example_cache", "结果缓存", "显示命令结果缓存的命中率和淘汰次数",
+                "result_cache_stats", "示例", MAIN_MENU_ID),
+    CommandSpec("example_async", "异步命令", "演示可取消的协程命令", "async_countdown", "示例", MAIN_MENU_ID,
+                is_async=True),
+    CommandSpec("example_cancel", "取消运行中的命令", "取消通过命令执行器运行的所有命令",
+                "cancel_commands", "示例", MAIN_MENU_ID),
+)
+
+
+def demo(demo_id: str, name: str, description: str, target: str) -> CommandSpec:
+    """声明Rich演示命令"""
+    return CommandSpec(demo_id, name, description, "", "Rich演示", "rich_demo_menu", target)
+
+
+DEMOS = (
+    demo("rich_code_execution_monitor", "代码执行监控", "演示实时代码执行监控界面", ".demos.rich.code_execution_monitor:main"),
+    demo("rich_components_view", "Rich组件演示", "演示Rich库的各种组件", ".demos.rich.components_view:main"),
+    demo("rich_layout_nav", "布局导航", "演示带路由功能的布局导航系统", ".demos.rich.layout_nav:main"),
+    demo("rich_log_execution_monitor", "日志执行监控", "演示实时日志监控系统", ".demos.rich.log_execution_monitor:main"),
+    demo("rich_minimal_monitor_1", "简约监控1", "使用Status组件创建简约任务监控", ".demos.rich.minimal_monitor_1:main"),
+    demo("rich_minimal_monitor_2", "简约监控2", "使用Live组件创建实时更新状态栏", ".demos.rich.minimal_monitor_2:main"),
+    demo("rich_monitor_dashboard", "监控仪表板", "创建多面板系统监控仪表板", ".demos.rich.monitor_dashboard:main"),
+    demo("rich_panel_table", "面板表格", "演示Panel和Table组件创建脚本管理器", ".demos.rich.panel_table:main"),
+    demo("rich_parallel_progress", "并行进度条", "创建多任务并行进度条系统", ".demos.rich.parallel_progress:main"),
+)
+
+
+def sync_entry(func: Callable) -> Callable:
+    """为协程命令创建同步调用入口
+
+    菜单系统只能同步调用python_func，这里在新的事件循环中运行协程；
+    CommandExecutor会沿__wrapped__找回协程函数，直接在宿主程序的事件循环中执行。
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # asyncio导入较慢，执行协程命令时才导入
+        import asyncio
+        return asyncio.run(func(*args, **kwargs))
+
+    return wrapper
+
+
+def register_menus(menu_system: MenuSystem,
+                   resolve: Callable[[CommandSpec], Callable],
+                   metrics: CommandMetrics | None = None,
+                   commands: tuple[CommandSpec, ...] = COMMANDS + DEMOS,
+                   menu_specs: tuple[MenuSpec, ...] = MENUS):
+    """根据菜单定义注册插件的菜单和命令
+
+    Args:
+        menu_system: 菜单系统实例
+        resolve: 根据命令定义返回业务方法的函数，设置了target的演示命令不会调用它；
+            is_async的命令应返回协程函数，注册时会包装为同步调用入口
+        metrics: 命令延迟统计，提供时每个命令都会被包装以记录调用耗时
+        commands: 要注册的命令定义
+        menu_specs: 要创建的子菜单定义
+    """
+    # 创建子菜单
+    menus = {}
+    for menu in menu_specs:
+        menus[menu.id] = menu_system.create_submenu(
+            menu_id=menu.id,
+            name=menu.name,
+            description=menu.description
+        )
+
+    # 注册命令并添加到所属菜单
+    for spec in commands:
+        func = DemoCommand(spec.target, spec.name) if spec.target else resolve(spec)
+        if metrics is not None:
+            func = metrics.instrument(spec.id, func)
+        if spec.is_async:
+            func = sync_entry(func)
+        menu_system.register_item(ActionItem(
+            id=spec.id,
+            name=spec.name,
+            description=spec.description,
+            command_type=CommandType.PYTHON,
+            python_func=func,
+            category=spec.category
+        ))
+        menus[spec.menu].add_item(spec.id)
+
+    # 将子菜单挂到父菜单上，父菜单不是插件菜单时（如主菜单）从菜单系统中查找
+    for menu in menu_specs:
+        parent = menus.get(menu.parent) or menu_system.get_item_by_id(menu.parent)
+        if parent and hasattr(parent, "add_item"):
+            parent.add_item(menu.id)
@@ -0,0 +1,73 @@
+"""
+插件包导入
+
+该文件提供只负责本插件目录下的包（如demos）的meta path finder，不修改sys.path。
+向sys.path前插目录会让宿主进程中之后的每一次导入都先在这些目录中查找，插件越多开销越大；
+finder只比较一次模块名，其他导入直接跳过。子模块通过父包的__path__解析，不经过finder。
+
+插件目录下的包以本插件包的子包名称导入（例如demos导入为fastx_tui_plugin_example.demos），
+不占用demos这样的全局顶层名称，多个插件都带有demos目录时互不影响。
+"""
+import os
+import sys
+from collections.abc import Iterable
+from importlib.machinery import ModuleSpec, PathFinder
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 插件目录下的包挂在本包名称之下
+PACKAGE_PREFIX = __package__
+
+
+class PluginPackageFinder:
+    """以指定前缀下的子包名称，从插件目录解析包的meta path finder"""
+
+    def __init__(self, root: str, packages: Iterable[str], prefix: str | None = PACKAGE_PREFIX):
+        """初始化finder
+
+        Args:
+            root: 包所在的目录
+            packages: 由该finder负责的包在root中的目录名
+            prefix: 导入名称的前缀，包以 "前缀.目录名" 导入，None表示以目录名作为顶层包导入
+        """
+        self.root = root
+        self.prefix = prefix
+        self.packages = frozenset(f"{prefix}.{package}" if prefix else package for package in packages)
+        self._search_path = [root]
+
+    def find_spec(self, fullname: str, path=None, target=None) -> ModuleSpec | None:
+        """查找模块，只处理负责的包"""
+        if fullname not in self.packages:
+            return None
+        # PathFinder按名称的最后一段在root中查找，得到的spec使用完整的带前缀名称
+        return PathFinder.find_spec(fullname, self._search_path, target)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.root!r}, {sorted(self.packages)!r})"
+
+
+def install(root: str = PLUGIN_DIR, packages: Iterable[str] = ("demos",),
+            prefix: str | None = PACKAGE_PREFIX) -> PluginPackageFinder:
+    """将finder添加到sys.meta_path最前面，同一目录和前缀已安装时返回已有的finder
+
+    Args:
+        root: 包所在的目录
+        packages: 由该finder负责的包在root中的目录名
+        prefix: 导入名称的前缀
+
+    Returns:
+        PluginPackageFinder: 已安装的finder
+    """
+    for finder in sys.meta_path:
+        if isinstance(finder, PluginPackageFinder) and finder.root == root and finder.prefix == prefix:
+            return finder
+    finder = PluginPackageFinder(root, packages, prefix)
+    sys.meta_path.insert(0, finder)
+    return finder
+
+
+def uninstall(finder: PluginPackageFinder) -> None:
+    """从sys.meta_path中移除finder"""
+    try:
+        sys.meta_path.remove(finder)
+    except ValueError:
+        pass
@@ -0,0 +1,121 @@
+"""
+插件元数据缓存
+
+该文件负责读取并缓存插件的版本号和PluginInfo，避免每次调用get_info()都打开并解析pyproject.toml。
+
+版本号的来源按以下顺序确定：
+1. pyproject.toml（使用标准库tomllib解析，按文件修改时间缓存）
+2. 构建时生成的plugin_version.py（安装后的插件通常不带pyproject.toml）
+3. 默认版本号
+"""
+import os
+from collections.abc import Callable
+from typing import Any
+
+PYPROJECT_FILE = "pyproject.toml"
+DEFAULT_VERSION = "1.0.0"
+
+# 表示缓存尚未填充的哨兵值（None 表示 pyproject.toml 不存在）
+_UNSET = object()
+
+
+def parse_pyproject_version(pyproject_path: str) -> str | None:
+    """从pyproject.toml解析版本号
+
+    仅使用标准库tomllib（Python 3.11+），运行时不会导入第三方toml库。
+
+    Args:
+        pyproject_path: pyproject.toml文件路径
+
+    Returns:
+        str | None: 版本号，无法解析时返回None
+    """
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        # Python 3.10 没有 tomllib，交给构建时生成的版本模块
+        return None
+
+    try:
+        with open(pyproject_path, "rb") as f:
+            data = tomllib.load(f)
+        return data["project"]["version"]
+    except Exception:
+        return None
+
+
+def generated_version() -> str:
+    """获取构建时生成的版本号
+
+    Returns:
+        str: plugin_version.py中的版本号，模块不存在时返回默认版本
+    """
+    try:
+        from .plugin_version import __version__
+        return __version__
+    except ImportError:
+        return DEFAULT_VERSION
+
+
+class PluginMetadata:
+    """插件元数据缓存
+
+    以pyproject.toml的修改时间作为缓存键，只有文件发生变化时才重新解析，
+    其余调用只需要一次stat系统调用。
+    """
+
+    def __init__(self, project_dir: str):
+        """初始化元数据缓存
+
+        Args:
+            project_dir: 插件项目目录，即pyproject.toml所在目录
+        """
+        self.pyproject_path = os.path.join(project_dir, PYPROJECT_FILE)
+        self._stamp = _UNSET
+        self._version = DEFAULT_VERSION
+        self._info = None
+
+    def _current_stamp(self) -> int | None:
+        """获取pyproject.toml的修改时间，文件不存在时返回None"""
+        try:
+            return os.stat(self.pyproject_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh(self) -> None:
+        """在pyproject.toml变化时刷新缓存"""
+        stamp = self._current_stamp()
+        if stamp == self._stamp:
+            return
+
+        version = None
+        if stamp is not None:
+            version = parse_pyproject_version(self.pyproject_path)
+        self._version = version or generated_version()
+        self._info = None
+        self._stamp = stamp
+
+    @property
+    def version(self) -> str:
+        """当前插件版本号"""
+        self._refresh()
+        return self._version
+
+    def get_info(self, factory: Callable[[str], Any]) -> Any:
+        """获取缓存的插件信息
+
+        Args:
+            factory: 根据版本号构建PluginInfo的函数，仅在缓存失效时调用
+
+        Returns:
+            Any: factory返回的插件信息对象
+        """
+        self._refresh()
+        if self._info is None:
+            self._info = factory(self._version)
+        return self._info
+
+    def invalidate(self) -> None:
+        """强制下一次访问时重新读取元数据"""
+        self._stamp = _UNSET
+        self._info = None
@@ -0,0 +1,175 @@
+"""
+插件生命周期性能统计
+
+该文件记录插件各个生命周期阶段（initialize、register、cleanup等）的耗时和内存变化，
+用于在宿主程序启动缓慢时定位是哪个插件的哪个阶段造成的。
+
+耗时使用perf_counter_ns测量；内存在tracemalloc开启时使用其统计值，否则读取进程常驻内存（仅Linux）。
+"""
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_memory() -> tuple[int, str]:
+    """获取当前内存占用
+
+    Returns:
+        tuple[int, str]: (字节数, 统计来源)，无法获取时字节数为0
+    """
+    # tracemalloc未被导入时不可能处于跟踪状态，避免为此导入该模块
+    tracemalloc = sys.modules.get("tracemalloc")
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0], "tracemalloc"
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE, "rss"
+    except (OSError, ValueError, IndexError):
+        return 0, "unavailable"
+
+
+class PhaseStats:
+    """单个生命周期阶段的统计"""
+
+    __slots__ = ("name", "calls", "errors", "total_ns", "last_ns", "max_ns", "memory_delta", "memory_source")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.last_ns = 0
+        self.max_ns = 0
+        self.memory_delta = 0
+        self.memory_source = "unavailable"
+
+    def record(self, elapsed_ns: int, memory_delta: int, memory_source: str, failed: bool) -> None:
+        """记录一次执行"""
+        self.calls += 1
+        self.errors += failed
+        self.total_ns += elapsed_ns
+        self.last_ns = elapsed_ns
+        self.max_ns = max(self.max_ns, elapsed_ns)
+        self.memory_delta = memory_delta
+        self.memory_source = memory_source
+
+    def as_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PluginStats:
+    """插件生命周期统计"""
+
+    def __init__(self, plugin_name: str = ""):
+        """初始化统计
+
+        Args:
+            plugin_name: 插件名称，导出时用于区分不同插件
+        """
+        self.plugin_name = plugin_name
+        self.phases = {}
+
+    def _phase(self, phase: str) -> PhaseStats:
+        """获取阶段统计，不存在时创建"""
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats(phase)
+        return stats
+
+    def record(self, phase: str, elapsed_ns: int, failed: bool = False) -> None:
+        """记录一次在其他地方测量的阶段耗时，例如后台线程中的预热
+
+        Args:
+            phase: 阶段名称
+            elapsed_ns: 耗时（纳秒）
+            failed: 是否执行失败
+        """
+        self._phase(phase).record(elapsed_ns, 0, "unavailable", failed)
+
+    @contextmanager
+    def measure(self, phase: str):
+        """测量一个生命周期阶段
+
+        Args:
+            phase: 阶段名称
+        """
+        stats = self._phase(phase)
+
+        memory_before, _ = current_memory()
+        failed = True
+        start = time.perf_counter_ns()
+        try:
+            yield stats
+            failed = False
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            memory_after, source = current_memory()
+            stats.record(elapsed, memory_after - memory_before, source, failed)
+
+    def as_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return {
+            "plugin": self.plugin_name,
+            "phases": [stats.as_dict() for stats in self.phases.values()],
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """导出为JSON字符串"""
+        return json.dumps(self.as_dict(), ensure_ascii=False, indent=indent)
+
+    def export_json(self, path: str) -> str:
+        """导出为JSON文件
+
+        Returns:
+            str: 导出的文件路径
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+        return path
+
+    def render_table(self):
+        """创建Rich表格"""
+        from rich.table import Table
+
+        table = Table(title=f"插件性能: {self.plugin_name}" if self.plugin_name else "插件性能")
+        table.add_column("阶段", style="cyan")
+        table.add_column("次数", justify="right")
+        table.add_column("最近耗时", justify="right", style="green")
+        table.add_column("最大耗时", justify="right", style="yellow")
+        table.add_column("累计耗时", justify="right")
+        table.add_column("内存变化", justify="right", style="magenta")
+        table.add_column("失败", justify="right", style="red")
+
+        for stats in self.phases.values():
+            table.add_row(
+                stats.name,
+                str(stats.calls),
+                f"{stats.last_ns / 1e6:.3f} ms",
+                f"{stats.max_ns / 1e6:.3f} ms",
+                f"{stats.total_ns / 1e6:.3f} ms",
+                f"{stats.memory_delta / 1024:+.1f} KB" if stats.memory_source != "unavailable" else "-",
+                str(stats.errors),
+            )
+        return table
+
+
+def timed_phase(phase: str):
+    """记录方法执行耗时的装饰器，被装饰对象需要有lifecycle_stats属性（PluginStats）
+
+    Args:
+        phase: 阶段名称
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.lifecycle_stats.measure(phase):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,2 @@
+# 该文件由发布流程根据pyproject.toml自动生成，请勿手动修改
+__version__ = "0.1.12"
@@ -0,0 +1,216 @@
+"""
+插件资源管理
+
+该文件按资源文件大小选择不同的读取方式，避免每次执行命令都重新读取资源文件：
+- 小文件：读入内存，放入按总字节数限制大小的LRU缓存
+- 大文件：通过mmap映射，返回零拷贝的memoryview，映射数量同样按LRU限制
+- 超大文件：按块流式读取
+
+缓存以文件的修改时间和大小作为有效性标记，文件变化后自动重新读取。
+插件的manual.md和config_schema.json也通过它读取，资源名称为绝对路径时不经过resolve。
+"""
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+
+SMALL_RESOURCE_LIMIT = 256 * 1024  # 小于该大小的资源放入LRU缓存
+MMAP_RESOURCE_LIMIT = 512 * 1024 * 1024  # 小于该大小的资源使用mmap
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024  # LRU缓存总大小
+DEFAULT_MAX_MAPPINGS = 16  # 同时保持的mmap映射数量，每个映射占用一个文件描述符
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 流式读取的块大小
+
+
+class ResourceStats:
+    """资源读取统计"""
+
+    __slots__ = ("hits", "misses", "evictions", "mapped", "streamed")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.mapped = 0
+        self.streamed = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ResourceManager:
+    """插件资源管理器"""
+
+    def __init__(self,
+                 resolve: Callable[[str], str],
+                 cache_bytes: int = DEFAULT_CACHE_BYTES,
+                 small_limit: int = SMALL_RESOURCE_LIMIT,
+                 mmap_limit: int = MMAP_RESOURCE_LIMIT,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_mappings: int = DEFAULT_MAX_MAPPINGS):
+        """初始化资源管理器
+
+        Args:
+            resolve: 将资源名称转换为文件路径的函数，通常是Plugin.get_resource_path；绝对路径不经过该函数
+            cache_bytes: LRU缓存的总字节数上限
+            small_limit: 使用LRU缓存的资源大小上限
+            mmap_limit: 使用mmap的资源大小上限，超过时只能流式读取
+            chunk_size: 流式读取的默认块大小
+            max_mappings: 同时保持的mmap映射数量上限，超出时按LRU关闭最久未使用的映射
+        """
+        self.resolve = resolve
+        self.cache_bytes = cache_bytes
+        self.small_limit = min(small_limit, cache_bytes)
+        self.mmap_limit = mmap_limit
+        self.chunk_size = chunk_size
+        self.max_mappings = max(1, max_mappings)
+        self.stats = ResourceStats()
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # 路径 -> (有效性标记, 内容)
+        self._cached_bytes = 0
+        self._mappings = OrderedDict()  # 路径 -> (有效性标记, mmap对象)
+
+    def _path(self, name: str) -> str:
+        """获取资源的文件路径"""
+        return name if os.path.isabs(name) else self.resolve(name)
+
+    @staticmethod
+    def _stamp(path: str) -> tuple[int, int]:
+        """获取文件的有效性标记"""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self, name: str) -> memoryview:
+        """读取资源内容
+
+        小文件从LRU缓存返回，大文件返回mmap的只读视图。
+
+        Args:
+            name: 资源名称或文件的绝对路径
+
+        Returns:
+            memoryview: 资源内容的只读视图
+
+        Raises:
+            OSError: 资源文件不存在或无法读取
+            ValueError: 资源超过mmap大小上限，需要使用stream()
+        """
+        path = self._path(name)
+        stamp = self._stamp(path)
+        size = stamp[1]
+        if size <= self.small_limit:
+            return memoryview(self._read_cached(path, stamp))
+        if size <= self.mmap_limit:
+            return self._read_mapped(path, stamp)
+        raise ValueError(f"资源 {name} 大小为 {size} 字节，超过mmap上限，请使用stream()读取")
+
+    def read_text(self, name: str, encoding: str = "utf-8") -> str:
+        """读取资源并解码为文本"""
+        return str(self.read(name), encoding)
+
+    def stream(self, name: str, chunk_size: int | None = None) -> Iterator[bytes]:
+        """按块读取资源内容，适用于任意大小的资源
+
+        Args:
+            name: 资源名称
+            chunk_size: 块大小，默认使用初始化时的设置
+
+        Yields:
+            bytes: 资源内容块
+        """
+        path = self._path(name)
+        stamp = self._stamp(path)
+        if stamp[1] <= self.small_limit:
+            yield self._read_cached(path, stamp)
+            return
+
+        self.stats.streamed += 1
+        chunk_size = chunk_size or self.chunk_size
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def _read_cached(self, path: str, stamp: tuple[int, int]) -> bytes:
+        """从LRU缓存读取小文件"""
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._cache.move_to_end(path)
+                self.stats.hits += 1
+                return entry[1]
+            self.stats.misses += 1
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        with self._lock:
+            previous = self._cache.pop(path, None)
+            if previous is not None:
+                self._cached_bytes -= len(previous[1])
+            self._cache[path] = (stamp, data)
+            self._cached_bytes += len(data)
+            while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+                self.stats.evictions += 1
+        return data
+
+    def _read_mapped(self, path: str, stamp: tuple[int, int]) -> memoryview:
+        """通过mmap读取大文件"""
+        with self._lock:
+            entry = self._mappings.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._mappings.move_to_end(path)
+                self.stats.hits += 1
+                return memoryview(entry[1])
+            self.stats.misses += 1
+
+            with open(path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # 文件已变化的旧映射和超出数量上限的映射都要关闭，否则文件描述符和地址空间会一直占用
+            released = []
+            previous = self._mappings.pop(path, None)
+            if previous is not None:
+                released.append(previous[1])
+            self._mappings[path] = (stamp, mapping)
+            while len(self._mappings) > self.max_mappings:
+                _, (_, evicted) = self._mappings.popitem(last=False)
+                released.append(evicted)
+                self.stats.evictions += 1
+            self.stats.mapped += 1
+            view = memoryview(mapping)
+        for old in released:
+            self._close_mapping(old)
+        return view
+
+    @staticmethod
+    def _close_mapping(mapping: mmap.mmap) -> None:
+        """关闭mmap映射，仍有memoryview引用时等引用释放后由垃圾回收关闭"""
+        try:
+            mapping.close()
+        except BufferError:
+            pass
+
+    @property
+    def mapping_count(self) -> int:
+        """当前保持的mmap映射数量"""
+        return len(self._mappings)
+
+    @property
+    def cached_bytes(self) -> int:
+        """LRU缓存当前占用的字节数"""
+        return self._cached_bytes
+
+    def clear(self) -> None:
+        """清空缓存并关闭所有mmap映射"""
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+            mappings = list(self._mappings.values())
+            self._mappings.clear()
+        for _, mapping in mappings:
+            self._close_mapping(mapping)
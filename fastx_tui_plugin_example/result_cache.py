@@ -0,0 +1,164 @@
+"""
+命令结果缓存
+
+该文件为只依赖配置的命令提供结果缓存。命令通过@config_cached装饰器加入缓存，缓存键由配置快照版本号、
+命令名称和参数组成：配置未修改时重复调用直接返回上一次的结果，配置修改后版本号变化，旧结果自动失效。
+缓存容量有上限，超出时淘汰最久未使用的结果。
+"""
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_MAXSIZE = 128
+
+
+class CacheStats:
+    """单个命令的缓存统计"""
+
+    __slots__ = ("name", "hits", "misses")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率（0 ~ 1）"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return {"name": self.name, "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+
+class ResultCache:
+    """容量有限的LRU结果缓存"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """初始化结果缓存
+
+        Args:
+            maxsize: 最多缓存的结果数
+        """
+        self.maxsize = max(1, maxsize)
+        self.stats = {}
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def command_stats(self, name: str) -> CacheStats:
+        """获取指定命令的缓存统计，不存在时创建"""
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = CacheStats(name)
+        return stats
+
+    def lookup(self, version: int, key: tuple) -> tuple[bool, Any]:
+        """查找缓存结果
+
+        配置版本号与上一次不同时先清空全部结果，旧版本的结果不会再被命中。
+
+        Args:
+            version: 当前配置快照的版本号
+            key: 缓存键
+
+        Returns:
+            tuple[bool, Any]: (是否命中, 缓存的结果)
+        """
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self._entries.clear()
+                    self.invalidations += 1
+                self._version = version
+                return False, None
+            try:
+                value = self._entries[key]
+            except KeyError:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def store(self, version: int, key: tuple, value: Any) -> None:
+        """保存结果，配置已在计算期间修改时丢弃"""
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存结果，保留统计数据"""
+        with self._lock:
+            self._entries.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "commands": [stats.as_dict() for stats in self.stats.values()],
+        }
+
+    def render_table(self):
+        """创建Rich表格"""
+        from rich.table import Table
+
+        table = Table(
+            title="结果缓存",
+            caption=f"容量 {len(self._entries)}/{self.maxsize}，淘汰 {self.evictions}，配置变更失效 {self.invalidations}"
+        )
+        table.add_column("命令", style="cyan")
+        table.add_column("命中", justify="right", style="green")
+        table.add_column("未命中", justify="right", style="yellow")
+        table.add_column("命中率", justify="right", style="magenta")
+
+        for stats in self.stats.values():
+            table.add_row(stats.name, str(stats.hits), str(stats.misses), f"{stats.hit_rate:.1%}")
+        return table
+
+
+def config_cached(method: Callable) -> Callable:
+    """缓存只依赖配置和参数的业务方法的结果
+
+    被装饰的方法所属对象需要提供plugin属性，插件提供result_cache和config_snapshot。
+    参数不可哈希时不使用缓存，直接调用原方法。
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        plugin = self.plugin
+        cache = plugin.result_cache
+        version = plugin.config_snapshot.version
+        key = (name, args, tuple(sorted(kwargs.items()))) if kwargs else (name, args)
+        stats = cache.command_stats(name)
+        try:
+            hit, value = cache.lookup(version, key)
+        except TypeError:
+            # 参数不可哈希
+            stats.misses += 1
+            return method(self, *args, **kwargs)
+        if hit:
+            stats.hits += 1
+            return value
+        stats.misses += 1
+        value = method(self, *args, **kwargs)
+        cache.store(version, key, value)
+        return value
+
+    return wrapper
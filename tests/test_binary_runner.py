@@ -0,0 +1,141 @@
+"""binary_runner的测试，使用bin/example_binary替身作为工作进程"""
+import io
+import os
+import sys
+import time
+
+import pytest
+
+from fastx_tui_plugin_example.binary_runner import (
+    FRAME_RESULT,
+    BinaryRunner,
+    BinaryRunnerError,
+    WorkerCrashedError,
+    binary_command,
+    read_frame,
+    write_frame,
+)
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_BINARY = os.path.join(PLUGIN_DIR, "bin", "example_binary")
+
+
+@pytest.fixture
+def runner():
+    runner = BinaryRunner(binary_command(EXAMPLE_BINARY), pool_size=2, timeout=10, cwd=PLUGIN_DIR)
+    yield runner
+    runner.close()
+
+
+class ChunkedStream(io.RawIOBase):
+    """每次最多返回chunk字节的流，模拟管道上的部分读取"""
+
+    def __init__(self, data: bytes, chunk: int):
+        self.data = data
+        self.chunk = chunk
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        size = min(size, self.chunk)
+        data = self.data[self.position:self.position + size]
+        self.position += len(data)
+        return data
+
+
+def test_read_frame_handles_partial_reads():
+    buffer = io.BytesIO()
+    write_frame(buffer, FRAME_RESULT, b"x" * 200_000)
+    write_frame(buffer, FRAME_RESULT, b"")
+    stream = ChunkedStream(buffer.getvalue(), 65536)
+    assert read_frame(stream) == (FRAME_RESULT, b"x" * 200_000)
+    assert read_frame(stream) == (FRAME_RESULT, b"")
+    assert read_frame(stream) is None
+
+
+def test_read_frame_truncated_payload():
+    buffer = io.BytesIO()
+    write_frame(buffer, FRAME_RESULT, b"payload")
+    assert read_frame(ChunkedStream(buffer.getvalue()[:-1], 3)) is None
+
+
+def test_request_and_output(runner):
+    output = []
+    result = runner.request(b"hello world", on_output=output.append)
+    assert result.startswith(b"HELLO WORLD")
+    assert b"".join(output).decode() == "处理: hello\n处理: world\n"
+
+
+def test_large_frame(runner):
+    # 远大于管道缓冲区（64KB），响应需要多次读取才能读满
+    payload = b"a" * 300_000
+    started = time.monotonic()
+    result = runner.request(payload, timeout=10)
+    assert result.startswith(b"A" * 300_000)
+    assert time.monotonic() - started < 5
+
+
+def test_error_frame_keeps_worker(runner):
+    with pytest.raises(BinaryRunnerError, match="请求执行失败"):
+        runner.request(b"fail")
+    assert runner.request(b"ok").startswith(b"OK")
+    assert runner.restarts == 0
+
+
+def test_crash_restarts_worker(runner):
+    with pytest.raises(WorkerCrashedError, match="退出码: 3"):
+        runner.request(b"crash")
+    assert runner.restarts == 1
+    assert runner.request(b"again").startswith(b"AGAIN")
+
+
+def test_timeout_replaces_worker(runner):
+    first_pid = runner.request(b"pid").split(b"pid ")[1]
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        runner.request(b"sleep 5", timeout=0.3)
+    assert time.monotonic() - started < 2
+    # 超时的工作进程被终止，下一次请求在新进程中执行
+    second_pid = runner.request(b"pid").split(b"pid ")[1]
+    assert second_pid != first_pid
+    assert runner.worker_count == 1
+
+
+def test_interrupted_output_callback_replaces_worker():
+    # 只有一个工作进程，被中断的请求的剩余帧不能被下一个请求读到
+    runner = BinaryRunner(binary_command(EXAMPLE_BINARY), pool_size=1, timeout=10, cwd=PLUGIN_DIR)
+    try:
+        def interrupt(data):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            runner.request(b"first request", on_output=interrupt)
+        assert runner.request(b"second").startswith(b"SECOND")
+        assert runner.worker_count == 1
+    finally:
+        runner.close()
+
+
+def test_truncated_frame_from_live_worker_does_not_hang():
+    # 工作进程输出半个帧头后关闭stdout但不退出
+    script = ("import os, sys, time; sys.stdin.buffer.read(5); "
+              "os.write(1, b'\\x03\\x00'); os.close(1); time.sleep(60)")
+    runner = BinaryRunner([sys.executable, "-c", script], pool_size=1, timeout=10)
+    try:
+        started = time.monotonic()
+        with pytest.raises(WorkerCrashedError):
+            runner.request(b"")
+        assert time.monotonic() - started < 5
+    finally:
+        runner.close()
+
+
+def test_close_stops_workers(runner):
+    runner.request(b"a")
+    runner.request(b"b")
+    runner.close()
+    assert runner.worker_count == 0
+    with pytest.raises(BinaryRunnerError):
+        runner.request(b"c")
@@ -0,0 +1,223 @@
+"""command_executor的测试，直接使用asyncio和宿主程序替身"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from benchmarks import host_stub
+from fastx_tui_plugin_example.command_executor import (
+    CommandCancelled,
+    CommandExecutor,
+    cancellable_sleep,
+    check_cancelled,
+)
+
+
+def test_runs_coroutine_and_sync_commands():
+    executor = CommandExecutor()
+
+    async def coroutine_command(value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    def sync_command(value):
+        return threading.current_thread().name, value + 1
+
+    async def main():
+        assert await executor.run(coroutine_command, 21) == 42
+        thread_name, value = await executor.run(sync_command, 1)
+        assert thread_name.startswith("fastx-command")
+        assert value == 2
+        assert executor.running == []
+
+    asyncio.run(main())
+    executor.shutdown()
+
+
+def test_sync_command_does_not_block_loop():
+    executor = CommandExecutor()
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        await executor.run(time.sleep, 0.2)
+        task.cancel()
+
+    asyncio.run(main())
+    executor.shutdown()
+    assert len(ticks) >= 5
+
+
+def test_timeout_cancels_sync_command():
+    executor = CommandExecutor(default_timeout=0.1)
+    stopped = threading.Event()
+
+    def slow():
+        try:
+            cancellable_sleep(10)
+        finally:
+            stopped.set()
+
+    async def main():
+        with pytest.raises(TimeoutError):
+            await executor.run(slow)
+
+    started = time.monotonic()
+    asyncio.run(main())
+    assert stopped.wait(2)
+    assert time.monotonic() - started < 2
+    executor.shutdown()
+
+
+def test_cancel_raises_in_caller_without_cancelling_it():
+    executor = CommandExecutor()
+
+    async def forever():
+        await asyncio.sleep(60)
+
+    async def main():
+        command = asyncio.create_task(executor.run(forever, name="forever"))
+        await asyncio.sleep(0.05)
+        assert executor.cancel("forever") == 1
+        with pytest.raises(CommandCancelled):
+            await command
+        # 调用方任务没有被取消，可以继续执行
+        await asyncio.sleep(0.01)
+        return "caller alive"
+
+    assert asyncio.run(main()) == "caller alive"
+
+
+def test_cancel_from_thread_after_command_finished_is_ignored():
+    executor = CommandExecutor()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        commands = []
+
+        async def quick():
+            commands.extend(executor._running.values())
+            return "done"
+
+        assert await executor.run(quick, name="quick") == "done"
+        # 菜单命令在线程池中取消已经结束的命令，不应取消调用方的任务
+        await loop.run_in_executor(None, commands[0].cancel)
+        await asyncio.sleep(0.05)
+        return "caller alive"
+
+    assert asyncio.run(main()) == "caller alive"
+
+
+def test_caller_cancellation_cancels_command():
+    executor = CommandExecutor()
+
+    async def main():
+        seen = asyncio.Event()
+
+        async def forever():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                seen.set()
+                raise
+
+        caller = asyncio.create_task(executor.run(forever))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.wait_for(seen.wait(), 1)
+
+    asyncio.run(main())
+
+
+def test_concurrency_limit_across_event_loops():
+    executor = CommandExecutor(max_concurrent=1)
+    active = []
+    peak = []
+
+    async def command():
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.02)
+        active.pop()
+
+    async def main():
+        await asyncio.gather(*(executor.run(command) for _ in range(3)))
+
+    # 信号量按事件循环创建，第二个事件循环中仍然可以使用同一个执行器
+    asyncio.run(main())
+    asyncio.run(main())
+    assert max(peak) == 1
+    assert len(peak) == 6
+
+
+def test_cancel_all_skips_caller():
+    executor = CommandExecutor()
+
+    async def main():
+        long_running = asyncio.create_task(executor.run(asyncio.sleep, 60, name="sleep"))
+        await asyncio.sleep(0.05)
+
+        def cancel_others():
+            check_cancelled()
+            return executor.cancel_all()
+
+        assert await executor.run(cancel_others, name="cancel") == 1
+        with pytest.raises(CommandCancelled):
+            await long_running
+
+    asyncio.run(main())
+    executor.shutdown()
+
+
+def test_menu_commands_with_stub_host():
+    plugin, menu_system = host_stub.load_plugin()
+    countdown = menu_system.get_item_by_id("example_async").python_func
+    cancel = menu_system.get_item_by_id("example_cancel").python_func
+
+    async def main():
+        executor = plugin.command_executor
+        running = asyncio.create_task(executor.run(countdown, name="example_async"))
+        await asyncio.sleep(0.05)
+        assert await executor.run(cancel, name="example_cancel") == "已取消 1 个命令"
+        with pytest.raises(CommandCancelled):
+            await running
+        assert await executor.run(cancel, name="example_cancel") == "没有运行中的命令"
+
+    try:
+        asyncio.run(main())
+    finally:
+        plugin.cleanup()
+
+
+def test_terminal_backend_sleep_is_cancellable():
+    from fastx_tui_plugin_example.demos.rich.render_backend import TerminalBackend
+
+    executor = CommandExecutor()
+    finished = threading.Event()
+
+    def demo():
+        try:
+            TerminalBackend().sleep(10)
+        finally:
+            finished.set()
+
+    async def main():
+        task = asyncio.create_task(executor.run(demo, name="demo"))
+        await asyncio.sleep(0.05)
+        executor.cancel("demo")
+        with pytest.raises(CommandCancelled):
+            await task
+
+    started = time.monotonic()
+    asyncio.run(main())
+    assert finished.wait(2)
+    assert time.monotonic() - started < 2
+    executor.shutdown()
@@ -0,0 +1,20 @@
+"""demos/rich/log_ingest的测试"""
+from demos.rich.log_ingest import LogIngestQueue
+from demos.rich.log_store import LEVEL_IDS, LogStore
+
+
+def test_plain_lines_are_sampled_under_overload():
+    store = LogStore(capacity=100_000)
+    ingest = LogIngestQueue(store, tick_budget=1000)
+    for index in range(50_000):
+        # 没有级别的普通行（LOG）与INFO一样参与采样
+        ingest.put(f"line {index}", "LOG" if index % 2 else "INFO")
+    ingest.put("disk full", "ERROR")
+    ingest.put("slow request", "WARNING")
+    assert ingest.drain() == 50_002
+    assert len(store) <= 1000
+    assert 0 < store.count([LEVEL_IDS["LOG"]]) < 1000
+    assert 0 < store.count([LEVEL_IDS["INFO"]]) < 1000
+    assert store.count([LEVEL_IDS["ERROR"]]) == 1
+    assert store.count([LEVEL_IDS["WARNING"]]) == 1
+    assert ingest.sampled_out == 50_002 - len(store)
@@ -0,0 +1,48 @@
+"""demos/rich/log_multiplex的测试"""
+import asyncio
+
+from demos.rich.log_multiplex import LogMultiplexer, read_line
+
+
+def test_read_line_keeps_head_of_long_lines():
+    async def read_all():
+        reader = asyncio.StreamReader(limit=8)
+        reader.feed_data(b"short\n" + b"x" * 50 + b"TAIL\nnext\n" + b"y" * 30)
+        reader.feed_eof()
+        lines = []
+        while line := await read_line(reader, 8):
+            lines.append(line)
+        return lines
+
+    assert asyncio.run(read_all()) == [b"short\n", b"x" * 8, b"next\n", b"y" * 8]
+
+
+def test_failed_source_does_not_stop_the_merge(tmp_path):
+    good = tmp_path / "good.log"
+    good.write_text("".join(f"2025-01-01 00:00:0{index} INFO line {index}\n" for index in range(3)))
+    broken = tmp_path / "broken.log"
+    broken.mkdir()
+    emitted = []
+    multiplexer = LogMultiplexer([str(good), str(broken), "cmd:echo from command"],
+                                 lambda source, event: emitted.append((source.label, event)), from_end=False)
+
+    async def merge():
+        reading = asyncio.create_task(multiplexer.run())
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if multiplexer.sources[0].lines == 3 and multiplexer.sources[2].closed:
+                break
+        reading.cancel()
+        try:
+            await reading
+        except asyncio.CancelledError:
+            pass
+        multiplexer.flush(force=True)
+
+    asyncio.run(merge())
+    assert [source.label for source in multiplexer.failed] == ["broken.log"]
+    assert "IsADirectoryError" in multiplexer.sources[1].error
+    messages = [event.message for label, event in emitted]
+    assert [message[-6:] for message in messages if "INFO line" in message] == ["line 0", "line 1", "line 2"]
+    assert "from command" in messages
+    assert any(label == "broken.log" and event.level == "ERROR" for label, event in emitted)
@@ -0,0 +1,54 @@
+"""demos/rich/log_session的测试"""
+import shutil
+import time
+
+import pytest
+
+from demos.rich.log_session import SessionWriter, load_session
+from demos.rich.log_store import LEVEL_IDS, LogStore
+
+
+def _wait_written(writer, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while writer.written < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.written == count
+
+
+def test_load_truncated_part(tmp_path):
+    writer = SessionWriter(str(tmp_path / "sessions"), session_id="killed", flush_interval=0.01)
+    writer.submit([(1_000 + index, LEVEL_IDS["INFO"], f"message {index}") for index in range(5000)])
+    _wait_written(writer, 5000)
+    # 关闭前的分卷副本相当于写入进程被kill -9时留下的文件，gzip流没有结尾
+    copy = tmp_path / "killed-copy-001.log.gz"
+    shutil.copyfile(writer.paths[0], copy)
+    writer.close()
+
+    store = LogStore(capacity=10_000)
+    result = load_session([str(copy)], store)
+    assert result["truncated"] == [str(copy)]
+    assert result["records"] == 5000
+    assert len(store) == 5000
+
+    result = load_session(writer.paths, LogStore())
+    assert result["truncated"] == []
+    assert result["records"] == 5000
+
+
+def test_write_error_stops_session(tmp_path):
+    writer = SessionWriter(str(tmp_path), session_id="broken", flush_interval=0.01)
+
+    def fail(*args):
+        raise OSError(28, "No space left on device")
+
+    writer._write_raw = fail
+    writer.submit([(1, LEVEL_IDS["INFO"], "lost")])
+    deadline = time.monotonic() + 5
+    while writer.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.error is not None
+    # 出错后不再接受新的日志，丢弃的条数照常统计
+    assert not writer.submit([(2, LEVEL_IDS["INFO"], "rejected")])
+    assert writer.dropped == 2
+    with pytest.raises(OSError, match="No space left"):
+        writer.close()
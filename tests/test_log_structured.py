@@ -0,0 +1,46 @@
+"""demos/rich/log_structured的测试"""
+from demos.rich.log_structured import (
+    MAX_FUTURE_SKEW_MS,
+    LogAggregates,
+    LogEvent,
+    parse_timestamp,
+)
+
+NOW_MS = 1_760_000_000_000
+
+
+def test_parse_timestamp_units():
+    assert parse_timestamp(NOW_MS // 1000, NOW_MS) == NOW_MS
+    assert parse_timestamp(NOW_MS / 1000, NOW_MS) == NOW_MS
+    assert parse_timestamp(NOW_MS, NOW_MS) == NOW_MS
+    assert parse_timestamp(NOW_MS * 1000, NOW_MS) == NOW_MS
+    assert parse_timestamp(NOW_MS * 1_000_000, NOW_MS) == NOW_MS
+    assert parse_timestamp("2025-10-09T08:53:20Z", NOW_MS) == NOW_MS
+
+
+def test_parse_timestamp_rejects_future_values():
+    assert parse_timestamp(NOW_MS + MAX_FUTURE_SKEW_MS, NOW_MS) == NOW_MS + MAX_FUTURE_SKEW_MS
+    assert parse_timestamp(NOW_MS + MAX_FUTURE_SKEW_MS + 1, NOW_MS) == NOW_MS
+    assert parse_timestamp("2999-01-01T00:00:00Z", NOW_MS) == NOW_MS
+    assert parse_timestamp("not a time", NOW_MS) == NOW_MS
+
+
+def test_aggregates_age_out_with_the_window():
+    aggregates = LogAggregates(window_minutes=2)
+    aggregates.add(LogEvent(0, "ERROR", "db", "lost connection"))
+    aggregates.add(LogEvent(1_000, "ERROR", "db", "lost connection"))
+    aggregates.add(LogEvent(60_000, "ERROR", "api", "timeout"))
+    aggregates.add(LogEvent(60_000, "WARNING", "api", "slow"))
+    assert aggregates.total("ERROR") == 3
+    assert aggregates.top_error_loggers() == [("db", 2), ("api", 1)]
+
+    # 第2分钟的日志使第0分钟移出窗口
+    aggregates.add(LogEvent(120_000, "INFO", "app", "tick"))
+    assert aggregates.total("ERROR") == 1
+    assert aggregates.total("WARNING") == 1
+    assert aggregates.top_error_loggers() == [("api", 1)]
+
+    # 早于窗口的日志不计入
+    aggregates.add(LogEvent(0, "ERROR", "db", "late"))
+    assert aggregates.total("ERROR") == 1
+    assert aggregates.per_minute("ERROR") == [(1, 1), (2, 0)]
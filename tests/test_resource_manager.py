@@ -0,0 +1,87 @@
+"""resource_manager的测试，以及插件通过它读取手册和配置模式"""
+import os
+import shutil
+
+import pytest
+
+from benchmarks import host_stub
+from fastx_tui_plugin_example.resource_manager import ResourceManager
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write(path, size, fill=b"x"):
+    with open(path, "wb") as f:
+        f.write(fill * size)
+    return str(path)
+
+
+def test_small_resources_are_cached_and_evicted(tmp_path):
+    for name in ("a", "b", "c"):
+        _write(tmp_path / name, 400)
+    resources = ResourceManager(lambda name: str(tmp_path / name), cache_bytes=1000, small_limit=500)
+    assert bytes(resources.read("a")) == b"x" * 400
+    assert bytes(resources.read("a")) == b"x" * 400
+    assert (resources.stats.hits, resources.stats.misses) == (1, 1)
+    resources.read("b")
+    resources.read("c")
+    # 总大小超过1000字节，最久未使用的a被淘汰
+    assert resources.stats.evictions == 1
+    assert resources.cached_bytes == 800
+    resources.read("a")
+    assert resources.stats.misses == 4
+
+
+def test_changed_file_is_reread(tmp_path):
+    path = _write(tmp_path / "data", 10)
+    resources = ResourceManager(lambda name: str(tmp_path / name))
+    assert bytes(resources.read("data")) == b"x" * 10
+    _write(path, 11, b"y")
+    assert bytes(resources.read("data")) == b"y" * 11
+
+
+def test_mappings_are_capped_and_released_by_clear(tmp_path):
+    for index in range(4):
+        _write(tmp_path / f"big{index}", 4096)
+    resources = ResourceManager(lambda name: str(tmp_path / name), small_limit=100, max_mappings=2)
+    views = [resources.read(f"big{index}") for index in range(3)]
+    assert resources.mapping_count == 2
+    assert resources.stats.evictions == 1
+    assert all(len(view) == 4096 for view in views)
+    for view in views:
+        view.release()
+    mappings = [mapping for _, mapping in resources._mappings.values()]
+    resources.clear()
+    assert resources.mapping_count == 0
+    assert all(mapping.closed for mapping in mappings)
+
+
+def test_oversized_resource_must_be_streamed(tmp_path):
+    _write(tmp_path / "huge", 3000)
+    resources = ResourceManager(lambda name: str(tmp_path / name), small_limit=100, mmap_limit=1000,
+                                chunk_size=1024)
+    with pytest.raises(ValueError):
+        resources.read("huge")
+    assert [len(chunk) for chunk in resources.stream("huge")] == [1024, 1024, 952]
+    assert resources.stats.streamed == 1
+
+
+def test_plugin_reads_manual_and_schema_through_resources(tmp_path):
+    plugin_dir = tmp_path / "plugin"
+    plugin_dir.mkdir()
+    for name in ("manual.md", "config_schema.json"):
+        shutil.copyfile(os.path.join(PLUGIN_DIR, name), plugin_dir / name)
+    plugin, _ = host_stub.load_plugin(plugin_dir=PLUGIN_DIR)
+    try:
+        resources = plugin.resources
+        resources.clear()
+        misses = resources.stats.misses
+        plugin.plugin_path = str(plugin_dir)
+        assert plugin.get_manual().startswith("#")
+        assert "greeting_message" in plugin.get_config_schema()
+        assert resources.stats.misses == misses + 2
+        assert resources.cached_bytes == sum(os.path.getsize(plugin_dir / name)
+                                             for name in ("manual.md", "config_schema.json"))
+    finally:
+        plugin.cleanup()
+    assert resources.cached_bytes == 0